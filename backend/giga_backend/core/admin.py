@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.db.models import Q
+from django.utils.text import smart_split, unescape_string_literal
 from .models import CustomUser, Mission, MissionAttachment
+from .search import search_filter
 
 # Eğer daha önce kayıt varsa, önce unregister et
 try:
@@ -43,6 +46,22 @@ class MissionAdmin(admin.ModelAdmin):
     
     filter_horizontal = ['due_to']  # Çoktan çoğa ilişki için güzel UI
     
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Açıklama/from_to için LIKE taraması yerine tam metin indeksi. Varsayılan
+        admin aramasındaki gibi her kelime metinde ya da kullanıcı adında geçmeli.
+        """
+        condition = Q()
+        for bit in smart_split(search_term):
+            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+                bit = unescape_string_literal(bit)
+            try:
+                matches = search_filter(bit)
+            except ValueError:
+                matches = Q()
+            condition &= matches | Q(created_by__username__icontains=bit)
+        return queryset.filter(condition), False
+    
     readonly_fields = ['created_at', 'updated_at']
     
     fieldsets = (
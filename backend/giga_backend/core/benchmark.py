@@ -0,0 +1,346 @@
+"""
+Sentetik organizasyon üretici ve API benchmark'ı.
+
+generate_org() kullanıcıları, görevleri, atamaları, görünürlük satırlarını ve
+ekleri toplu ekler (sinyal tetiklemez; türetilmiş tablolar burada yazılır).
+Üretilen kullanıcılar BENCH_PREFIX ile başlar, clear_org() hepsini siler.
+Benchmark.run() ana endpoint'leri test client ile gerçek JWT başlığıyla
+çağırır; senaryo başına gecikme yüzdelikleri ve sorgu sayısı döner.
+compare_to_baseline() bunları kayıtlı baseline ile karşılaştırır.
+"""
+import json
+import math
+import random
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .blobstore import store_file
+from .models import AttachmentBlob, CustomUser, Mission, MissionAttachment, MissionVisibility
+from .versions import DIRECTORY_KEY, bump, missions_key, user_key
+
+BENCH_PREFIX = 'bench_'
+DEFAULT_PASSWORD = 'benchmark'
+
+DEPARTMENTS = [
+    'Yönetim', 'Satış', 'Pazarlama', 'Finans', 'İnsan Kaynakları', 'Bilgi İşlem', 'Operasyon', 'Hukuk',
+]
+VERBS = ['Hazırla', 'Gözden geçir', 'Güncelle', 'Raporla', 'Planla', 'Onayla', 'Takip et', 'Sun']
+SUBJECTS = [
+    'aylık satış raporu', 'bütçe tablosu', 'müşteri sözleşmesi', 'tedarikçi teklifi',
+    'sunucu bakımı', 'işe alım planı', 'pazarlama kampanyası', 'stok sayımı', 'denetim dosyası',
+]
+CITIES = ['İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya', 'Konya']
+
+
+# ============ ORGANİZASYON ÜRETİCİ ============
+
+def _batches(items, size):
+    items = iter(items)
+    batch = list(islice(items, size))
+    while batch:
+        yield batch
+        batch = list(islice(items, size))
+
+
+def _create_users(rng, count, password_hash, batch_size):
+    """1 CEO, ~%10 yönetici, kalanı çalışan; yöneticiler departmanlara sırayla dağılır"""
+    managers = max(1, count // 10)
+    users = []
+    for index in range(count):
+        if index == 0:
+            role, department = 'CEO', DEPARTMENTS[0]
+        elif index <= managers:
+            role, department = 'MANAGER', DEPARTMENTS[index % len(DEPARTMENTS)]
+        else:
+            role, department = 'EMPLOYEE', rng.choice(DEPARTMENTS)
+        username = f'{BENCH_PREFIX}{index:06d}'
+        users.append(CustomUser(
+            username=username,
+            password=password_hash,
+            first_name=f'Kullanıcı {index}',
+            email=f'{username}@example.com',
+            role=role,
+            department=department,
+            unvan=role.title(),
+        ))
+    for batch in _batches(users, batch_size):
+        CustomUser.objects.bulk_create(batch)
+    return users
+
+
+def generate_org(users=100, missions=1000, assignees=3, attachments=1, seed=0,
+                 password=DEFAULT_PASSWORD, batch_size=1000):
+    """
+    Aynı seed ile aynı organizasyonu üretir. Atananlar (politikaya uygun
+    olarak) çalışanlardan, mümkünse oluşturanın departmanından seçilir.
+    Ekler tek bir blob'u paylaşır. Oluşturulan satır sayılarını döner.
+    Önceki sentetik kullanıcılar duruyorsa ValueError (önce clear_org()).
+    """
+    if users < 2:
+        raise ValueError("En az 2 kullanıcı gerekli.")
+    if CustomUser.objects.filter(username__startswith=BENCH_PREFIX).exists():
+        raise ValueError("Sentetik organizasyon zaten var; yeniden oluşturmak için --clear kullanın.")
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    now = timezone.now()
+
+    with transaction.atomic():
+        people = _create_users(rng, users, make_password(password), batch_size)
+        employees = [user for user in people if user.role == 'EMPLOYEE'] or people[1:]
+        by_department = {}
+        for user in employees:
+            by_department.setdefault(user.department, []).append(user)
+        creators = [user for user in people if user.role != 'EMPLOYEE']
+
+        rows = []
+        for index in range(missions):
+            # Görevlerin çoğunu yöneticiler oluşturur
+            creator = rng.choice(creators if rng.random() < 0.7 else employees)
+            assigned_date = today - timedelta(days=rng.randint(0, 180))
+            completed = rng.random() < 0.4
+            rows.append(Mission(
+                description=f"{rng.choice(VERBS)}: {rng.choice(SUBJECTS)} #{index}",
+                from_to=f"{rng.choice(CITIES)} - {rng.choice(CITIES)}",
+                assigned_date=assigned_date,
+                end_date=assigned_date + timedelta(days=rng.randint(1, 30)),
+                completed=completed,
+                completed_at=now if completed else None,
+                created_by=creator,
+            ))
+        for batch in _batches(rows, batch_size):
+            Mission.objects.bulk_create(batch)
+
+        Through = Mission.due_to.through
+        through_rows, visibility = [], []
+        for mission in rows:
+            pool = by_department.get(mission.created_by.department) or employees
+            if len(pool) < assignees:
+                pool = employees
+            chosen = rng.sample(pool, min(assignees, len(pool)))
+            visibility.append(MissionVisibility(
+                user_id=mission.created_by_id, mission_id=mission.id, relation=MissionVisibility.CREATOR,
+            ))
+            for user in chosen:
+                through_rows.append(Through(mission_id=mission.id, customuser_id=user.id))
+                visibility.append(MissionVisibility(
+                    user_id=user.id, mission_id=mission.id, relation=MissionVisibility.ASSIGNEE,
+                ))
+        for batch in _batches(through_rows, batch_size):
+            Through.objects.bulk_create(batch)
+        for batch in _batches(visibility, batch_size):
+            MissionVisibility.objects.bulk_create(batch)
+
+        attachment_count = missions * attachments
+        if attachment_count:
+            blob = store_file(ContentFile(b'%PDF-1.4\n% benchmark\n', name='benchmark.pdf'))
+            AttachmentBlob.objects.filter(pk=blob.pk).update(ref_count=blob.ref_count - 1 + attachment_count)
+            files = (
+                MissionAttachment(mission=mission, file=blob.file.name, name=f'ek_{number + 1}.pdf', blob=blob)
+                for mission in rows
+                for number in range(attachments)
+            )
+            for batch in _batches(files, batch_size):
+                MissionAttachment.objects.bulk_create(batch)
+
+    # bulk_create sinyal tetiklemez: önbellek sürümleri elle yenilenir
+    bump([DIRECTORY_KEY, *(key for user in people for key in (user_key(user.id), missions_key(user.id)))])
+    return {
+        'users': len(people),
+        'missions': len(rows),
+        'assignments': len(through_rows),
+        'attachments': attachment_count,
+    }
+
+
+def clear_org():
+    """BENCH_PREFIX kullanıcılarını ve oluşturdukları görevleri sil"""
+    users = CustomUser.objects.filter(username__startswith=BENCH_PREFIX)
+    with transaction.atomic():
+        Mission.objects.filter(created_by__in=users).delete()
+        count, _ = users.delete()
+    return count
+
+
+# ============ BENCHMARK ============
+
+def percentile(sorted_values, fraction):
+    """En yakın sıra yöntemi"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+class BenchmarkError(Exception):
+    """Benchmark çalıştırılamadı (org yok, endpoint hata döndü)"""
+
+
+class Benchmark:
+    """Üretilmiş organizasyon üzerinde senaryoları çalıştırır"""
+
+    def __init__(self, password=DEFAULT_PASSWORD):
+        bench_users = CustomUser.objects.filter(username__startswith=BENCH_PREFIX)
+        # En çok görev gören yönetici ve en çok atanan çalışan: en ağır listeler
+        self.manager = (
+            bench_users.filter(role='MANAGER')
+            .annotate(seen=Count('mission_visibility')).order_by('-seen', 'id').first()
+        )
+        self.employee = (
+            bench_users.filter(role='EMPLOYEE')
+            .annotate(seen=Count('assigned_missions')).order_by('-seen', 'id').first()
+        )
+        if self.manager is None or self.employee is None:
+            raise BenchmarkError("Önce generate_org ile sentetik organizasyon oluşturun.")
+        self.password = password
+        self.visible = list(Mission.objects.visible_to(self.manager).values_list('id', flat=True)[:100])
+        self.assigned = list(
+            self.employee.assigned_missions.order_by('id').values_list('id', flat=True)[:1]
+        )
+        self.colleagues = list(
+            bench_users.filter(role='EMPLOYEE', department=self.manager.department)
+            .values_list('id', flat=True)[:2]
+        ) or [self.employee.id]
+        if not self.visible or not self.assigned:
+            raise BenchmarkError("Sentetik organizasyonda görev yok; --missions ile yeniden oluşturun.")
+        self.clients = {
+            user.id: self._client(user) for user in (self.manager, self.employee)
+        }
+        self.anonymous = APIClient()
+        self.created = []
+        self.toggles = 0
+
+    @staticmethod
+    def _client(user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        return client
+
+    # Senaryo adı -> istek; her çağrıda bir istek
+    def mission_list(self, step):
+        return self.clients[self.manager.id].get('/api/missions/')
+
+    def mission_detail(self, step):
+        mission_id = self.visible[step % len(self.visible)]
+        return self.clients[self.manager.id].get(f'/api/missions/{mission_id}/')
+
+    def mission_create(self, step):
+        response = self.clients[self.manager.id].post('/api/missions/', {
+            'description': f"Benchmark görevi {step}",
+            'assigned_date': timezone.localdate().isoformat(),
+            'end_date': (timezone.localdate() + timedelta(days=7)).isoformat(),
+            'due_to': self.colleagues,
+        }, format='json')
+        if response.status_code == 201:
+            self.created.append(response.data['id'])
+        return response
+
+    def toggle_complete(self, step):
+        self.toggles += 1
+        return self.clients[self.employee.id].patch(f'/api/missions/{self.assigned[0]}/toggle_complete/')
+
+    def assignable_users(self, step):
+        return self.clients[self.manager.id].get('/api/users/assignable/')
+
+    def org_chart(self, step):
+        return self.clients[self.employee.id].get('/api/users/organization/')
+
+    def token_obtain(self, step):
+        return self.anonymous.post(
+            '/api/token/', {'username': self.employee.username, 'password': self.password}, format='json'
+        )
+
+    SCENARIOS = {
+        'mission-list': mission_list,
+        'mission-detail': mission_detail,
+        'mission-create': mission_create,
+        'toggle-complete': toggle_complete,
+        'assignable-users': assignable_users,
+        'org-chart': org_chart,
+        'token-obtain': token_obtain,
+    }
+
+    def measure(self, name, iterations, warmup):
+        scenario = self.SCENARIOS[name]
+        timings, queries = [], []
+        for step in range(warmup + iterations):
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = scenario(self, step)
+                elapsed = time.perf_counter() - started
+            if response.status_code >= 400:
+                raise BenchmarkError(f"{name}: HTTP {response.status_code}")
+            if step >= warmup:
+                timings.append(elapsed * 1000)
+                queries.append(len(ctx.captured_queries))
+        timings.sort()
+        return {
+            'p50': round(percentile(timings, 0.50), 3),
+            'p90': round(percentile(timings, 0.90), 3),
+            'p99': round(percentile(timings, 0.99), 3),
+            'max': round(timings[-1], 3),
+            'queries': max(queries),
+        }
+
+    def cleanup(self):
+        """Oluşturulan görevleri sil, toggle edilen görevi eski haline getir"""
+        Mission.objects.filter(pk__in=self.created).delete()
+        if self.toggles % 2:
+            self.toggle_complete(0)
+
+    def run(self, names=None, iterations=20, warmup=2):
+        results = {}
+        try:
+            for name in names or self.SCENARIOS:
+                results[name] = self.measure(name, iterations, warmup)
+        finally:
+            self.cleanup()
+        return results
+
+
+def org_summary():
+    users = CustomUser.objects.filter(username__startswith=BENCH_PREFIX)
+    return {
+        'users': users.count(),
+        'missions': Mission.objects.filter(created_by__in=users).count(),
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance=0.5, slack_ms=1.0):
+    """
+    Gerileme listesi. Sorgu sayısı baseline'ı aşamaz; p50 gecikmesi en fazla
+    tolerance oranı (+ ölçüm gürültüsü için slack_ms) kadar artabilir.
+    """
+    failures = []
+    for name, result in results.items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None:
+            continue
+        if result['queries'] > base['queries']:
+            failures.append(f"{name}: sorgu sayısı {base['queries']} -> {result['queries']}")
+        limit = base['p50'] * (1 + tolerance) + slack_ms
+        if result['p50'] > limit:
+            failures.append(f"{name}: p50 {base['p50']:.1f} ms -> {result['p50']:.1f} ms (sınır {limit:.1f} ms)")
+    return failures
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, iterations):
+    data = {'org': org_summary(), 'iterations': iterations, 'scenarios': results}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    return data
@@ -0,0 +1,82 @@
+"""
+İçerik adresli ek dosya deposu.
+
+Yüklemeler akış halinde geçici dosyaya yazılırken SHA-256 hesaplanır; aynı
+içerik daha önce saklanmışsa geçici dosya silinir ve mevcut blob'un referans
+sayısı artırılır. Blob yolu: blobs/ab/cd/<sha256><uzantı>
+"""
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+
+from .models import AttachmentBlob
+
+BLOB_DIR = 'blobs'
+
+
+def blob_name(sha256, filename=''):
+    ext = os.path.splitext(filename)[1].lower()[:16]
+    return f'{BLOB_DIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}'
+
+
+def _tmp_dir():
+    path = default_storage.path(f'{BLOB_DIR}/tmp')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def store_file(file):
+    """Django File/UploadedFile'ı hash'leyerek sakla; blob döner (ref_count +1)"""
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=_tmp_dir())
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for chunk in file.chunks():
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        return adopt_path(tmp_path, digest.hexdigest(), size, os.path.basename(file.name))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def adopt_path(path, sha256, size, filename=''):
+    """
+    Diskteki dosyayı blob olarak sahiplen. İçerik zaten varsa dosya silinir,
+    yoksa blob yoluna taşınır (kopyalanmaz). ref_count +1.
+    """
+    with transaction.atomic():
+        blob = AttachmentBlob.objects.select_for_update().filter(sha256=sha256).first()
+        if blob is None:
+            blob = AttachmentBlob.objects.create(
+                sha256=sha256, file=blob_name(sha256, filename), size=size, ref_count=1
+            )
+        else:
+            AttachmentBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+            blob.ref_count += 1
+
+        target = default_storage.path(blob.file.name)
+        if os.path.exists(target):
+            os.remove(path)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(path, target)
+    return blob
+
+
+def release(blob_id):
+    """Referansı düşür; kimse kullanmıyorsa blob'u ve dosyasını sil"""
+    with transaction.atomic():
+        AttachmentBlob.objects.filter(pk=blob_id).update(ref_count=F('ref_count') - 1)
+        blob = AttachmentBlob.objects.select_for_update().filter(pk=blob_id, ref_count__lte=0).first()
+        if blob is None:
+            return
+        name = blob.file.name
+        blob.delete()
+        transaction.on_commit(lambda: default_storage.delete(name))
@@ -0,0 +1,181 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from . import events
+from .models import Mission, MissionVisibility
+from .serializers import MissionBulkItemSerializer
+from .sync import record_changes
+from .versions import bump_missions, mission_audience
+
+
+def _error(index, code, errors):
+    return {'index': index, 'status': code, 'errors': errors}
+
+
+def _validate(policy, items, partial):
+    """(geçerli öğeler, hata sonuçları) döner"""
+    if not isinstance(items, list) or not items:
+        raise ValidationError({"detail": "Görev listesi (boş olmayan bir dizi) gereklidir."})
+    if len(items) > settings.MISSION_BULK_MAX_ITEMS:
+        raise ValidationError({
+            "detail": f"Tek istekte en fazla {settings.MISSION_BULK_MAX_ITEMS} görev gönderilebilir."
+        })
+
+    valid, results = [], []
+    for index, item in enumerate(items):
+        serializer = MissionBulkItemSerializer(data=item, partial=partial)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results.append(_error(index, status.HTTP_400_BAD_REQUEST, serializer.errors))
+
+    # Tüm öğelerin atananları tek sorguda; sonraki kontroller memo'dan
+    policy.load_users({pk for _, data in valid for pk in data.get('due_to', ())})
+    checked = []
+    for index, data in valid:
+        problem = policy.check_assignment(data.get('due_to', ()), require_existing=True)
+        if problem:
+            results.append(_error(index, *problem))
+        else:
+            checked.append((index, data))
+    return checked, results
+
+
+def _add_assignments(pairs):
+    """(mission_id, user_id) çiftleri için M2M ve görünürlük satırlarını toplu ekle"""
+    Through = Mission.due_to.through
+    Through.objects.bulk_create(
+        [Through(mission_id=mission_id, customuser_id=user_id) for mission_id, user_id in pairs],
+        ignore_conflicts=True,
+    )
+    MissionVisibility.objects.bulk_create(
+        [
+            MissionVisibility(mission_id=mission_id, user_id=user_id, relation=MissionVisibility.ASSIGNEE)
+            for mission_id, user_id in pairs
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def bulk_create_missions(policy, items):
+    """
+    Görevleri tek transaction içinde bulk_create ile ekler.
+    Öğe başına sonuç listesi döner; hatalı öğeler atlanır.
+    """
+    user = policy.user
+    valid, results = _validate(policy, items, partial=False)
+    if not valid:
+        return results
+
+    now = timezone.now()
+    with transaction.atomic():
+        missions = Mission.objects.bulk_create([
+            Mission(
+                created_by=user,
+                completed_at=now if data.get('completed') else None,
+                **{k: v for k, v in data.items() if k not in ('id', 'due_to')}
+            )
+            for _, data in valid
+        ])
+        pairs = {
+            (mission.id, assignee_id)
+            for mission, (_, data) in zip(missions, valid)
+            for assignee_id in data.get('due_to', ())
+        }
+        _add_assignments(pairs)
+        MissionVisibility.objects.bulk_create([
+            MissionVisibility(mission_id=mission.id, user_id=user.id, relation=MissionVisibility.CREATOR)
+            for mission in missions
+        ])
+        bump_missions(user_ids={user.id} | {user_id for _, user_id in pairs})
+        events.publish_missions(events.CREATED, [mission.id for mission in missions])
+
+    results += [
+        {'index': index, 'status': status.HTTP_201_CREATED, 'id': mission.id}
+        for mission, (index, _) in zip(missions, valid)
+    ]
+    return sorted(results, key=lambda result: result['index'])
+
+
+def bulk_update_missions(policy, items):
+    """
+    Kullanıcının oluşturduğu görevleri tek transaction içinde bulk_update ile günceller.
+    Her öğe 'id' içermeli; due_to verilirse atamalar tamamen değiştirilir.
+    """
+    user = policy.user
+    valid, results = _validate(policy, items, partial=True)
+
+    ids = [data.get('id') for _, data in valid]
+    missions = Mission.objects.visible_to(user).in_bulk([pk for pk in ids if pk is not None])
+
+    updates, seen = [], set()
+    for index, data in valid:
+        pk = data.get('id')
+        mission = missions.get(pk)
+        if pk is None:
+            results.append(_error(index, status.HTTP_400_BAD_REQUEST, {'id': ["Bu alan gereklidir."]}))
+        elif pk in seen:
+            results.append(_error(index, status.HTTP_400_BAD_REQUEST, {'id': ["Aynı görev birden fazla kez gönderildi."]}))
+        elif mission is None:
+            results.append(_error(index, status.HTTP_404_NOT_FOUND, {'detail': "Görev bulunamadı."}))
+        elif not policy.can_edit(mission):
+            results.append(_error(index, status.HTTP_403_FORBIDDEN, {'detail': "Bu görevi düzenleme yetkiniz yok."}))
+        else:
+            seen.add(pk)
+            updates.append((index, mission, data))
+
+    if not updates:
+        return sorted(results, key=lambda result: result['index'])
+
+    now = timezone.now()
+    fields = {'updated_at'}
+    reassigned = {}
+    for _, mission, data in updates:
+        for attr, value in data.items():
+            if attr == 'due_to':
+                reassigned[mission.id] = set(value)
+            elif attr != 'id':
+                setattr(mission, attr, value)
+                fields.add(attr)
+        if 'completed' in data:
+            # Mission.save() ile aynı kural; bulk_update save() çağırmaz
+            if not mission.completed:
+                mission.completed_at = None
+            elif mission.completed_at is None:
+                mission.completed_at = now
+            fields.add('completed_at')
+        mission.updated_at = now
+
+    with transaction.atomic():
+        audience = mission_audience(list(seen))
+        previous = {}
+        if reassigned and events.get_broker().has_subscribers():
+            # Ataması kaldırılanlara silme olayı gitsin
+            previous = events.audience_by_mission(reassigned)
+        Mission.objects.bulk_update([mission for _, mission, _ in updates], sorted(fields))
+        if reassigned:
+            old_pairs = set(
+                Mission.due_to.through.objects.filter(mission_id__in=reassigned)
+                .values_list('mission_id', 'customuser_id')
+            )
+            Mission.due_to.through.objects.filter(mission_id__in=reassigned).delete()
+            MissionVisibility.objects.filter(
+                mission_id__in=reassigned, relation=MissionVisibility.ASSIGNEE
+            ).delete()
+            pairs = {(mission_id, user_id) for mission_id, users in reassigned.items() for user_id in users}
+            _add_assignments(pairs)
+            audience |= {user_id for _, user_id in pairs}
+            # ?updated_since= tombstone'ları için; çıkarılan ve eklenen atananlar
+            record_changes((user_id, mission_id) for mission_id, user_id in old_pairs ^ pairs)
+        bump_missions(user_ids=audience)
+        events.publish_missions(events.UPDATED, seen, previous)
+    policy.forget(reassigned)
+
+    results += [
+        {'index': index, 'status': status.HTTP_200_OK, 'id': mission.id}
+        for index, mission, _ in updates
+    ]
+    return sorted(results, key=lambda result: result['index'])
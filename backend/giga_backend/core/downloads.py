@@ -0,0 +1,132 @@
+"""
+Ek dosya indirme: koşullu istekler, Range ve proxy'ye devir (X-Accel-Redirect /
+X-Sendfile). Proxy yoksa tam dosya FileResponse ile gönderilir; WSGI sunucusu
+wsgi.file_wrapper destekliyorsa (gunicorn, uWSGI) sendfile ile kopyasız yazılır.
+"""
+import mimetypes
+import os
+import re
+from datetime import datetime, timezone as dt_timezone
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+READ_BLOCK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def attachment_validators(attachment, path):
+    """(etag, last_modified): blob varsa içerik hash'i, yoksa dosya boyutu/mtime"""
+    if attachment.blob_id is not None:
+        return f'"{attachment.blob.sha256}"', attachment.blob.created_at
+    stat = os.stat(path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    return etag, datetime.fromtimestamp(int(stat.st_mtime), tz=dt_timezone.utc)
+
+
+def parse_range(header, size):
+    """
+    Tek aralıklı 'bytes=' başlığını (start, end) olarak döner; başlık yoksa,
+    çoklu veya sözdizimi hatalıysa None (tam dosya). Karşılanamazsa ValueError.
+    """
+    match = RANGE_RE.match(header or '')
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # bytes=-N: son N bayt
+        length = int(end)
+        if length == 0:
+            raise ValueError
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    value = request.headers.get('If-Range')
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag
+    date = parse_http_date_safe(value)
+    return date is not None and date == int(last_modified.timestamp())
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            block = f.read(min(READ_BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def serve_attachment(request, attachment):
+    """İzin kontrolü yapılmış ek dosyayı gönderir; request DRF ya da Django isteği olabilir"""
+    name = attachment.file.name
+    path = default_storage.path(name)
+    if not os.path.exists(path):
+        return None
+    filename = attachment.name or os.path.basename(name)
+    etag, last_modified = attachment_validators(attachment, path)
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified.timestamp())
+    )
+    if response is None:
+        response = _file_response(request, name, path, etag, last_modified)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified.timestamp())
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = 'private, no-cache'
+    if response.status_code in (200, 206):
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        response['Content-Type'] = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    return response
+
+
+def _file_response(request, name, path, etag, last_modified):
+    backend = settings.ATTACHMENT_SENDFILE_BACKEND
+    if backend == 'nginx':
+        # Range ve gönderim nginx'te; internal location MEDIA_ROOT'a bakmalı.
+        # Eski mission_files/ adları Türkçe karakter içerebilir: başlık URI olarak
+        # kodlanır (Django ASCII dışı değeri MIME kodlar, nginx çözemez)
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = settings.ATTACHMENT_ACCEL_PREFIX + quote(name)
+        return response
+    if backend == 'sendfile' and path.isascii():
+        # X-Sendfile ham dosya yolu ister ve URI çözmez; ASCII dışı yollar
+        # aşağıdaki FileResponse ile gönderilir
+        response = HttpResponse()
+        response['X-Sendfile'] = path
+        return response
+
+    size = os.path.getsize(path)
+    try:
+        byte_range = parse_range(request.headers.get('Range'), size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None or not _if_range_matches(request, etag, last_modified):
+        return FileResponse(open(path, 'rb'))
+
+    start, end = byte_range
+    length = end - start + 1
+    response = StreamingHttpResponse(_read_range(path, start, length), status=206)
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(length)
+    return response
@@ -0,0 +1,222 @@
+"""
+Canlı görev değişiklik akışı (Server-Sent Events).
+
+Sinyaller commit sonrası publish_missions() çağırır; olaylar broker üzerinden
+görevi görebilen kullanıcıların açık bağlantılarına iletilir. Varsayılan
+InProcessBroker tek süreç içindir; çok süreçli kurulumda aynı arayüzü
+(has_subscribers/publish/subscribe/unsubscribe) uygulayan bir broker
+MISSION_EVENTS_BROKER ayarıyla verilir.
+"""
+import asyncio
+import json
+import threading
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .models import Mission, MissionVisibility
+
+CREATED = 'mission.created'
+UPDATED = 'mission.updated'
+COMPLETED = 'mission.completed'
+DELETED = 'mission.deleted'
+# Kuyruk taştı veya Last-Event-ID artık tamponda yok: istemci listeyi yeniden çekmeli
+RESYNC = 'resync'
+
+MISSION_EVENT_FIELDS = [
+    'id', 'description', 'assigned_date', 'end_date', 'completed', 'completed_at', 'created_by_id',
+]
+
+
+# ============ BROKER ============
+
+class Subscription:
+    """Tek bir SSE bağlantısının olay kuyruğu (bağlantının event loop'unda)"""
+
+    def __init__(self, user_id, loop, maxsize):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.overflow = False
+
+    def push(self, event):
+        # publish herhangi bir thread'den gelebilir
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        if self.overflow:
+            return
+        if self.queue.full():
+            self.overflow = True
+        else:
+            self.queue.put_nowait(event)
+
+    async def get(self, timeout):
+        """Sıradaki olay; timeout dolarsa None"""
+        if self.overflow:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.overflow = False
+            return {'type': RESYNC, 'data': {}}
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InProcessBroker:
+    """
+    Süreç içi broker. Son olaylar Last-Event-ID ile yeniden bağlanan
+    istemcilere tekrar gönderilmek üzere küçük bir tamponda tutulur.
+    """
+
+    def __init__(self, buffer_size=None, queue_size=None):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._recent = deque(maxlen=buffer_size or settings.MISSION_EVENTS_BUFFER_SIZE)
+        self._queue_size = queue_size or settings.MISSION_EVENTS_QUEUE_SIZE
+        self._sequence = 0
+
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def publish(self, event, user_ids):
+        user_ids = frozenset(user_ids)
+        with self._lock:
+            self._sequence += 1
+            event = {**event, 'id': self._sequence}
+            self._recent.append((event, user_ids))
+            targets = [sub for user_id in user_ids for sub in self._subscribers.get(user_id, ())]
+        for sub in targets:
+            sub.push(event)
+        return event
+
+    def subscribe(self, user_id, last_event_id=None, loop=None):
+        sub = Subscription(user_id, loop or asyncio.get_running_loop(), self._queue_size)
+        with self._lock:
+            self._subscribers[user_id].add(sub)
+            if last_event_id is not None:
+                oldest = self._recent[0][0]['id'] if self._recent else self._sequence + 1
+                if last_event_id < oldest - 1 or last_event_id > self._sequence:
+                    sub.overflow = True
+                else:
+                    for event, user_ids in self._recent:
+                        if event['id'] > last_event_id and user_id in user_ids:
+                            sub._put(event)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subscribers.get(sub.user_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.user_id]
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.MISSION_EVENTS_BROKER)()
+    return _broker
+
+
+def format_event(event):
+    """SSE çerçevesi"""
+    lines = []
+    if 'id' in event:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event['data'], cls=DjangoJSONEncoder)}")
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+# ============ YAYIN ============
+
+def audience_by_mission(mission_ids):
+    """mission_id -> görebilen kullanıcı id'leri"""
+    audience = defaultdict(set)
+    for mission_id, user_id in MissionVisibility.objects.filter(
+        mission_id__in=mission_ids
+    ).values_list('mission_id', 'user_id'):
+        audience[mission_id].add(user_id)
+    return audience
+
+
+def _publish(kind, mission_ids, previous):
+    broker = get_broker()
+    if kind == DELETED:
+        # Geri alınan bir transaction'dan kalan silme olayı yayınlanmamalı
+        existing = set(Mission.objects.filter(pk__in=mission_ids).values_list('id', flat=True))
+        for mission_id in mission_ids:
+            if mission_id not in existing:
+                broker.publish({'type': DELETED, 'data': {'id': mission_id}}, previous.get(mission_id, ()))
+        return
+
+    rows = Mission.objects.filter(pk__in=mission_ids).values(*MISSION_EVENT_FIELDS)
+    assignees = defaultdict(set)
+    audience = defaultdict(set)
+    for mission_id, user_id, relation in MissionVisibility.objects.filter(
+        mission_id__in=mission_ids
+    ).values_list('mission_id', 'user_id', 'relation'):
+        audience[mission_id].add(user_id)
+        if relation == MissionVisibility.ASSIGNEE:
+            assignees[mission_id].add(user_id)
+
+    for row in rows:
+        mission_id = row['id']
+        row['created_by'] = row.pop('created_by_id')
+        row['due_to'] = sorted(assignees[mission_id])
+        broker.publish({'type': kind, 'data': row}, audience[mission_id])
+        # Artık göremeyenler için görev silinmiş sayılır
+        removed = previous.get(mission_id, set()) - audience[mission_id]
+        if removed:
+            broker.publish({'type': DELETED, 'data': {'id': mission_id}}, removed)
+
+
+# Aynı transaction'daki değişiklikler görev başına tek olayda birleşir
+# (ör. due_to.set() -> post_remove + post_add). Öncelik: silme > oluşturma > tamamlama > güncelleme
+_PRIORITY = {UPDATED: 0, COMPLETED: 1, CREATED: 2, DELETED: 3}
+_pending = threading.local()
+
+
+def _flush():
+    batch = getattr(_pending, 'batch', None)
+    if not batch:
+        return
+    _pending.batch = {}
+    by_kind = defaultdict(list)
+    for mission_id, (kind, _) in batch.items():
+        by_kind[kind].append(mission_id)
+    previous = {mission_id: users for mission_id, (_, users) in batch.items()}
+    for kind, mission_ids in by_kind.items():
+        _publish(kind, mission_ids, previous)
+
+
+def publish_missions(kind, mission_ids, previous=None):
+    """
+    Commit sonrası olay yayınla. previous: mission_id -> değişiklik öncesi
+    görenler (silme ve atama değişikliklerinde). Dinleyen yoksa sorgu atılmaz.
+    """
+    mission_ids = list(mission_ids)
+    if not mission_ids or not get_broker().has_subscribers():
+        return
+    previous = previous or {}
+    batch = getattr(_pending, 'batch', None)
+    if batch is None:
+        batch = _pending.batch = {}
+    for mission_id in mission_ids:
+        entry = batch.setdefault(mission_id, [kind, set()])
+        if _PRIORITY[kind] > _PRIORITY[entry[0]]:
+            entry[0] = kind
+        entry[1] |= previous.get(mission_id, set())
+    transaction.on_commit(_flush)
@@ -0,0 +1,74 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+TRUE_VALUES = ('true', '1', 'yes')
+FALSE_VALUES = ('false', '0', 'no')
+
+
+def _parse_bool(name, value):
+    value = value.lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValidationError({name: "true veya false olmalıdır."})
+
+
+def parse_date_param(name, value):
+    """YYYY-MM-DD sorgu parametresi; geçersizse alan adıyla ValidationError"""
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: "Tarih YYYY-MM-DD formatında olmalıdır."})
+    return parsed
+
+
+def _parse_user(name, value, request):
+    if value == 'me':
+        return request.user.id
+    if not value.isdigit():
+        raise ValidationError({name: "Kullanıcı id'si veya 'me' olmalıdır."})
+    return int(value)
+
+
+class MissionFilterBackend(BaseFilterBackend):
+    """
+    Görev listesini SQL tarafında filtreler:
+    ?completed=, ?overdue=, ?created_by=, ?assignee=,
+    ?end_date_after=, ?end_date_before=, ?assigned_date_after=, ?assigned_date_before=
+    """
+    DATE_FILTERS = {
+        'end_date_after': 'end_date__gte',
+        'end_date_before': 'end_date__lte',
+        'assigned_date_after': 'assigned_date__gte',
+        'assigned_date_before': 'assigned_date__lte',
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        if 'completed' in params:
+            queryset = queryset.filter(completed=_parse_bool('completed', params['completed']))
+
+        for param, lookup in self.DATE_FILTERS.items():
+            if param in params:
+                queryset = queryset.filter(**{lookup: parse_date_param(param, params[param])})
+
+        if 'created_by' in params:
+            queryset = queryset.filter(created_by_id=_parse_user('created_by', params['created_by'], request))
+
+        if 'assignee' in params:
+            queryset = queryset.filter(due_to=_parse_user('assignee', params['assignee'], request))
+
+        if 'overdue' in params:
+            overdue = {'completed': False, 'end_date__lt': timezone.localdate()}
+            if _parse_bool('overdue', params['overdue']):
+                queryset = queryset.filter(**overdue)
+            else:
+                queryset = queryset.exclude(**overdue)
+
+        return queryset
@@ -0,0 +1,67 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import (
+    DEFAULT_PASSWORD, Benchmark, BenchmarkError, compare_to_baseline, load_baseline, save_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Ana endpoint'leri sentetik organizasyon üzerinde ölçer (gecikme yüzdelikleri, "
+        "sorgu sayısı); baseline'a göre gerileme varsa hata ile çıkar"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument(
+            '--scenario', action='append', choices=list(Benchmark.SCENARIOS),
+            help="Sadece bu senaryo(lar)ı çalıştır",
+        )
+        parser.add_argument('--baseline', default=str(settings.BENCHMARK_BASELINE))
+        parser.add_argument('--save-baseline', action='store_true', help="Sonuçları baseline olarak yaz")
+        parser.add_argument(
+            '--tolerance', type=float, default=0.5,
+            help="p50 için izin verilen artış oranı (0.5 = %%50)",
+        )
+        parser.add_argument('--password', default=DEFAULT_PASSWORD)
+        parser.add_argument('--json', action='store_true', help="Sonuçları JSON olarak yaz")
+
+    def handle(self, *args, **options):
+        try:
+            results = Benchmark(password=options['password']).run(
+                names=options['scenario'], iterations=options['iterations'], warmup=options['warmup'],
+            )
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self.stdout.write(f"{'senaryo':<18}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'sorgu':>7}")
+            for name, result in results.items():
+                self.stdout.write(
+                    f"{name:<18}{result['p50']:>9.2f}{result['p90']:>9.2f}"
+                    f"{result['p99']:>9.2f}{result['max']:>9.2f}{result['queries']:>7}"
+                )
+
+        path = options['baseline']
+        if options['save_baseline']:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            save_baseline(path, results, options['iterations'])
+            self.stdout.write(self.style.SUCCESS(f"Baseline kaydedildi: {path}"))
+            return
+        if not os.path.exists(path):
+            # Karşılaştırılacak bir şey yoksa gerileme yakalanamaz: başarı sayılmaz
+            raise CommandError(
+                f"Baseline bulunamadı: {path}. Önce --save-baseline ile referans sonuçları kaydedin."
+            )
+
+        failures = compare_to_baseline(results, load_baseline(path), options['tolerance'])
+        if failures:
+            raise CommandError("Performans gerilemesi:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("Baseline ile karşılaştırma başarılı."))
@@ -0,0 +1,53 @@
+import hashlib
+import os
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from core.blobstore import adopt_path
+from core.models import MissionAttachment
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(block)
+            size += len(block)
+    return digest.hexdigest(), size
+
+
+class Command(BaseCommand):
+    help = "Blob'a bağlanmamış eski ek dosyaları içerik adresli depoya taşır, aynı içerikleri birleştirir"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Değişiklik yapmadan sadece raporla")
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        seen = set()
+        moved = duplicates = missing = 0
+        for attachment in MissionAttachment.objects.filter(blob__isnull=True).iterator():
+            path = default_storage.path(attachment.file.name)
+            if not os.path.exists(path):
+                missing += 1
+                continue
+            sha256, size = _hash_file(path)
+            if sha256 in seen:
+                duplicates += 1
+            seen.add(sha256)
+            if dry_run:
+                continue
+
+            name = attachment.name or os.path.basename(attachment.file.name)
+            blob = adopt_path(path, sha256, size, name)
+            MissionAttachment.objects.filter(pk=attachment.pk).update(
+                blob=blob, file=blob.file.name, name=name
+            )
+            moved += 1
+
+        prefix = "[dry-run] " if dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{moved} ek dosya taşındı, {duplicates} kopya bulundu, {missing} dosya eksik."
+        ))
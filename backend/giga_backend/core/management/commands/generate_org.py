@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import DEFAULT_PASSWORD, clear_org, generate_org
+
+
+class Command(BaseCommand):
+    help = "Benchmark için sentetik organizasyon (kullanıcı, görev, atama, ek) üretir"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help="Kullanıcı sayısı (CEO + %%10 yönetici)")
+        parser.add_argument('--missions', type=int, default=1000, help="Görev sayısı")
+        parser.add_argument('--assignees', type=int, default=3, help="Görev başına atanan sayısı")
+        parser.add_argument('--attachments', type=int, default=1, help="Görev başına ek sayısı")
+        parser.add_argument('--seed', type=int, default=0, help="Aynı seed aynı organizasyonu üretir")
+        parser.add_argument('--password', default=DEFAULT_PASSWORD, help="Tüm kullanıcıların şifresi")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--clear', action='store_true', help="Önce mevcut sentetik organizasyonu sil")
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            self.stdout.write(f"{clear_org()} sentetik kayıt silindi.")
+        try:
+            result = generate_org(
+                users=options['users'],
+                missions=options['missions'],
+                assignees=options['assignees'],
+                attachments=options['attachments'],
+                seed=options['seed'],
+                password=options['password'],
+                batch_size=options['batch_size'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['users']} kullanıcı, {result['missions']} görev, "
+            f"{result['assignments']} atama, {result['attachments']} ek oluşturuldu."
+        ))
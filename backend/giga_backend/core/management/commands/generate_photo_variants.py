@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core.models import CustomUser
+from core.photos import delete_variants, generate_variants
+
+
+class Command(BaseCommand):
+    help = "Varyantı olmayan profil fotoğrafları için küçük boyutları üretir"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Mevcut varyantları da yeniden üret")
+
+    def handle(self, *args, **options):
+        users = CustomUser.objects.exclude(profile_photo='').exclude(profile_photo__isnull=True)
+        if not options['all']:
+            users = users.filter(photo_variants={})
+        count = failed = 0
+        for user_id, photo, variants in users.values_list('id', 'profile_photo', 'photo_variants').iterator():
+            try:
+                generate_variants(user_id, photo)
+            except (OSError, ValueError) as exc:
+                failed += 1
+                self.stderr.write(f"{user_id}: {exc}")
+                continue
+            delete_variants(variants)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"{count} kullanıcı için varyant üretildi, {failed} hata."))
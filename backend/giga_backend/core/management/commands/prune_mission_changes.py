@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import MissionChange
+
+
+class Command(BaseCommand):
+    help = "Senkronizasyon saklama süresinden eski görünürlük değişikliği kayıtlarını siler"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.MISSION_SYNC_RETENTION_DAYS)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        count, _ = MissionChange.objects.filter(changed_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"{count} değişiklik kaydı silindi."))
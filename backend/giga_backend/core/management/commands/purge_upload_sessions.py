@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import UploadSession
+
+
+class Command(BaseCommand):
+    help = "Belirtilen süreden eski, göreve bağlanmamış yükleme oturumlarını ve dosyalarını siler"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = UploadSession.objects.filter(created_at__lt=cutoff)
+        count = 0
+        for session in stale.iterator():
+            session.discard_file()
+            count += 1
+        stale.delete()
+        self.stdout.write(self.style.SUCCESS(f"{count} yükleme oturumu silindi."))
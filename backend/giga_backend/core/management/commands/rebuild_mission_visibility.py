@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.models import MissionVisibility
+
+
+class Command(BaseCommand):
+    help = "MissionVisibility tablosunu created_by ve due_to'dan sıfırdan oluşturur"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = MissionVisibility.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{total} görünürlük satırı oluşturuldu."))
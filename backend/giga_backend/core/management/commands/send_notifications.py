@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.notifications import dispatch_notifications
+
+
+class Command(BaseCommand):
+    help = "Termin hatırlatmalarını ve gecikme uyarılarını e-posta ile gönderir"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help="Bağlantı başına parti büyüklüğü")
+        parser.add_argument('--dry-run', action='store_true', help="Göndermeden sadece say")
+        parser.add_argument(
+            '--loop', type=int, metavar='SECONDS',
+            help="Sürekli çalış; her turdan sonra bu kadar bekle",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            result = dispatch_notifications(batch_size=options['batch_size'], dry_run=options['dry_run'])
+            prefix = "[dry-run] " if options['dry_run'] else ""
+            self.stdout.write(self.style.SUCCESS(
+                f"{prefix}{result['emails']} e-posta, {result['missions']} görev bildirimi "
+                f"({result['skipped']} kullanıcının adresi yok) - {time.monotonic() - started:.2f} sn"
+            ))
+            if not options['loop']:
+                return
+            close_old_connections()
+            time.sleep(options['loop'])
@@ -0,0 +1,224 @@
+"""
+İstek başına performans ölçümü (PERF_METRICS_ENABLED ile açılır).
+
+PerformanceMiddleware her istek için SQL sorgu sayısını, toplam DB süresini,
+serileştirme (span('serialize')) ve render süresini, yanıt boyutunu ölçer;
+Server-Timing başlığına yazar ve çözümlenen URL adına göre histogramlarda
+toplar. /metrics bunları Prometheus metin formatında verir. Histogramlar
+süreç içidir; çok worker'lı kurulumda her worker ayrı kazınmalıdır.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+# Sayaç adı -> (açıklama, kova sınırları)
+HISTOGRAMS = {
+    'request_duration_seconds': (
+        "İstek süresi", (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ),
+    'db_duration_seconds': (
+        "İstek başına toplam SQL süresi", (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+    ),
+    'db_queries': (
+        "İstek başına SQL sorgu sayısı", (1, 2, 3, 5, 10, 20, 50, 100, 200),
+    ),
+    'serialize_duration_seconds': (
+        "Serileştirme süresi", (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+    ),
+    'render_duration_seconds': (
+        "Yanıt render süresi", (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+    ),
+    'response_size_bytes': (
+        "Yanıt gövdesi boyutu", (1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+    ),
+}
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """(metrik, view) -> Histogram; eşzamanlı isteklerden güvenle beslenir"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = defaultdict(dict)
+
+    def observe(self, view, values):
+        with self._lock:
+            for name, value in values.items():
+                histograms = self._histograms[name]
+                if view not in histograms:
+                    histograms[view] = Histogram(HISTOGRAMS[name][1])
+                histograms[view].observe(value)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self, prefix='giga_'):
+        """Prometheus metin formatı (0.0.4); kovalar kümülatif yazılır"""
+        lines = []
+        with self._lock:
+            for name, (help_text, _) in HISTOGRAMS.items():
+                metric = prefix + name
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for view, histogram in sorted(self._histograms.get(name, {}).items()):
+                    label = view.replace('\\', '\\\\').replace('"', '\\"')
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{{view="{label}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_bucket{{view="{label}",le="+Inf"}} {histogram.count}')
+                    lines.append(f'{metric}_sum{{view="{label}"}} {histogram.sum:.6f}')
+                    lines.append(f'{metric}_count{{view="{label}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+# ============ İSTEK ÖLÇÜMÜ ============
+
+class RequestTimings:
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.spans = defaultdict(float)
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper: istekteki her SQL buradan geçer
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+
+_current = ContextVar('request_timings', default=None)
+
+
+@contextmanager
+def span(name):
+    """Ölçüm açıksa bloğun süresini isteğin Server-Timing'ine ekler (ör. 'serialize')"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.spans[name] += time.perf_counter() - started
+
+
+def server_timing(timings, total, render):
+    parts = [
+        f'db;dur={timings.db * 1000:.1f};desc="{timings.queries} queries"',
+        *(f'{name};dur={seconds * 1000:.1f}' for name, seconds in timings.spans.items()),
+        f'render;dur={render * 1000:.1f}',
+        f'total;dur={total * 1000:.1f}',
+    ]
+    return ', '.join(parts)
+
+
+class PerformanceMiddleware:
+    """
+    Ayarlardan PERF_METRICS_ENABLED kapalıysa yüklenmez (MiddlewareNotUsed).
+    Sorgu sayısı PERF_QUERY_WARNING_THRESHOLD'u aşan istekler loglanır (N+1 uyarısı).
+    """
+
+    def __init__(self, get_response):
+        if not settings.PERF_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = (match.view_name if match else None) or 'unmatched'
+        if view == 'metrics':
+            return response
+        render = getattr(request, '_perf_render', 0.0)
+        response['Server-Timing'] = server_timing(timings, total, render)
+
+        values = {
+            'request_duration_seconds': total,
+            'db_duration_seconds': timings.db,
+            'db_queries': timings.queries,
+            'render_duration_seconds': render,
+        }
+        if 'serialize' in timings.spans:
+            values['serialize_duration_seconds'] = timings.spans['serialize']
+        if not response.streaming:
+            values['response_size_bytes'] = len(response.content)
+        registry.observe(view, values)
+
+        if timings.queries > settings.PERF_QUERY_WARNING_THRESHOLD:
+            logger.warning(
+                "%s %s (%s): %d SQL sorgusu, %.1f ms",
+                request.method, request.path, view, timings.queries, timings.db * 1000,
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF Response burada henüz render edilmemiştir; render sonrası süre kaydedilir
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._perf_render = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+def metrics_view(request):
+    """
+    Prometheus kazıma endpoint'i. Ölçüm kapalıysa 404; PERF_METRICS_TOKEN
+    ayarlıysa 'Authorization: Bearer <token>' gerekir.
+    """
+    if not settings.PERF_METRICS_ENABLED:
+        raise Http404
+    token = settings.PERF_METRICS_TOKEN
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=403)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_customuser_deadline_alerts_customuser_department_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='mission',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Mission', 'verbose_name_plural': 'Missions'},
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['-created_at', '-id'], name='mission_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_visibility(apps, schema_editor):
+    Mission = apps.get_model('core', 'Mission')
+    MissionVisibility = apps.get_model('core', 'MissionVisibility')
+    Through = Mission.due_to.through
+    rows = [
+        MissionVisibility(user_id=user_id, mission_id=mission_id, relation='CREATOR')
+        for mission_id, user_id in Mission.objects.exclude(created_by=None).values_list('id', 'created_by_id')
+    ]
+    rows += [
+        MissionVisibility(user_id=user_id, mission_id=mission_id, relation='ASSIGNEE')
+        for mission_id, user_id in Through.objects.values_list('mission_id', 'customuser_id')
+    ]
+    MissionVisibility.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_mission_cursor_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MissionVisibility',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('relation', models.CharField(choices=[('CREATOR', 'Creator'), ('ASSIGNEE', 'Assignee')], max_length=10)),
+                ('mission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visibility', to='core.mission')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mission_visibility', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Mission Visibility',
+                'verbose_name_plural': 'Mission Visibility',
+                'constraints': [models.UniqueConstraint(fields=('user', 'mission', 'relation'), name='unique_mission_visibility')],
+            },
+        ),
+        migrations.RunPython(populate_visibility, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_missionvisibility'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['completed', 'end_date'], name='mission_completed_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['created_by', '-created_at'], name='mission_creator_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_mission_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['end_date', 'assigned_date'], name='mission_calendar_idx'),
+        ),
+    ]
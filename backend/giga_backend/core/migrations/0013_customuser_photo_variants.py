@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_attachmentblob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
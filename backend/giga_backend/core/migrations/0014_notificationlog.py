@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_customuser_photo_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('REMINDER', 'Reminder'), ('OVERDUE', 'Overdue')], max_length=10)),
+                ('end_date', models.DateField()),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('mission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_logs', to='core.mission')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_logs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Notification Log',
+                'verbose_name_plural': 'Notification Logs',
+                'constraints': [models.UniqueConstraint(fields=('user', 'mission', 'kind', 'end_date'), name='unique_notification_log')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_notificationlog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MissionChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mission_id', models.PositiveBigIntegerField()),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Mission Change',
+                'verbose_name_plural': 'Mission Changes',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['updated_at'], name='mission_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='missionchange',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mission_changes', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='missionchange',
+            index=models.Index(fields=['user', 'changed_at'], name='mission_change_user_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:32
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_completed_at(apps, schema_editor):
+    # Gerçek tamamlanma anı bilinmiyor; en yakın tahmin son güncelleme zamanı
+    Mission = apps.get_model('core', 'Mission')
+    Mission.objects.filter(completed=True, completed_at__isnull=True).update(completed_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_missionchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mission',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:10
+
+from django.db import migrations
+
+# SQLite: description/from_to için external-content FTS5 tablosu; tetikleyiciler
+# save/delete/bulk_create/update dahil her yazmada dizini günceller.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE core_mission_fts USING fts5(
+        description, from_to,
+        content='core_mission', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER core_mission_fts_ai AFTER INSERT ON core_mission BEGIN
+        INSERT INTO core_mission_fts(rowid, description, from_to)
+        VALUES (new.id, new.description, new.from_to);
+    END
+    """,
+    """
+    CREATE TRIGGER core_mission_fts_ad AFTER DELETE ON core_mission BEGIN
+        INSERT INTO core_mission_fts(core_mission_fts, rowid, description, from_to)
+        VALUES ('delete', old.id, old.description, old.from_to);
+    END
+    """,
+    """
+    CREATE TRIGGER core_mission_fts_au AFTER UPDATE OF description, from_to ON core_mission BEGIN
+        INSERT INTO core_mission_fts(core_mission_fts, rowid, description, from_to)
+        VALUES ('delete', old.id, old.description, old.from_to);
+        INSERT INTO core_mission_fts(rowid, description, from_to)
+        VALUES (new.id, new.description, new.from_to);
+    END
+    """,
+    "INSERT INTO core_mission_fts(core_mission_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS core_mission_fts_au",
+    "DROP TRIGGER IF EXISTS core_mission_fts_ad",
+    "DROP TRIGGER IF EXISTS core_mission_fts_ai",
+    "DROP TABLE IF EXISTS core_mission_fts",
+]
+
+# PostgreSQL: ifade indeksi; core/search.py aynı ifadeyi kullanır
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX mission_search_idx ON core_mission USING GIN ((
+        to_tsvector('simple'::regconfig, COALESCE(description, '') || ' ' || COALESCE(from_to, ''))
+    ))
+    """,
+]
+
+POSTGRES_BACKWARD = ["DROP INDEX IF EXISTS mission_search_idx"]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for sql in statements.get(vendor, ()):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_mission_completed_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}),
+        ),
+    ]
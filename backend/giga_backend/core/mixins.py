@@ -0,0 +1,90 @@
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .metrics import span
+from .versions import DIRECTORY_KEY, get_versions
+
+
+class NotModified(Exception):
+    """initial() içinden 304 yanıtını taşır"""
+
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    GET/HEAD yanıtlarına ucuz sürüm sayaçlarından türetilen ETag ve
+    Last-Modified ekler; If-None-Match eşleşirse serileştirme yapmadan 304 döner.
+    Alt sınıflar get_version_keys() tanımlar.
+    """
+    def get_version_keys(self):
+        raise NotImplementedError
+
+    def get_validators(self, request):
+        versions = get_versions(self.get_version_keys())
+        # Aynı sürümler farklı sorgu/sayfa/format/gün için farklı ETag üretmeli
+        seed = '|'.join([
+            str(request.user.pk),
+            request.get_host(),
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            timezone.localdate().isoformat(),
+            *map(str, versions),
+        ])
+        etag = '"%s"' % hashlib.sha1(seed.encode()).hexdigest()
+        last_modified = datetime.fromtimestamp(max(versions) / 1e9, tz=dt_timezone.utc)
+        return etag, last_modified
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._validators = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+        self._validators = self.get_validators(request)
+        etag, _ = self._validators
+        # Sürümler ns hassasiyetinde; saniyelik If-Modified-Since güvenli
+        # karşılaştırılamaz, bu yüzden sadece ETag değerlendirilir.
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, '_validators', None)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+            # Tarayıcı her seferinde doğrulasın (private: kullanıcıya özel veri)
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class DirectoryCacheMixin:
+    """
+    Kullanıcı dizini yanıtlarını Django cache'inde tutar.
+    Anahtar dizin sürümünü içerir; CustomUser kaydedilince/silinince
+    sürüm değişir ve eski girdiler bir daha okunmaz.
+    """
+    def get_cached_directory(self, scope, build):
+        version = get_versions([DIRECTORY_KEY])[0]
+        # profile_photo mutlak URL olduğu için host da anahtarda
+        key = f'directory:{scope}:{self.request.get_host()}:{version}'
+        data = cache.get(key)
+        if data is None:
+            with span('serialize'):
+                data = build()
+            cache.set(key, data, settings.DIRECTORY_CACHE_TIMEOUT)
+        return data
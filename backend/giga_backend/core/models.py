@@ -1,5 +1,12 @@
+import os
+import uuid
+from itertools import islice
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Value, When
+from django.utils import timezone
 
 class CustomUser(AbstractUser):
     ROLE_CHOICES = [
@@ -15,6 +22,8 @@ class CustomUser(AbstractUser):
     department = models.CharField(max_length=100, blank=True, null=True, verbose_name="Departman")
     phone = models.CharField(max_length=20, blank=True, null=True, verbose_name="Telefon")
     profile_photo = models.ImageField(upload_to='profile_photos/', blank=True, null=True, verbose_name="Profil Fotoğrafı")
+    # Küçültülmüş fotoğraflar: {'thumb': 'profile_photos/variants/...', ...}
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)
     
     # Bildirim ayarları
     email_notifications = models.BooleanField(default=True, verbose_name="E-posta Bildirimleri")
@@ -30,19 +39,143 @@ class CustomUser(AbstractUser):
         verbose_name_plural = "Kullanıcılar"
 
 
+class AttachmentBlob(models.Model):
+    """
+    İçerik adresli dosya: her benzersiz içerik SHA-256'sı ile bir kez saklanır.
+    ref_count, bu içeriği kullanan MissionAttachment sayısıdır.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(max_length=255)
+    size = models.BigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Attachment Blob"
+        verbose_name_plural = "Attachment Blobs"
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count})"
+
+
 class MissionAttachment(models.Model):
     mission = models.ForeignKey(
         'Mission',
         on_delete=models.CASCADE,
         related_name='attachments'
     )
-    file = models.FileField(upload_to='mission_files/')
+    file = models.FileField(upload_to='mission_files/', max_length=255)
+    # Dosya blob yolunda saklanır; kullanıcıya gösterilen ad burada
+    name = models.CharField(max_length=255, blank=True, default='')
+    blob = models.ForeignKey(
+        AttachmentBlob,
+        on_delete=models.PROTECT,
+        related_name='attachments',
+        blank=True,
+        null=True
+    )
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return self.file.name
+        return self.name or self.file.name
+
+    def save(self, *args, **kwargs):
+        # Yeni yüklenen dosya içerik adresli depoya yönlendirilir (tekilleştirme)
+        if self.file and not self.file._committed and self.blob_id is None:
+            from .blobstore import store_file
+            self.name = self.name or os.path.basename(self.file.name)
+            self.blob = store_file(self.file)
+            self.file.name = self.blob.file.name
+            self.file._committed = True
+        super().save(*args, **kwargs)
     
 
+class UploadSession(models.Model):
+    """
+    Parça parça (chunked) ve kaldığı yerden devam ettirilebilir dosya yükleme.
+    Parçalar geldikçe doğrudan diske (ofsetine) yazılır; tamamlanınca SHA-256
+    doğrulanır ve görev oluşturma/güncellemede upload_ids ile eklenir.
+    """
+    PENDING = 'PENDING'
+    COMPLETE = 'COMPLETE'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (COMPLETE, 'Complete'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions'
+    )
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    checksum = models.CharField(max_length=64, blank=True, default='')
+    received_chunks = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Upload Session"
+        verbose_name_plural = "Upload Sessions"
+
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
+
+    @property
+    def total_chunks(self):
+        return max(1, -(-self.size // self.chunk_size))
+
+    @property
+    def path(self):
+        """Parçaların yazıldığı geçici dosya"""
+        return os.path.join(settings.UPLOAD_SESSION_ROOT, f'{self.id}.part')
+
+    def chunk_length(self, index):
+        """index numaralı parçanın beklenen bayt uzunluğu"""
+        if index == self.total_chunks - 1:
+            return self.size - index * self.chunk_size
+        return self.chunk_size
+
+    def missing_chunks(self):
+        received = set(self.received_chunks)
+        return [index for index in range(self.total_chunks) if index not in received]
+
+    def discard_file(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class MissionQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Kullanıcının görebildiği görevler (MissionVisibility üzerinden tek indeksli arama)"""
+        return self.filter(
+            id__in=MissionVisibility.objects.filter(user_id=user.id).values('mission_id')
+        )
+
+    def toggle_completion(self, mission_id, user):
+        """
+        Tek koşullu UPDATE: görev kullanıcıya atanmışsa completed'ı tersine
+        çevirir ve completed_at'i ayarlar. Güncellenen satır sayısını döner.
+        Sinyal tetiklemez; çağıran sürümleri kendisi yeniler.
+        """
+        now = timezone.now()
+        assigned = MissionVisibility.objects.filter(
+            user_id=user.id, relation=MissionVisibility.ASSIGNEE
+        ).values('mission_id')
+        # completed en sonda: MySQL SET ifadelerini soldan sağa, yeni değerle değerlendirir
+        return self.filter(pk=mission_id, id__in=assigned).update(
+            completed_at=Case(When(completed=False, then=Value(now)), default=Value(None)),
+            updated_at=now,
+            completed=Case(When(completed=True, then=Value(False)), default=Value(True)),
+        )
+
+
 class Mission(models.Model):
     description = models.TextField(blank=True, null=True)
     assigned_date = models.DateField()
@@ -66,35 +199,202 @@ class Mission(models.Model):
     )
     
     completed = models.BooleanField(default=False)
+    completed_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = MissionQuerySet.as_manager()
+
     def __str__(self):
         return f"Mission {self.id}: {self.description[:50] if self.description else 'No description'}"
 
     class Meta:
         verbose_name = "Mission"
         verbose_name_plural = "Missions"
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # Cursor sayfalama (-created_at, -id) için
+            models.Index(fields=['-created_at', '-id'], name='mission_created_id_idx'),
+            # Arşiv/gecikme filtreleri (?completed=, ?overdue=, end_date aralığı)
+            models.Index(fields=['completed', 'end_date'], name='mission_completed_end_idx'),
+            # ?created_by= filtresi, oluşturulma sırasıyla
+            models.Index(fields=['created_by', '-created_at'], name='mission_creator_created_idx'),
+            # Takvim aralık kesişimi (end_date >= start AND assigned_date <= end)
+            models.Index(fields=['end_date', 'assigned_date'], name='mission_calendar_idx'),
+            # ?updated_since= artımlı senkronizasyon
+            models.Index(fields=['updated_at'], name='mission_updated_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # created_by/completed değişikliğini post_save'de ek sorgu atmadan anlamak için
+        instance._loaded_created_by_id = instance.__dict__.get('created_by_id')
+        instance._loaded_completed = instance.__dict__.get('completed')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        # completed_at tamamlanma durumunu izler
+        if self.completed and self.completed_at is None:
+            self.completed_at = timezone.now()
+        elif not self.completed:
+            self.completed_at = None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'completed' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'completed_at'}
+        super().save(*args, **kwargs)
     
     # ============ YETKİ KONTROL METODları ============
     
+    def is_assigned_to(self, user):
+        """Görev kullanıcıya atanmış mı? (prefetch edilmişse sorgu atmaz)"""
+        prefetched = getattr(self, '_prefetched_objects_cache', {})
+        if 'due_to' in prefetched:
+            return any(assignee.id == user.id for assignee in prefetched['due_to'])
+        return self.due_to.filter(id=user.id).exists()
+    
     def can_view(self, user):
-        """Kullanıcı bu görevi görebilir mi?"""
-        # Görevi oluşturan kişi görebilir
-        if self.created_by == user:
-            return True
-        # Görev kendisine atanmışsa görebilir
-        if self.due_to.filter(id=user.id).exists():
-            return True
-        return False
+        """Kullanıcı bu görevi görebilir mi? (oluşturan veya atanan)"""
+        return MissionVisibility.objects.filter(user_id=user.id, mission_id=self.id).exists()
     
     def can_edit(self, user):
         """Kullanıcı bu görevi düzenleyebilir mi?"""
         # Sadece görevi oluşturan kişi düzenleyebilir
-        return self.created_by == user
+        # created_by_id karşılaştırması created_by'ı yüklemez
+        return self.created_by_id is not None and self.created_by_id == user.id
     
     def can_complete(self, user):
         """Kullanıcı bu görevi tamamlayabilir mi?"""
         # Sadece görev kendisine atanmışsa complete edebilir
-        return self.due_to.filter(id=user.id).exists()
\ No newline at end of file
+        return self.is_assigned_to(user)
+
+
+class MissionChange(models.Model):
+    """
+    Görünürlük değişikliği günlüğü: kullanıcı görevi görmeye başladı, artık
+    göremiyor veya görev silindi. ?updated_since= bu satırlar ile updated_at'e
+    göre değişen görevleri birleştirir; güncel duruma göre tombstone üretir.
+    Görev silinse de satır kalır (FK yok); eski satırlar prune_mission_changes ile silinir.
+    """
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='mission_changes'
+    )
+    # Mission.id BigAutoField; aynı aralığı taşımalı
+    mission_id = models.PositiveBigIntegerField()
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Mission Change"
+        verbose_name_plural = "Mission Changes"
+        indexes = [
+            models.Index(fields=['user', 'changed_at'], name='mission_change_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} -> Mission {self.mission_id} ({self.changed_at})"
+
+
+class NotificationLog(models.Model):
+    """
+    Gönderilmiş bildirimler. (kullanıcı, görev, tür, termin) bir kez gönderilir;
+    termin değişirse görev için yeni bildirim gidebilir.
+    """
+    REMINDER = 'REMINDER'
+    OVERDUE = 'OVERDUE'
+    KIND_CHOICES = [
+        (REMINDER, 'Reminder'),
+        (OVERDUE, 'Overdue'),
+    ]
+
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='notification_logs'
+    )
+    mission = models.ForeignKey(
+        Mission,
+        on_delete=models.CASCADE,
+        related_name='notification_logs'
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    end_date = models.DateField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Notification Log"
+        verbose_name_plural = "Notification Logs"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'mission', 'kind', 'end_date'],
+                name='unique_notification_log'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} -> Mission {self.mission_id} ({self.kind}, {self.end_date})"
+
+
+class MissionVisibility(models.Model):
+    """
+    (kullanıcı, görev, ilişki) görünürlük tablosu.
+    created_by ve due_to'dan türetilir; core.signals tarafından güncel tutulur.
+    """
+    CREATOR = 'CREATOR'
+    ASSIGNEE = 'ASSIGNEE'
+    RELATION_CHOICES = [
+        (CREATOR, 'Creator'),
+        (ASSIGNEE, 'Assignee'),
+    ]
+
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='mission_visibility'
+    )
+    mission = models.ForeignKey(
+        Mission,
+        on_delete=models.CASCADE,
+        related_name='visibility'
+    )
+    relation = models.CharField(max_length=10, choices=RELATION_CHOICES)
+
+    class Meta:
+        verbose_name = "Mission Visibility"
+        verbose_name_plural = "Mission Visibility"
+        constraints = [
+            # (user, mission) önekli indeks: visible_to ve can_view bunu kullanır
+            models.UniqueConstraint(
+                fields=['user', 'mission', 'relation'],
+                name='unique_mission_visibility'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} -> Mission {self.mission_id} ({self.relation})"
+
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        """Tabloyu created_by ve due_to'dan sıfırdan oluştur"""
+        Through = Mission.due_to.through
+        creators = (
+            cls(user_id=user_id, mission_id=mission_id, relation=cls.CREATOR)
+            for mission_id, user_id in Mission.objects.exclude(created_by=None)
+            .values_list('id', 'created_by_id').order_by().iterator(chunk_size=batch_size)
+        )
+        assignees = (
+            cls(user_id=user_id, mission_id=mission_id, relation=cls.ASSIGNEE)
+            for mission_id, user_id in Through.objects
+            .values_list('mission_id', 'customuser_id').order_by().iterator(chunk_size=batch_size)
+        )
+        with transaction.atomic():
+            cls.objects.all().delete()
+            total = 0
+            for rows in (creators, assignees):
+                batch = list(islice(rows, batch_size))
+                while batch:
+                    cls.objects.bulk_create(batch)
+                    total += len(batch)
+                    batch = list(islice(rows, batch_size))
+        return total
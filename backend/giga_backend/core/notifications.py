@@ -0,0 +1,135 @@
+"""
+Termin hatırlatmaları ve gecikme uyarıları.
+
+Açık görevler (completed, end_date) indeksinden tek sorguyla, daha önce
+gönderilmemiş olanlar hariç tutularak okunur; kullanıcı başına tek e-postada
+toplanır ve tek SMTP bağlantısı üzerinden partiler halinde gönderilir.
+Gönderilen her parti NotificationLog'a yazılır; tekrar çalıştırmak güvenlidir.
+"""
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
+from django.utils import timezone
+
+from .models import Mission, NotificationLog
+
+KIND_TITLES = {
+    NotificationLog.OVERDUE: "Termini geçen görevler",
+    NotificationLog.REMINDER: "Termini yaklaşan görevler",
+}
+
+
+def pending_notifications(today=None):
+    """Gönderilmesi gereken (kullanıcı, görev, tür) satırları, kullanıcıya göre sıralı"""
+    today = today or timezone.localdate()
+    horizon = today + timedelta(days=settings.NOTIFICATION_REMINDER_DAYS)
+    oldest = today - timedelta(days=settings.NOTIFICATION_OVERDUE_LOOKBACK_DAYS)
+    sent = NotificationLog.objects.filter(
+        user_id=OuterRef('customuser_id'),
+        mission_id=OuterRef('mission_id'),
+        kind=OuterRef('kind'),
+        end_date=OuterRef('mission__end_date'),
+    )
+    return (
+        Mission.due_to.through.objects
+        .filter(
+            mission__completed=False,
+            mission__end_date__gte=oldest,
+            mission__end_date__lte=horizon,
+            customuser__is_active=True,
+            customuser__email_notifications=True,
+        )
+        .filter(
+            Q(mission__end_date__lt=today, customuser__deadline_alerts=True)
+            | Q(mission__end_date__gte=today, customuser__task_reminders=True)
+        )
+        .annotate(kind=Case(
+            When(mission__end_date__lt=today, then=Value(NotificationLog.OVERDUE)),
+            default=Value(NotificationLog.REMINDER),
+        ))
+        .exclude(Exists(sent))
+        .values(
+            'customuser_id', 'customuser__username', 'customuser__email',
+            'customuser__notification_email', 'mission_id', 'mission__description',
+            'mission__end_date', 'kind',
+        )
+        .order_by('customuser_id', 'kind', 'mission__end_date', 'mission_id')
+    )
+
+
+def build_message(rows):
+    """Bir kullanıcının satırlarından tek e-posta (alıcı yoksa None)"""
+    first = rows[0]
+    address = first['customuser__notification_email'] or first['customuser__email']
+    if not address:
+        return None
+    lines = [f"Merhaba {first['customuser__username']},", ""]
+    for kind, items in groupby(rows, key=lambda row: row['kind']):
+        lines.append(f"{KIND_TITLES[kind]}:")
+        for row in items:
+            description = (row['mission__description'] or f"Görev #{row['mission_id']}").strip()
+            lines.append(f"- {description[:120]} (termin: {row['mission__end_date']:%d.%m.%Y})")
+        lines.append("")
+    count = len(rows)
+    return EmailMessage(
+        subject=f"Görev bildirimi: {count} görev",
+        body="\n".join(lines),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[address],
+    )
+
+
+def _logs(rows):
+    return [
+        NotificationLog(
+            user_id=row['customuser_id'], mission_id=row['mission_id'],
+            kind=row['kind'], end_date=row['mission__end_date'],
+        )
+        for row in rows
+    ]
+
+
+def dispatch_notifications(today=None, batch_size=None, dry_run=False, connection=None):
+    """
+    Bekleyen bildirimleri gönderir; {'emails': n, 'missions': m, 'skipped': k} döner.
+    Bir parti gönderilmeden önce hata olursa o partinin kaydı yazılmaz ve
+    sonraki çalıştırmada yeniden denenir.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    result = {'emails': 0, 'missions': 0, 'skipped': 0}
+    rows = pending_notifications(today).iterator(chunk_size=2000)
+    if not dry_run:
+        connection = connection or get_connection()
+        connection.open()
+
+    messages, logged = [], []
+
+    def flush():
+        if not dry_run:
+            connection.send_messages(messages)
+            NotificationLog.objects.bulk_create(_logs(logged), ignore_conflicts=True)
+        result['emails'] += len(messages)
+        result['missions'] += len(logged)
+        messages.clear()
+        logged.clear()
+
+    try:
+        for _, user_rows in groupby(rows, key=lambda row: row['customuser_id']):
+            user_rows = list(user_rows)
+            message = build_message(user_rows)
+            if message is None:
+                result['skipped'] += 1
+                continue
+            messages.append(message)
+            logged.extend(user_rows)
+            if len(messages) >= batch_size:
+                flush()
+        if messages:
+            flush()
+    finally:
+        if not dry_run:
+            connection.close()
+    return result
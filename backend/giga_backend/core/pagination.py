@@ -0,0 +1,43 @@
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class MissionCursorPagination(CursorPagination):
+    """
+    Görev listesi için keyset (cursor) sayfalama.
+    COUNT(*) ve OFFSET taraması yapmaz; sıralama Mission.Meta.ordering ile aynıdır.
+    """
+    ordering = ('-created_at', '-id')
+
+
+class MissionSearchPagination(BasePagination):
+    """
+    Alaka sıralı arama sonuçları için ?page= sayfalama.
+    COUNT(*) yapılmaz; sonraki sayfa olup olmadığı için bir fazla satır okunur.
+    """
+    page_size = 20
+    max_page_size = 100
+
+    def _int_param(self, name, default):
+        try:
+            return max(int(self.request.query_params.get(name, default)), 1)
+        except (TypeError, ValueError):
+            return default
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page = self._int_param('page', 1)
+        size = min(self._int_param('page_size', self.page_size), self.max_page_size)
+        offset = (self.page - 1) * size
+        rows = list(queryset[offset:offset + size + 1])
+        self.has_next = len(rows) > size
+        return rows[:size]
+
+    def get_paginated_response(self, data):
+        url = self.request.build_absolute_uri()
+        next_url = replace_query_param(url, 'page', self.page + 1) if self.has_next else None
+        previous_url = None
+        if self.page > 1:
+            previous_url = replace_query_param(url, 'page', self.page - 1)
+        return Response({'next': next_url, 'previous': previous_url, 'results': data})
@@ -0,0 +1,109 @@
+"""
+Profil fotoğrafı varyantları.
+
+Görev listeleri ve organizasyon şeması her kullanıcıyı fotoğrafıyla birlikte
+gösterir; orijinal yerine küçük varyantlar (thumb/medium) bir kez üretilip
+diskte saklanır ve CustomUser.photo_variants alanına yazılır.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+from .authentication import forget_user
+from .models import CustomUser
+from .versions import DIRECTORY_KEY, bump, user_key
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR = 'profile_photos/variants'
+_executor = None
+
+
+def photo_storage():
+    return CustomUser._meta.get_field('profile_photo').storage
+
+
+def variant_url(photo, variants, variant, request=None):
+    """Varyantın URL'i; henüz üretilmemişse orijinal fotoğraf, fotoğraf yoksa None"""
+    name = (variants or {}).get(variant) or photo
+    if not name:
+        return None
+    url = photo_storage().url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def variant_urls(photo, variants, request=None):
+    return {
+        variant: variant_url(photo, variants, variant, request)
+        for variant in settings.PROFILE_PHOTO_VARIANTS
+    }
+
+
+def _render(image, size):
+    copy = image.copy()
+    copy.thumbnail((size, size), Image.LANCZOS)
+    buffer = BytesIO()
+    copy.save(buffer, format='JPEG', quality=85, optimize=True)
+    return ContentFile(buffer.getvalue())
+
+
+def generate_variants(user_id, photo):
+    """
+    Fotoğrafın varyantlarını üretip kaydeder. Bu arada fotoğraf değiştiyse
+    üretilen dosyalar silinir; güncel fotoğrafın işi ayrıca çalışır.
+    """
+    storage = photo_storage()
+    stem = os.path.splitext(os.path.basename(photo))[0]
+    with storage.open(photo, 'rb') as f:
+        image = ImageOps.exif_transpose(Image.open(f))
+        image = image.convert('RGB')
+
+    variants = {}
+    for variant, size in settings.PROFILE_PHOTO_VARIANTS.items():
+        name = f'{VARIANT_DIR}/{user_id}/{stem}_{variant}.jpg'
+        variants[variant] = storage.save(name, _render(image, size))
+
+    updated = CustomUser.objects.filter(pk=user_id, profile_photo=photo).update(photo_variants=variants)
+    if not updated:
+        delete_variants(variants)
+        return None
+    # update() sinyal tetiklemez: JWT kullanıcı cache'i de elle düşürülür
+    forget_user(user_id)
+    bump([DIRECTORY_KEY, user_key(user_id)])
+    return variants
+
+
+def delete_variants(variants):
+    storage = photo_storage()
+    for name in (variants or {}).values():
+        storage.delete(name)
+
+
+def _run(user_id, photo):
+    try:
+        generate_variants(user_id, photo)
+    except Exception:
+        logger.exception("Profil fotoğrafı varyantları üretilemedi (kullanıcı %s)", user_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(user_id, photo):
+    """Commit sonrası varyant üretimini arka plan iş parçacığına bırak"""
+    global _executor
+    if not photo:
+        return
+    if not settings.PROFILE_PHOTO_ASYNC:
+        transaction.on_commit(lambda: generate_variants(user_id, photo))
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PROFILE_PHOTO_WORKERS, thread_name_prefix='profile-photo'
+        )
+    transaction.on_commit(lambda: _executor.submit(_run, user_id, photo))
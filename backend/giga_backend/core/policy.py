@@ -0,0 +1,111 @@
+from rest_framework import status
+
+from .models import CustomUser, MissionVisibility
+
+
+class AssignmentPolicy:
+    """
+    Rol bazlı atama kuralları ve görev yetki kontrolleri.
+    Bir istek boyunca tek örnek kullanılır (for_request); kullanıcı rolleri
+    ve görev üyelikleri ilk ihtiyaçta yüklenip tekrar sorgulanmaz.
+    """
+    # Rol bazlı atama kısıtları (CEO herkese atayabilir)
+    ROLE_ERRORS = {
+        'EMPLOYEE': "Çalışanlar sadece diğer çalışanlara görev atayabilir.",
+        'MANAGER': "Yöneticiler sadece çalışanlara görev atayabilir.",
+    }
+    ASSIGNABLE_ROLE = 'EMPLOYEE'
+
+    def __init__(self, user):
+        self.user = user
+        self._users = {}       # id -> (username, role); yoksa None
+        self._assigned = {}    # mission_id -> bool
+
+    @classmethod
+    def for_request(cls, request):
+        """İstek üzerinde memoize edilmiş policy"""
+        policy = getattr(request, '_assignment_policy', None)
+        if policy is None or policy.user != request.user:
+            policy = cls(request.user)
+            request._assignment_policy = policy
+        return policy
+
+    # ============ KULLANICI ROLLERİ ============
+
+    @staticmethod
+    def parse_ids(values):
+        """Form/JSON'dan gelen id'leri int'e çevir (geçersizleri serializer yakalar)"""
+        ids = []
+        for value in values or ():
+            try:
+                ids.append(int(value))
+            except (TypeError, ValueError):
+                continue
+        return ids
+
+    def load_users(self, ids):
+        """Henüz bilinmeyen kullanıcıları tek values_list sorgusunda yükle"""
+        missing = set(ids) - self._users.keys()
+        if not missing:
+            return
+        found = CustomUser.objects.filter(id__in=missing).values_list('id', 'username', 'role')
+        for pk, username, role in found:
+            self._users[pk] = (username, role)
+        for pk in missing - self._users.keys():
+            self._users[pk] = None
+
+    def check_assignment(self, ids, require_existing=False):
+        """
+        Kullanıcının bu kişilere görev atayıp atayamayacağını kontrol eder.
+        Sorun yoksa None, varsa (status, errors) döner.
+        """
+        ids = self.parse_ids(ids)
+        if not ids:
+            return None
+        self.load_users(ids)
+
+        if require_existing:
+            missing = sorted({pk for pk in ids if self._users[pk] is None})
+            if missing:
+                return status.HTTP_400_BAD_REQUEST, {'due_to': [f"Geçersiz kullanıcı id'leri: {missing}"]}
+
+        message = self.ROLE_ERRORS.get(self.user.role)
+        if message:
+            invalid = [
+                self._users[pk][0] for pk in ids
+                if self._users[pk] is not None and self._users[pk][1] != self.ASSIGNABLE_ROLE
+            ]
+            if invalid:
+                return status.HTTP_403_FORBIDDEN, {
+                    'detail': f"{message} Geçersiz kullanıcılar: {', '.join(invalid)}",
+                    'invalid_users': invalid,
+                }
+        return None
+
+    # ============ GÖREV YETKİLERİ ============
+
+    def is_assigned(self, mission):
+        """Görev kullanıcıya atanmış mı? (prefetch veya memo; yoksa tek sorgu)"""
+        if mission.id not in self._assigned:
+            prefetched = getattr(mission, '_prefetched_objects_cache', {})
+            if 'due_to' in prefetched:
+                assigned = any(assignee.id == self.user.id for assignee in prefetched['due_to'])
+            else:
+                assigned = MissionVisibility.objects.filter(
+                    user_id=self.user.id, mission_id=mission.id, relation=MissionVisibility.ASSIGNEE
+                ).exists()
+            self._assigned[mission.id] = assigned
+        return self._assigned[mission.id]
+
+    def forget(self, mission_ids):
+        """Atamaları değişen görevlerin memo'sunu sil"""
+        for mission_id in mission_ids:
+            self._assigned.pop(mission_id, None)
+
+    def can_edit(self, mission):
+        # Sadece görevi oluşturan kişi düzenleyebilir
+        return mission.created_by_id is not None and mission.created_by_id == self.user.id
+
+    def can_complete(self, mission):
+        # Sadece görev kendisine atanmışsa complete edebilir
+        return self.is_assigned(mission)
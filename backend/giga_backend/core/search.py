@@ -0,0 +1,133 @@
+"""
+Görev açıklaması ve from_to üzerinde indeksli tam metin arama.
+
+SQLite'ta core_mission_fts (FTS5, bm25), PostgreSQL'de GIN ifade indeksi
+(ts_rank) kullanılır; ikisi de 0017_mission_search migration'ı ile kurulur ve
+veritabanı tarafında güncel tutulur. Diğer veritabanlarında icontains'e düşülür.
+Sonuçlar search_rank (büyük = daha alakalı) alanıyla işaretlenir.
+"""
+import re
+import unicodedata
+
+from django.db import connection
+from django.db.models import F, FloatField, Func, Q, Value
+from django.db.models.expressions import RawSQL
+
+MAX_TERMS = 8
+
+# mission_search_idx ile birebir aynı olmalı, yoksa indeks kullanılmaz
+POSTGRES_VECTOR = (
+    "to_tsvector('simple'::regconfig, "
+    "COALESCE(core_mission.description, '') || ' ' || COALESCE(core_mission.from_to, ''))"
+)
+
+
+def search_terms(query):
+    """
+    Sorgudaki kelimeler (operatör/özel karakterler atılır); her kelime olası
+    küçük harf yazımlarının tuple'ıdır. Türkçe büyük harfler: 'İ'.lower()
+    birleşik nokta (U+0307) üretir ve \\w bunu eşlemez ("İstanbul" ->
+    ['i', 'stanbul']), bu yüzden önce 'İ' -> 'i' çevrilir. 'I' hem 'i' hem
+    'ı' olabilir ("AYLIK" -> aylik/aylık); iki yazım da aranır.
+    """
+    text = unicodedata.normalize('NFC', query or '').replace('İ', 'i')
+    terms = []
+    for word in re.findall(r'\w+', text)[:MAX_TERMS]:
+        variants = [word.lower()]
+        if 'I' in word:
+            variants.append(word.replace('I', 'ı').lower())
+        terms.append(tuple(dict.fromkeys(variants)))
+    return terms
+
+
+def fts5_query(terms):
+    # Her yazım tırnak içinde (FTS sözdizimi enjekte edilemez); son kelime önek araması
+    groups = []
+    for index, variants in enumerate(terms):
+        star = '*' if index == len(terms) - 1 else ''
+        groups.append('(' + ' OR '.join(f'"{variant}"{star}' for variant in variants) + ')')
+    return ' AND '.join(groups)
+
+
+def tsquery(terms):
+    groups = []
+    for index, variants in enumerate(terms):
+        prefix = ':*' if index == len(terms) - 1 else ''
+        groups.append('(' + ' | '.join(f"'{variant}'{prefix}" for variant in variants) + ')')
+    return ' & '.join(groups)
+
+
+def _icontains(terms):
+    condition = Q()
+    for variants in terms:
+        match = Q()
+        for variant in variants:
+            match |= Q(description__icontains=variant) | Q(from_to__icontains=variant)
+        condition &= match
+    return condition
+
+
+def _matches(terms):
+    # Alt sorgular dış sorguya bağlı değildir; başka koşullarla OR'lanabilir
+    if connection.vendor == 'sqlite':
+        return Q(id__in=RawSQL(
+            "SELECT rowid FROM core_mission_fts WHERE core_mission_fts MATCH %s", [fts5_query(terms)]
+        ))
+    if connection.vendor == 'postgresql':
+        return Q(id__in=RawSQL(
+            f"SELECT id FROM core_mission WHERE {POSTGRES_VECTOR} @@ to_tsquery('simple', %s)", [tsquery(terms)]
+        ))
+    return _icontains(terms)
+
+
+class SearchRank(Func):
+    """
+    Satırın alaka puanı (büyük = daha alakalı). Sütunlar derleyiciden gelir,
+    tablo adı/alias'ı sabitlenmez; sorgu alt sorgu olarak da kullanılabilir.
+    """
+    output_field = FloatField()
+
+    def __init__(self, query):
+        super().__init__(F('id'), F('description'), F('from_to'))
+        self.query = query
+
+    def as_sqlite(self, compiler, connection):
+        id_sql, params = compiler.compile(self.source_expressions[0])
+        return (
+            "(SELECT -bm25(core_mission_fts) FROM core_mission_fts "
+            f"WHERE core_mission_fts MATCH %s AND core_mission_fts.rowid = {id_sql})"
+        ), [self.query, *params]
+
+    def as_postgresql(self, compiler, connection):
+        description, description_params = compiler.compile(self.source_expressions[1])
+        from_to, from_to_params = compiler.compile(self.source_expressions[2])
+        return (
+            f"ts_rank(to_tsvector('simple'::regconfig, COALESCE({description}, '') || ' ' || "
+            f"COALESCE({from_to}, '')), to_tsquery('simple', %s))"
+        ), [*description_params, *from_to_params, self.query]
+
+
+def search_filter(query):
+    """Sıralama gerekmeyen yerler için (ör. admin) eşleşen görevleri seçen Q"""
+    terms = search_terms(query)
+    if not terms:
+        raise ValueError(query)
+    return _matches(terms)
+
+
+def search_missions(queryset, query):
+    """
+    queryset'i (ör. visible_to) arama sorgusuyla daraltır ve alaka sırasına
+    (-search_rank, -id) dizer. Geçerli terim yoksa ValueError.
+    """
+    terms = search_terms(query)
+    if not terms:
+        raise ValueError(query)
+
+    if connection.vendor == 'sqlite':
+        rank = SearchRank(fts5_query(terms))
+    elif connection.vendor == 'postgresql':
+        rank = SearchRank(tsquery(terms))
+    else:
+        rank = Value(0.0)
+    return queryset.filter(_matches(terms)).annotate(search_rank=rank).order_by('-search_rank', '-id')
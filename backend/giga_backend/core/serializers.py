@@ -1,17 +1,53 @@
+import os
+
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
-from .models import CustomUser, Mission, MissionAttachment
+from .models import CustomUser, Mission, MissionAttachment, UploadSession
+from .photos import variant_url, variant_urls
+from .policy import AssignmentPolicy
+from .uploads import attach_uploads
+
+
+def build_full_name(first_name, last_name, username):
+    """Ad soyad; ikisi de yoksa kullanıcı adı"""
+    if first_name and last_name:
+        return f"{first_name} {last_name}"
+    elif first_name:
+        return first_name
+    elif last_name:
+        return last_name
+    return username
+
+
+class PhotoVariantsMixin:
+    """profile_photo_thumb / profile_photo_medium alanları (üretilmemişse orijinal)"""
+
+    def _variant(self, obj, variant):
+        return variant_url(
+            obj.profile_photo.name, obj.photo_variants, variant, self.context.get('request')
+        )
+
+    def get_profile_photo_thumb(self, obj):
+        return self._variant(obj, 'thumb')
+
+    def get_profile_photo_medium(self, obj):
+        return self._variant(obj, 'medium')
 
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(PhotoVariantsMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=False)
     full_name = serializers.SerializerMethodField()
+    profile_photo_thumb = serializers.SerializerMethodField()
+    profile_photo_medium = serializers.SerializerMethodField()
     
     class Meta:
         model = CustomUser
         fields = [
             'id', 'username', 'email', 'password', 'unvan', 'role', 
             'first_name', 'last_name', 'full_name', 'department', 'phone',
-            'profile_photo', 'email_notifications', 'task_reminders',
+            'profile_photo', 'profile_photo_thumb', 'profile_photo_medium',
+            'email_notifications', 'task_reminders',
             'deadline_alerts', 'notification_email'
         ]
         read_only_fields = ['id', 'full_name', 'role']  # role sadece admin değiştirebilir
@@ -21,13 +57,7 @@ class CustomUserSerializer(serializers.ModelSerializer):
     
     def get_full_name(self, obj):
         """Full name hesapla"""
-        if obj.first_name and obj.last_name:
-            return f"{obj.first_name} {obj.last_name}"
-        elif obj.first_name:
-            return obj.first_name
-        elif obj.last_name:
-            return obj.last_name
-        return obj.username
+        return build_full_name(obj.first_name, obj.last_name, obj.username)
     
     def create(self, validated_data):
         password = validated_data.pop('password', None)
@@ -54,6 +84,69 @@ class CustomUserSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+# CustomUserSerializer çıktısıyla aynı sütunlar (password yazma amaçlı)
+USER_VALUE_FIELDS = [
+    'id', 'username', 'email', 'unvan', 'role',
+    'first_name', 'last_name', 'department', 'phone',
+    'profile_photo', 'photo_variants', 'email_notifications', 'task_reminders',
+    'deadline_alerts', 'notification_email'
+]
+
+
+def user_rows(queryset, request=None, chunk_size=2000):
+    """
+    values() üzerinden CustomUserSerializer ile aynı şekilde dict üretir.
+    Binlerce kullanıcı için nesne başına serializer kurulumundan kaçınır.
+    """
+    storage = CustomUser._meta.get_field('profile_photo').storage
+    for row in queryset.values(*USER_VALUE_FIELDS).iterator(chunk_size=chunk_size):
+        photo = row['profile_photo']
+        if photo:
+            photo = storage.url(photo)
+            if request is not None:
+                photo = request.build_absolute_uri(photo)
+        else:
+            photo = None
+        variants = variant_urls(row['profile_photo'], row['photo_variants'], request)
+        yield {
+            'id': row['id'],
+            'username': row['username'],
+            'email': row['email'],
+            'unvan': row['unvan'],
+            'role': row['role'],
+            'first_name': row['first_name'],
+            'last_name': row['last_name'],
+            'full_name': build_full_name(row['first_name'], row['last_name'], row['username']),
+            'department': row['department'],
+            'phone': row['phone'],
+            'profile_photo': photo,
+            'profile_photo_thumb': variants['thumb'],
+            'profile_photo_medium': variants['medium'],
+            'email_notifications': row['email_notifications'],
+            'task_reminders': row['task_reminders'],
+            'deadline_alerts': row['deadline_alerts'],
+            'notification_email': row['notification_email'],
+        }
+
+
+class UserSummarySerializer(PhotoVariantsMixin, serializers.ModelSerializer):
+    """Görev listelerinde side-load edilen sade kullanıcı gösterimi"""
+    full_name = serializers.SerializerMethodField()
+    profile_photo_thumb = serializers.SerializerMethodField()
+    profile_photo_medium = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = CustomUser
+        fields = [
+            'id', 'username', 'first_name', 'last_name', 'full_name',
+            'unvan', 'role', 'department', 'profile_photo',
+            'profile_photo_thumb', 'profile_photo_medium',
+        ]
+        read_only_fields = fields
+    
+    get_full_name = CustomUserSerializer.get_full_name
+
+
 class UserRegisterSerializer(serializers.ModelSerializer):
     """Sadece kayıt için kullanılan özel serializer"""
     password = serializers.CharField(write_only=True, required=True, min_length=8)
@@ -105,9 +198,59 @@ class UserRegisterSerializer(serializers.ModelSerializer):
 
 
 class MissionAttachmentSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+    
     class Meta:
         model = MissionAttachment
-        fields = ['id', 'file', 'uploaded_at']
+        fields = ['id', 'file', 'name', 'download_url', 'uploaded_at']
+    
+    def get_download_url(self, obj):
+        """İzin kontrollü indirme adresi (file sadece DEBUG'da servis edilir)"""
+        url = reverse('attachment-download', args=[obj.id])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    total_chunks = serializers.IntegerField(read_only=True)
+    missing_chunks = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = UploadSession
+        fields = [
+            'id', 'filename', 'size', 'checksum', 'chunk_size', 'total_chunks',
+            'received_chunks', 'missing_chunks', 'status', 'created_at', 'completed_at'
+        ]
+        read_only_fields = [
+            'id', 'chunk_size', 'received_chunks', 'status', 'created_at', 'completed_at'
+        ]
+    
+    def get_missing_chunks(self, obj):
+        return obj.missing_chunks()
+    
+    def validate_filename(self, value):
+        """Yol bilgisini at, sadece dosya adı kalsın"""
+        name = os.path.basename(value.replace('\\', '/'))
+        if not name:
+            raise serializers.ValidationError("Geçerli bir dosya adı girin.")
+        return name
+    
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Dosya boyutu sıfırdan büyük olmalıdır.")
+        if value > settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"Dosya en fazla {settings.UPLOAD_MAX_SIZE} bayt olabilir.")
+        return value
+    
+    def validate_checksum(self, value):
+        value = value.lower()
+        if value and (len(value) != 64 or any(c not in '0123456789abcdef' for c in value)):
+            raise serializers.ValidationError("SHA-256 checksum 64 karakterlik hex olmalıdır.")
+        return value
+    
+    def create(self, validated_data):
+        validated_data['chunk_size'] = settings.UPLOAD_CHUNK_SIZE
+        return super().create(validated_data)
 
 
 class MissionSerializer(serializers.ModelSerializer):
@@ -117,6 +260,12 @@ class MissionSerializer(serializers.ModelSerializer):
         write_only=True,
         required=False
     )
+    # Tamamlanmış parça parça yüklemeler (/api/uploads/) ek olarak bağlanır
+    upload_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        write_only=True,
+        required=False
+    )
 
     due_to_details = CustomUserSerializer(source='due_to', many=True, read_only=True)
     created_by_details = CustomUserSerializer(source='created_by', read_only=True)
@@ -146,51 +295,126 @@ class MissionSerializer(serializers.ModelSerializer):
             'created_by',
             'created_by_details',
             'completed',
+            'completed_at',
             'created_at',
             'updated_at',
             'new_attachments',
+            'upload_ids',
             'can_edit',
             'can_complete',
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'created_by']
+        read_only_fields = ['id', 'completed_at', 'created_at', 'updated_at', 'created_by']
     
-    def get_can_edit(self, obj):
+    # Çıktıda yeniden adlandırılan alanlar (?fields= bu adları kabul eder)
+    OUTPUT_NAMES = {
+        'assigned_users': 'due_to_details',
+        'created_by_info': 'created_by_details',
+    }
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        
+        # ?view=compact: kullanıcılar id olarak döner, detaylar side-load edilir
+        if self.context.get('compact'):
+            fields['due_to_details'] = serializers.PrimaryKeyRelatedField(
+                source='due_to', many=True, read_only=True
+            )
+            fields.pop('created_by_details')
+        
+        # ?fields=id,description,...: sadece istenen okunabilir alanlar
+        requested = self.context.get('fields')
+        if requested:
+            keep = {self.OUTPUT_NAMES.get(name, name) for name in requested}
+            for name in list(fields):
+                if not fields[name].write_only and name not in keep:
+                    fields.pop(name)
+        return fields
+    
+    def get_policy(self):
         request = self.context.get('request')
         if request and request.user:
-            return obj.can_edit(request.user)
-        return False
+            return AssignmentPolicy.for_request(request)
+        return None
+    
+    def get_can_edit(self, obj):
+        policy = self.get_policy()
+        return policy.can_edit(obj) if policy else False
     
     def get_can_complete(self, obj):
+        policy = self.get_policy()
+        return policy.can_complete(obj) if policy else False
+    
+    def validate_upload_ids(self, value):
+        """Sadece isteği yapan kullanıcının tamamlanmış yüklemeleri"""
         request = self.context.get('request')
-        if request and request.user:
-            return obj.can_complete(request.user)
-        return False
+        ids = set(value)
+        sessions = list(UploadSession.objects.filter(
+            id__in=ids,
+            user_id=request.user.id if request else None,
+            status=UploadSession.COMPLETE,
+        ))
+        if len(sessions) != len(ids):
+            raise serializers.ValidationError("Geçersiz veya tamamlanmamış yükleme.")
+        return sessions
     
     def create(self, validated_data):
         due_to_users = validated_data.pop('due_to', [])
         new_files = validated_data.pop('new_attachments', [])
+        uploads = validated_data.pop('upload_ids', [])
         mission = Mission.objects.create(**validated_data)
         if due_to_users:
             mission.due_to.set(due_to_users)
         for f in new_files:
             MissionAttachment.objects.create(mission=mission, file=f)
+        attach_uploads(mission, uploads)
         return mission
     
     def update(self, instance, validated_data):
         due_to_users = validated_data.pop('due_to', None)
         new_files = validated_data.pop('new_attachments', [])
+        uploads = validated_data.pop('upload_ids', [])
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
         if due_to_users is not None:
             instance.due_to.set(due_to_users)
+            policy = self.get_policy()
+            if policy:
+                policy.forget([instance.id])
         for f in new_files:
             MissionAttachment.objects.create(mission=instance, file=f)
+        attach_uploads(instance, uploads)
         return instance
     
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation['assigned_users'] = representation.pop('due_to_details', [])
-        representation['created_by_info'] = representation.pop('created_by_details', None)
+        if 'due_to_details' in representation:
+            representation['assigned_users'] = representation.pop('due_to_details')
+        if 'created_by_details' in representation:
+            representation['created_by_info'] = representation.pop('created_by_details')
         representation.pop('due_to', None)
-        return representation
\ No newline at end of file
+        return representation
+
+
+class MissionBulkItemSerializer(serializers.ModelSerializer):
+    """
+    Toplu oluşturma/güncelleme için tek görev. due_to burada sadece id
+    listesidir; varlık ve rol kontrolü tüm liste için tek sorguda yapılır.
+    """
+    id = serializers.IntegerField(required=False)
+    due_to = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False
+    )
+    
+    class Meta:
+        model = Mission
+        fields = [
+            'id',
+            'description',
+            'assigned_date',
+            'end_date',
+            'from_to',
+            'due_to',
+            'completed',
+        ]
@@ -0,0 +1,188 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import events
+from .authentication import forget_user
+from .blobstore import release
+from .models import CustomUser, Mission, MissionAttachment, MissionVisibility
+from .sync import record_changes
+from .versions import DIRECTORY_KEY, bump, bump_missions, mission_audience, user_key
+
+_UNKNOWN = object()
+
+# ============ MISSION VISIBILITY ============
+
+@receiver(post_save, sender=Mission)
+def sync_creator_visibility(sender, instance, created, raw=False, **kwargs):
+    """created_by değiştiğinde CREATOR satırını güncelle"""
+    if raw:
+        return
+    if not created and getattr(instance, '_loaded_created_by_id', _UNKNOWN) == instance.created_by_id:
+        return
+    if not created:
+        previous = MissionVisibility.objects.filter(
+            mission_id=instance.id, relation=MissionVisibility.CREATOR
+        ).exclude(user_id=instance.created_by_id)
+        # Eski oluşturan artık göremez; listesi değişti
+        previous_ids = list(previous.values_list('user_id', flat=True))
+        bump_missions(user_ids=previous_ids)
+        record_changes((user_id, instance.id) for user_id in previous_ids + [instance.created_by_id])
+        previous.delete()
+    if instance.created_by_id is not None:
+        MissionVisibility.objects.bulk_create(
+            [MissionVisibility(
+                user_id=instance.created_by_id,
+                mission_id=instance.id,
+                relation=MissionVisibility.CREATOR,
+            )],
+            ignore_conflicts=True,
+        )
+    instance._loaded_created_by_id = instance.created_by_id
+
+
+@receiver(m2m_changed, sender=Mission.due_to.through)
+def sync_assignee_visibility(sender, instance, action, reverse, pk_set, **kwargs):
+    """due_to eklemelerini/çıkarmalarını ASSIGNEE satırlarına yansıt"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    # reverse=True: user.assigned_missions üzerinden değişiklik
+    owner_field, other_field = ('user_id', 'mission_id') if reverse else ('mission_id', 'user_id')
+    rows = MissionVisibility.objects.filter(
+        relation=MissionVisibility.ASSIGNEE, **{owner_field: instance.pk}
+    )
+    if action == 'post_add' and pk_set:
+        MissionVisibility.objects.bulk_create(
+            [
+                MissionVisibility(
+                    relation=MissionVisibility.ASSIGNEE,
+                    **{owner_field: instance.pk, other_field: pk}
+                )
+                for pk in pk_set
+            ],
+            ignore_conflicts=True,
+        )
+    elif action == 'post_remove' and pk_set:
+        rows.filter(**{f'{other_field}__in': pk_set}).delete()
+    elif action == 'post_clear':
+        pk_set = set(rows.values_list(other_field, flat=True))
+        rows.delete()
+    if pk_set:
+        # ?updated_since= için görünürlüğü değişen (kullanıcı, görev) çiftleri
+        record_changes((instance.pk, pk) if reverse else (pk, instance.pk) for pk in pk_set)
+
+
+# ============ ATTACHMENT BLOB REFERANSLARI ============
+
+@receiver(post_delete, sender=MissionAttachment)
+def release_attachment_blob(sender, instance, **kwargs):
+    if instance.blob_id is not None:
+        release(instance.blob_id)
+
+
+# ============ CONDITIONAL GET SÜRÜMLERİ ============
+
+@receiver(post_save, sender=Mission)
+def bump_versions_on_mission_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_missions([instance.id])
+
+
+@receiver(pre_delete, sender=Mission)
+def remember_mission_audience(sender, instance, **kwargs):
+    # Görünürlük satırları cascade ile silinmeden önce
+    instance._audience = mission_audience([instance.id])
+
+
+@receiver(post_delete, sender=Mission)
+def bump_versions_on_mission_delete(sender, instance, **kwargs):
+    audience = getattr(instance, '_audience', ())
+    bump_missions(user_ids=audience)
+    # Tombstone: silinen görevi görenler bir sonraki senkronizasyonda öğrenir
+    record_changes((user_id, instance.id) for user_id in audience)
+
+
+@receiver(m2m_changed, sender=Mission.due_to.through)
+def bump_versions_on_assignment(sender, instance, action, reverse, pk_set, **kwargs):
+    """Atama öncesi ve sonrası görenlerin tamamının sürümünü yenile"""
+    if reverse:
+        mission_ids = set(pk_set) if pk_set else set(
+            instance.assigned_missions.values_list('id', flat=True)
+        )
+    else:
+        mission_ids = {instance.pk}
+    if action.startswith('pre_'):
+        instance._audience = mission_audience(mission_ids)
+        instance._affected_missions = mission_ids
+    else:
+        mission_ids |= getattr(instance, '_affected_missions', set())
+        bump_missions(mission_ids, user_ids=getattr(instance, '_audience', ()))
+
+
+@receiver(post_save, sender=MissionAttachment)
+@receiver(post_delete, sender=MissionAttachment)
+def bump_versions_on_attachment(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_missions([instance.mission_id])
+        # Ek değişikliği ?updated_since= senkronizasyonunda görünsün
+        Mission.objects.filter(pk=instance.mission_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def forget_cached_user(sender, instance, raw=False, **kwargs):
+    """JWT doğrulamasındaki kullanıcı cache'i (şifre/deaktivasyon dahil)"""
+    if not raw:
+        forget_user(instance.pk)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def bump_versions_on_user(sender, instance, raw=False, **kwargs):
+    """Kullanıcı bilgisi profil, dizin ve görevlerdeki iç içe gösterimlerde yer alır"""
+    if not raw:
+        bump([DIRECTORY_KEY, user_key(instance.pk)])
+
+
+# ============ CANLI DEĞİŞİKLİK AKIŞI ============
+
+@receiver(post_save, sender=Mission)
+def publish_mission_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        kind = events.CREATED
+    elif getattr(instance, '_loaded_completed', instance.completed) != instance.completed:
+        kind = events.COMPLETED
+    else:
+        kind = events.UPDATED
+    instance._loaded_completed = instance.completed
+    events.publish_missions(kind, [instance.id])
+
+
+@receiver(post_delete, sender=Mission)
+def publish_mission_delete(sender, instance, **kwargs):
+    events.publish_missions(
+        events.DELETED, [instance.id], {instance.id: getattr(instance, '_audience', set())}
+    )
+
+
+@receiver(m2m_changed, sender=Mission.due_to.through)
+def publish_assignment_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # Atamaları değişen kullanıcı dışında kimsenin görünürlüğü değişmez
+        mission_ids = set(pk_set or ()) | getattr(instance, '_affected_missions', set())
+        previous = {mission_id: {instance.pk} for mission_id in mission_ids}
+    else:
+        mission_ids = {instance.pk}
+        previous = {instance.pk: getattr(instance, '_audience', set())}
+    events.publish_missions(events.UPDATED, mission_ids, previous)
+
+
+@receiver(post_save, sender=MissionAttachment)
+@receiver(post_delete, sender=MissionAttachment)
+def publish_attachment_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        events.publish_missions(events.UPDATED, [instance.mission_id])
@@ -0,0 +1,103 @@
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import NullIf
+from django.utils import timezone
+
+from .models import Mission
+from .serializers import build_full_name
+
+
+def _counts(prefix='', distinct=False, today=None):
+    """total/completed/overdue sayaçları için Count ifadeleri"""
+    # Alias'lar model alanlarıyla (completed) çakışmamalı
+    today = today or timezone.localdate()
+    field = f'{prefix}id'
+    return {
+        'total': Count(field, distinct=distinct),
+        'completed_count': Count(field, distinct=distinct, filter=Q(**{f'{prefix}completed': True})),
+        'overdue_count': Count(
+            field,
+            distinct=distinct,
+            filter=Q(**{f'{prefix}completed': False, f'{prefix}end_date__lt': today}),
+        ),
+        # Termin gününden sonra tamamlananlar (completed_at ile)
+        'late_count': Count(
+            field,
+            distinct=distinct,
+            filter=Q(**{
+                f'{prefix}completed': True,
+                f'{prefix}completed_at__date__gt': F(f'{prefix}end_date'),
+            }),
+        ),
+    }
+
+
+def _with_rates(row):
+    """Sayaçları yeniden adlandır; pending ve completion_rate alanlarını ekle"""
+    row['completed'] = row.pop('completed_count')
+    row['overdue'] = row.pop('overdue_count')
+    row['completed_late'] = row.pop('late_count')
+    total = row['total']
+    row['pending'] = total - row['completed']
+    row['completion_rate'] = round(row['completed'] * 100 / total, 1) if total else 0
+    return row
+
+
+def mission_stats(missions):
+    """
+    Verilen görev kümesi için özet, kullanıcı, rol ve departman bazlı
+    istatistikleri veritabanında hesaplar.
+    """
+    today = timezone.localdate()
+    missions = Mission.objects.filter(pk__in=missions.values('pk'))
+    assignments = Mission.due_to.through.objects.filter(mission__in=missions)
+    per_assignment = _counts(prefix='mission__', distinct=True, today=today)
+
+    summary = _with_rates(missions.aggregate(**_counts(today=today)))
+
+    by_user = []
+    for row in (
+        assignments
+        .values(
+            'customuser_id', 'customuser__username', 'customuser__first_name',
+            'customuser__last_name', 'customuser__role', 'customuser__department',
+        )
+        .annotate(**per_assignment)
+        .order_by('customuser__username')
+    ):
+        by_user.append(_with_rates({
+            'id': row['customuser_id'],
+            'username': row['customuser__username'],
+            'full_name': build_full_name(
+                row['customuser__first_name'], row['customuser__last_name'], row['customuser__username']
+            ),
+            'role': row['customuser__role'],
+            'department': row['customuser__department'],
+            'total': row['total'],
+            'completed_count': row['completed_count'],
+            'overdue_count': row['overdue_count'],
+            'late_count': row['late_count'],
+        }))
+
+    by_role = {
+        row.pop('customuser__role'): _with_rates(row)
+        for row in assignments.values('customuser__role').annotate(**per_assignment).order_by()
+    }
+
+    # Boş string ve NULL departmanlar tek grupta toplanır
+    by_department = [
+        _with_rates(row)
+        for row in (
+            assignments
+            .annotate(department=NullIf('customuser__department', Value('')))
+            .values('department')
+            .annotate(**per_assignment)
+            .order_by('department')
+        )
+    ]
+
+    return {
+        'summary': summary,
+        'by_user': by_user,
+        'by_role': by_role,
+        'by_department': by_department,
+    }
@@ -0,0 +1,72 @@
+"""
+Artımlı görev senkronizasyonu (?updated_since=).
+
+Değişen görevler iki kaynaktan bulunur: updated_at indeksi (oluşturma/
+düzenleme) ve MissionChange günlüğü (atama, oluşturan değişikliği, silme).
+Adayların güncel görünürlüğüne bakılır: görünen ve filtreye uyanlar döner,
+kalanlar tombstone ('deleted') olur. Maliyet geçmişin değil değişikliğin boyutuna bağlıdır.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import MissionChange
+
+
+class SyncTokenExpired(Exception):
+    """Token günlük saklama süresinden eski; tam liste çekilmeli"""
+
+
+def make_sync_token(moment=None):
+    """Token: mikro saniye cinsinden UTC zaman damgası"""
+    moment = moment or timezone.now()
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def parse_sync_token(value):
+    """Token veya ISO 8601 zaman; geçersizse ValueError"""
+    value = (value or '').strip()
+    if value.isdigit():
+        return datetime.fromtimestamp(int(value) / 1_000_000, tz=dt_timezone.utc)
+    moment = parse_datetime(value.replace(' ', '+'))
+    if moment is None:
+        raise ValueError(value)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def record_changes(pairs):
+    """(user_id, mission_id) çiftleri için görünürlük değişikliği kaydet"""
+    now = timezone.now()
+    MissionChange.objects.bulk_create([
+        MissionChange(user_id=user_id, mission_id=mission_id, changed_at=now)
+        for user_id, mission_id in set(pairs)
+        if user_id is not None
+    ])
+
+
+def sync_window_start(since):
+    """
+    Sorgu alt sınırı. Token alındığında henüz commit edilmemiş yazmalar
+    kaçmasın diye küçük bir örtüşme bırakılır (istemci tekrarları yok sayar).
+    """
+    if since < timezone.now() - timedelta(days=settings.MISSION_SYNC_RETENTION_DAYS):
+        raise SyncTokenExpired
+    return since - timedelta(seconds=settings.MISSION_SYNC_OVERLAP_SECONDS)
+
+
+def changed_missions(visible, user, since):
+    """
+    (aday görevler, günlükte geçen görev id'leri). visible: kullanıcının
+    görebildiği görevler; adaylar günlükte geçen veya updated_at'i yeni olanlardır.
+    """
+    start = sync_window_start(since)
+    logged = set(
+        MissionChange.objects.filter(user_id=user.id, changed_at__gte=start)
+        .values_list('mission_id', flat=True)
+    )
+    return visible.filter(Q(updated_at__gte=start) | Q(id__in=logged)), logged
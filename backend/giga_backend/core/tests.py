@@ -1,3 +1,1723 @@
-from django.test import TestCase
+import asyncio
+import hashlib
+import json
+import os
+import runpy
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends import locmem
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import (
+    AttachmentBlob, CustomUser, Mission, MissionAttachment, MissionChange, MissionVisibility,
+    NotificationLog, UploadSession,
+)
+from .policy import AssignmentPolicy
+from . import events, metrics
+from .admin import MissionAdmin
+from .benchmark import Benchmark, compare_to_baseline, generate_org
+from .notifications import dispatch_notifications
+from .photos import generate_variants
+from .search import search_filter, search_missions
+from .serializers import CustomUserSerializer
+from .versions import missions_key
+
+
+def create_missions(creator, assignees, count, start=None):
+    """Test için toplu görev oluştur (her göreve atanan + ek dosya)"""
+    start = start or date.today()
+    missions = Mission.objects.bulk_create([
+        Mission(
+            description=f"Görev {i}",
+            assigned_date=start,
+            end_date=start + timedelta(days=7),
+            created_by=creator,
+        )
+        for i in range(count)
+    ])
+    Through = Mission.due_to.through
+    Through.objects.bulk_create([
+        Through(mission_id=mission.id, customuser_id=assignee.id)
+        for mission in missions
+        for assignee in assignees
+    ])
+    MissionAttachment.objects.bulk_create([
+        MissionAttachment(mission=mission, file=f"mission_files/test_{mission.id}.pdf")
+        for mission in missions
+    ])
+    # bulk_create sinyal tetiklemez; görünürlük satırları elle eklenir
+    MissionVisibility.objects.bulk_create([
+        MissionVisibility(user=creator, mission=mission, relation=MissionVisibility.CREATOR)
+        for mission in missions
+    ] + [
+        MissionVisibility(user=assignee, mission=mission, relation=MissionVisibility.ASSIGNEE)
+        for mission in missions
+        for assignee in assignees
+    ])
+    return missions
+
+
+class MissionQueryBudgetTests(TestCase):
+    """Görev listesi/detayı sabit sayıda sorgu ile dönmeli (N+1 yok)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.employees = [
+            CustomUser.objects.create_user(username=f'employee{i}', password='x', role='EMPLOYEE')
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.employees[0])
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_list_query_count_is_constant(self):
+        budgets = set()
+        created = 0
+        for size in (10, 100, 1000):
+            create_missions(self.manager, self.employees, size - created)
+            created = size
+            queries, response = self.count_queries('/api/missions/')
+            self.assertEqual(response.data['count'], size)
+            budgets.add(queries)
+        # count + görevler + due_to + attachments prefetch
+        self.assertEqual(budgets, {4})
+
+    def test_list_permission_flags_from_prefetched_data(self):
+        create_missions(self.manager, self.employees[:1], 5)
+        create_missions(self.employees[0], self.employees[1:], 5)
+        _, response = self.count_queries('/api/missions/')
+        flags = {(m['can_edit'], m['can_complete']) for m in response.data['results']}
+        self.assertEqual(flags, {(False, True), (True, False)})
+
+    def test_retrieve_query_count_is_constant(self):
+        for size in (10, 100, 1000):
+            mission = create_missions(self.manager, self.employees, 1)[0]
+            Through = Mission.due_to.through
+            extra = [
+                CustomUser(username=f'extra{size}_{i}', role='EMPLOYEE')
+                for i in range(size)
+            ]
+            CustomUser.objects.bulk_create(extra)
+            Through.objects.bulk_create([
+                Through(mission_id=mission.id, customuser_id=user.id)
+                for user in CustomUser.objects.filter(username__startswith=f'extra{size}_')
+            ])
+            queries, response = self.count_queries(f'/api/missions/{mission.id}/')
+            self.assertEqual(len(response.data['assigned_users']), size + len(self.employees))
+            self.assertEqual(queries, 3)
+
+
+class MissionStatsTests(TestCase):
+    """/api/missions/stats/ görünürlük kurallarına göre toplu sayılar döner"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(
+            username='manager', password='x', role='MANAGER', department='Satış'
+        )
+        cls.alice = CustomUser.objects.create_user(
+            username='alice', password='x', role='EMPLOYEE', department='Satış'
+        )
+        cls.bob = CustomUser.objects.create_user(username='bob', password='x', role='EMPLOYEE')
+        past = date.today() - timedelta(days=30)
+        overdue = create_missions(cls.manager, [cls.alice], 2, start=past)
+        create_missions(cls.manager, [cls.alice, cls.bob], 3)
+        # Termini geçtikten sonra tamamlandı
+        Mission.objects.filter(id=overdue[0].id).update(completed=True, completed_at=timezone.now())
+        # manager'ın görmediği görev
+        create_missions(cls.bob, [cls.bob], 4)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def test_summary_and_groups(self):
+        response = self.client.get('/api/missions/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['summary'], {
+            'total': 5, 'completed': 1, 'overdue': 1, 'completed_late': 1,
+            'pending': 4, 'completion_rate': 20.0,
+        })
+        by_user = {row['username']: row for row in response.data['by_user']}
+        self.assertEqual(by_user['alice']['total'], 5)
+        self.assertEqual(by_user['bob']['total'], 3)
+        self.assertEqual(response.data['by_role']['EMPLOYEE']['total'], 5)
+        departments = {row['department']: row['total'] for row in response.data['by_department']}
+        self.assertEqual(departments, {'Satış': 5, None: 3})
+
+    def test_result_is_cached_per_user(self):
+        self.client.get('/api/missions/stats/')
+        with self.assertNumQueries(0):
+            self.client.get('/api/missions/stats/')
+
+
+class MissionCursorPaginationTests(TestCase):
+    """?pagination=cursor ile COUNT sorgusu olmadan tüm sayfalar gezilebilmeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.employee = CustomUser.objects.create_user(username='employee', password='x', role='EMPLOYEE')
+        create_missions(cls.manager, [cls.employee], 250)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.employee)
+
+    def test_walks_all_pages_without_count(self):
+        seen = []
+        url = '/api/missions/?pagination=cursor'
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            self.assertFalse(any('COUNT(' in q['sql'] for q in ctx.captured_queries))
+            seen.extend(m['id'] for m in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(len(seen), 250)
+        self.assertEqual(seen, list(
+            Mission.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        ))
+
+    def test_default_pagination_unchanged(self):
+        response = self.client.get('/api/missions/')
+        self.assertEqual(response.data['count'], 250)
+
+
+
+class MissionVisibilityTests(TestCase):
+    """MissionVisibility tablosu created_by ve due_to değişikliklerini izlemeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+        cls.bob = CustomUser.objects.create_user(username='bob', password='x', role='EMPLOYEE')
+
+    def visible(self, user):
+        return set(Mission.objects.visible_to(user).values_list('id', flat=True))
+
+    def test_tracks_creator_and_assignees(self):
+        mission = Mission.objects.create(
+            assigned_date=date.today(), end_date=date.today(), created_by=self.manager
+        )
+        mission.due_to.set([self.alice])
+        self.assertEqual(self.visible(self.manager), {mission.id})
+        self.assertEqual(self.visible(self.alice), {mission.id})
+        self.assertTrue(mission.can_view(self.alice))
+        self.assertFalse(mission.can_view(self.bob))
+
+        mission.due_to.set([self.bob])
+        self.assertEqual(self.visible(self.alice), set())
+        self.assertTrue(mission.can_view(self.bob))
+
+        self.alice.assigned_missions.add(mission)
+        self.assertTrue(mission.can_view(self.alice))
+        mission.due_to.clear()
+        self.assertEqual(self.visible(self.alice) | self.visible(self.bob), set())
+
+        mission = Mission.objects.get(id=mission.id)
+        mission.created_by = self.alice
+        mission.save()
+        self.assertEqual(self.visible(self.manager), set())
+        self.assertEqual(self.visible(self.alice), {mission.id})
+
+    def test_creator_who_is_also_assignee_is_listed_once(self):
+        client = APIClient()
+        client.force_authenticate(self.alice)
+        response = client.post('/api/missions/', {
+            'description': 'Kendime', 'assigned_date': str(date.today()),
+            'end_date': str(date.today()), 'due_to': [self.alice.id],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        response = client.get('/api/missions/')
+        self.assertEqual(response.data['count'], 1)
+
+    def test_rebuild_command(self):
+        missions = create_missions(self.manager, [self.alice], 3)
+        MissionVisibility.objects.all().delete()
+        call_command('rebuild_mission_visibility', stdout=StringIO())
+        self.assertEqual(self.visible(self.alice), {m.id for m in missions})
+        self.assertEqual(self.visible(self.manager), {m.id for m in missions})
+        self.assertEqual(self.visible(self.bob), set())
+
+
+class MissionFilterTests(TestCase):
+    """Liste filtreleri SQL tarafında uygulanmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+        cls.bob = CustomUser.objects.create_user(username='bob', password='x', role='EMPLOYEE')
+        today = date.today()
+        cls.done = create_missions(cls.manager, [cls.alice], 2, start=today - timedelta(days=20))
+        cls.late = create_missions(cls.manager, [cls.alice, cls.bob], 3, start=today - timedelta(days=20))
+        cls.open = create_missions(cls.alice, [cls.bob], 4, start=today)
+        Mission.objects.filter(id__in=[m.id for m in cls.done]).update(completed=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def ids(self, query):
+        response = self.client.get(f'/api/missions/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return {m['id'] for m in response.data['results']}
+
+    def test_filters(self):
+        done = {m.id for m in self.done}
+        late = {m.id for m in self.late}
+        opened = {m.id for m in self.open}
+        self.assertEqual(self.ids('completed=true'), done)
+        self.assertEqual(self.ids('completed=false'), late | opened)
+        self.assertEqual(self.ids('overdue=true'), late)
+        self.assertEqual(self.ids('overdue=false'), done | opened)
+        self.assertEqual(self.ids('created_by=me'), opened)
+        self.assertEqual(self.ids(f'created_by={self.manager.id}'), done | late)
+        self.assertEqual(self.ids(f'assignee={self.bob.id}'), late | opened)
+        self.assertEqual(self.ids(f'assigned_date_after={date.today()}'), opened)
+        self.assertEqual(
+            self.ids(f'end_date_before={date.today()}&assignee=me&completed=false'), late
+        )
+
+    def test_invalid_values(self):
+        for query in ('completed=maybe', 'end_date_after=yesterday', 'assignee=alice'):
+            response = self.client.get(f'/api/missions/?{query}')
+            self.assertEqual(response.status_code, 400)
+
+
+class MissionCalendarTests(TestCase):
+    """/api/missions/calendar/ pencereyle kesişen görevleri gün bazında döner"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+        # 28 Ocak - 4 Şubat arası, Şubat penceresinin başıyla kesişir
+        cls.spanning = create_missions(cls.manager, [cls.alice], 1, start=date(2025, 1, 28))[0]
+        cls.inside = create_missions(cls.manager, [cls.alice], 1, start=date(2025, 2, 20))[0]
+        cls.outside = create_missions(cls.manager, [cls.alice], 1, start=date(2025, 3, 10))[0]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def test_overlapping_missions_per_day(self):
+        response = self.client.get('/api/missions/calendar/?start=2025-02-01&end=2025-02-28')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['missions']), {self.spanning.id, self.inside.id})
+        days = response.data['days']
+        self.assertEqual(days['2025-02-01'], [self.spanning.id])
+        self.assertEqual(days['2025-02-04'], [self.spanning.id])
+        self.assertNotIn('2025-02-05', days)
+        self.assertEqual(days['2025-02-27'], [self.inside.id])
+        self.assertEqual(
+            set(response.data['missions'][self.inside.id]),
+            {'id', 'description', 'assigned_date', 'end_date', 'completed'},
+        )
+
+    def test_invalid_window(self):
+        for query in ('', 'start=2025-02-01', 'start=2025-02-10&end=2025-02-01', 'start=2025-01-01&end=2026-01-01'):
+            response = self.client.get(f'/api/missions/calendar/?{query}')
+            self.assertEqual(response.status_code, 400)
+
+
+class MissionRepresentationTests(TestCase):
+    """?fields= ve ?view=compact gösterimleri"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.employees = [
+            CustomUser.objects.create_user(username=f'employee{i}', password='x', role='EMPLOYEE')
+            for i in range(2)
+        ]
+        create_missions(cls.manager, cls.employees, 5)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.employees[0])
+
+    def test_sparse_fields(self):
+        response = self.client.get('/api/missions/?fields=id,description,assigned_users')
+        self.assertEqual(response.status_code, 200)
+        for mission in response.data['results']:
+            self.assertEqual(set(mission), {'id', 'description', 'assigned_users'})
+
+    def test_compact_view_side_loads_users(self):
+        response = self.client.get('/api/missions/?view=compact')
+        self.assertEqual(response.status_code, 200)
+        expected_ids = {self.manager.id} | {u.id for u in self.employees}
+        self.assertEqual(set(response.data['users']), expected_ids)
+        self.assertNotIn('notification_email', response.data['users'][self.manager.id])
+        mission = response.data['results'][0]
+        self.assertEqual(set(mission['assigned_users']), {u.id for u in self.employees})
+        self.assertEqual(mission['created_by'], self.manager.id)
+        self.assertNotIn('created_by_info', mission)
+
+    def test_compact_view_query_count_is_constant(self):
+        create_missions(self.manager, self.employees, 100)
+        with self.assertNumQueries(4):
+            self.client.get('/api/missions/?view=compact')
+
+    def test_compact_retrieve(self):
+        mission = Mission.objects.visible_to(self.employees[0]).first()
+        response = self.client.get(f'/api/missions/{mission.id}/?view=compact')
+        self.assertEqual(set(response.data['users']), {self.manager.id} | {u.id for u in self.employees})
+
+
+class ConditionalGetTests(TestCase):
+    """ETag eşleşirse serileştirme yapılmadan 304 dönmeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+        cls.bob = CustomUser.objects.create_user(username='bob', password='x', role='EMPLOYEE')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+        self.mission = Mission.objects.create(
+            assigned_date=date.today(), end_date=date.today(), created_by=self.manager
+        )
+        self.mission.due_to.set([self.alice])
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def assert_revalidation(self, url, change, status_after=200):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+        with self.assertNumQueries(0):
+            response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, 304)
+        change()
+        response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, status_after)
+        self.assertNotEqual(response.get('ETag'), etag)
+
+    def test_mission_list_changes_on_update(self):
+        def change():
+            self.mission.description = 'Yeni'
+            self.mission.save()
+        self.assert_revalidation('/api/missions/', change)
+
+    def test_mission_detail_changes_when_unassigned(self):
+        self.assert_revalidation(
+            f'/api/missions/{self.mission.id}/', lambda: self.mission.due_to.remove(self.alice), status_after=404
+        )
+
+    def test_mission_list_changes_on_delete(self):
+        self.assert_revalidation('/api/missions/', self.mission.delete)
+
+    def test_mission_list_changes_on_reverse_assignment(self):
+        other = Mission.objects.create(
+            assigned_date=date.today(), end_date=date.today(), created_by=self.manager
+        )
+        self.assert_revalidation('/api/missions/', lambda: self.alice.assigned_missions.add(other))
+
+    def test_other_users_changes_do_not_invalidate(self):
+        response = self.client.get('/api/missions/')
+        etag = response['ETag']
+        Mission.objects.create(assigned_date=date.today(), end_date=date.today(), created_by=self.bob)
+        self.assertEqual(self.revalidate('/api/missions/', etag).status_code, 304)
+
+    def test_query_string_is_part_of_etag(self):
+        etag = self.client.get('/api/missions/')['ETag']
+        self.assertEqual(self.revalidate('/api/missions/?completed=true', etag).status_code, 200)
+
+    def test_profile(self):
+        def change():
+            self.alice.phone = '555'
+            self.alice.save()
+        self.assert_revalidation('/api/user/profile/', change)
+
+    def test_user_directories(self):
+        def change():
+            self.bob.department = 'Satış'
+            self.bob.save()
+        self.assert_revalidation('/api/users/assignable/', change)
+        self.assert_revalidation('/api/users/organization/', lambda: self.bob.delete())
+
+
+    @override_settings(VERSION_CACHE_TIMEOUT=1)
+    def test_version_stamps_expire(self):
+        cache.clear()
+        self.client.force_authenticate(self.alice)
+        etag = self.client.get('/api/missions/')['ETag']
+        # Damga süresiz değil; süresi dolunca daha büyük değerle yeniden oluşur
+        time.sleep(1.1)
+        self.assertIsNone(cache.get(missions_key(self.alice.id)))
+        response = self.client.get('/api/missions/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_locmem_rejected_with_multiple_workers(self):
+        path = os.path.join(os.path.dirname(__file__), '..', 'giga_backend', 'settings.py')
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '4', 'DJANGO_CACHE_BACKEND': 'locmem'}):
+            with self.assertRaises(ImproperlyConfigured):
+                runpy.run_path(path)
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '4', 'DJANGO_CACHE_BACKEND': 'file'}):
+            self.assertEqual(runpy.run_path(path)['CACHES']['default']['BACKEND'],
+                             'django.core.cache.backends.filebased.FileBasedCache')
+
+
+class DirectoryCacheTests(TestCase):
+    """Atanabilir kullanıcılar ve organizasyon şeması role göre cache'lenir"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ceo = CustomUser.objects.create_user(username='ceo', password='x', role='CEO')
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get(self, user, url):
+        self.client.force_authenticate(user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_assignable_users_cached_per_role(self):
+        ceo_view = self.get(self.ceo, '/api/users/assignable/')
+        self.assertEqual(len(ceo_view), 3)
+        self.assertEqual([u['username'] for u in self.get(self.manager, '/api/users/assignable/')], ['alice'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get(self.alice, '/api/users/assignable/')[0]['username'], 'alice')
+            self.assertEqual(len(self.get(self.ceo, '/api/users/assignable/')), 3)
+
+    def test_invalidated_on_user_save_and_delete(self):
+        self.get(self.manager, '/api/users/assignable/')
+        bob = CustomUser.objects.create_user(username='bob', password='x', role='EMPLOYEE')
+        self.assertEqual(len(self.get(self.manager, '/api/users/assignable/')), 2)
+        bob.delete()
+        self.assertEqual(len(self.get(self.manager, '/api/users/assignable/')), 1)
+
+    def test_organization_chart_cached(self):
+        chart = self.get(self.alice, '/api/users/organization/')
+        self.assertEqual({role: len(users) for role, users in chart.items()}, {'CEO': 1, 'MANAGER': 1, 'EMPLOYEE': 1})
+        with self.assertNumQueries(0):
+            self.get(self.ceo, '/api/users/organization_chart/')
+        self.alice.role = 'MANAGER'
+        self.alice.save()
+        chart = self.get(self.alice, '/api/users/organization/')
+        self.assertEqual(len(chart['MANAGER']), 2)
+
+    def test_file_based_backend(self):
+        with tempfile.TemporaryDirectory() as location, override_settings(CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': location,
+            }
+        }):
+            self.get(self.manager, '/api/users/assignable/')
+            with self.assertNumQueries(0):
+                self.get(self.manager, '/api/users/assignable/')
+            CustomUser.objects.create_user(username='bob', password='x', role='EMPLOYEE')
+            self.assertEqual(len(self.get(self.manager, '/api/users/assignable/')), 2)
+
+    def test_file_cache_defaults_to_project_directory(self):
+        # Cache şifre hash'li kullanıcıları tutar; paylaşılan geçici dizinde değil projede durmalı
+        path = os.path.join(settings.BASE_DIR, 'giga_backend', 'settings.py')
+        with mock.patch.dict(os.environ, {'DJANGO_CACHE_BACKEND': 'file'}):
+            os.environ.pop('DJANGO_CACHE_LOCATION', None)
+            project = runpy.run_path(path)
+        self.assertEqual(project['CACHES']['default']['LOCATION'], str(settings.BASE_DIR / '.cache'))
+
+
+class OrganizationChartTests(TestCase):
+    """Organizasyon şeması values() ile tek geçişte üretilir"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ceo = CustomUser.objects.create_user(
+            username='ceo', password='x', role='CEO', first_name='Ayşe', last_name='Yılmaz'
+        )
+        cls.ceo.profile_photo = 'profile_photos/ceo.jpg'
+        cls.ceo.photo_variants = {'thumb': 'profile_photos/variants/1/ceo_thumb.jpg'}
+        cls.ceo.save()
+        CustomUser.objects.bulk_create([
+            CustomUser(username=f'employee{i:03}', role='EMPLOYEE', department='Satış')
+            for i in range(300)
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.ceo)
+
+    def test_matches_user_serializer_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/users/organization/')
+        self.assertEqual([len(response.data[r]) for r in ('CEO', 'MANAGER', 'EMPLOYEE')], [1, 0, 300])
+        request = APIRequestFactory().get('/')
+        expected = CustomUserSerializer(self.ceo, context={'request': request}).data
+        self.assertEqual(response.data['CEO'][0], dict(expected))
+
+    def test_streaming_matches_regular_response(self):
+        regular = self.client.get('/api/users/organization/').json()
+        response = self.client.get('/api/users/organization/?stream=1')
+        self.assertTrue(response.streaming)
+        streamed = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(streamed, regular)
+        self.assertEqual(list(streamed), ['CEO', 'MANAGER', 'EMPLOYEE'])
+
+    def test_unknown_roles_grouped_the_same_when_streaming(self):
+        # ROLES dışındaki roller iki yolda da ayrı grup olarak sonda yer alır
+        CustomUser.objects.bulk_create([
+            CustomUser(username='stajyer2', role='INTERN'),
+            CustomUser(username='stajyer1', role='INTERN'),
+            CustomUser(username='danisman', role='ADVISOR'),
+        ])
+        with self.assertNumQueries(1):
+            regular = self.client.get('/api/users/organization/').json()
+        cache.clear()
+        response = self.client.get('/api/users/organization/?stream=1')
+        with self.assertNumQueries(1):
+            streamed = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(streamed, regular)
+        self.assertEqual(list(streamed), ['CEO', 'MANAGER', 'EMPLOYEE', 'ADVISOR', 'INTERN'])
+        self.assertEqual([row['username'] for row in streamed['INTERN']], ['stajyer1', 'stajyer2'])
+
+    async def test_streams_under_asgi(self):
+        # Senkron üreteç ASGI'de tamamen belleğe okunurdu; async iterator parça parça gönderilir
+        token = str(AccessToken.for_user(self.ceo))
+        headers = {'Authorization': f'Bearer {token}'}
+        regular = (await self.async_client.get('/api/users/organization/', headers=headers)).json()
+        response = await self.async_client.get('/api/users/organization/?stream=1', headers=headers)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(json.loads(b''.join(chunks)), regular)
+
+
+class MissionBulkTests(TestCase):
+    """/api/missions/bulk/ toplu oluşturma ve güncelleme"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ceo = CustomUser.objects.create_user(username='ceo', password='x', role='CEO')
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.employees = [
+            CustomUser.objects.create_user(username=f'employee{i}', password='x', role='EMPLOYEE')
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def item(self, **extra):
+        return {
+            'description': 'Toplu', 'assigned_date': str(date.today()),
+            'end_date': str(date.today() + timedelta(days=3)),
+            'due_to': [u.id for u in self.employees], **extra,
+        }
+
+    def test_bulk_create_uses_constant_statements(self):
+        for size in (5, 500):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post('/api/missions/bulk/', [self.item() for _ in range(size)], format='json')
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(len(response.data['results']), size)
+            # Sadece SQLite'ın parametre sınırı kadar INSERT batch'i (binlerce değil)
+            self.assertLessEqual(len(ctx.captured_queries), 7 if size == 5 else 25)
+        mission = Mission.objects.get(id=response.data['results'][0]['id'])
+        self.assertEqual(mission.created_by, self.manager)
+        self.assertEqual(set(mission.due_to.all()), set(self.employees))
+        for user in self.employees + [self.manager]:
+            self.assertTrue(mission.can_view(user))
+
+    def test_bulk_create_reports_per_item_errors(self):
+        response = self.client.post('/api/missions/bulk/', [
+            self.item(),
+            self.item(due_to=[self.ceo.id]),
+            self.item(end_date='not-a-date'),
+            self.item(due_to=[999999]),
+        ], format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([r['status'] for r in response.data['results']], [201, 403, 400, 400])
+        self.assertEqual(response.data['results'][1]['errors']['invalid_users'], ['ceo'])
+        self.assertEqual(Mission.objects.count(), 1)
+
+    def test_bulk_create_rejects_non_list(self):
+        response = self.client.post('/api/missions/bulk/', self.item(), format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_update(self):
+        mine = create_missions(self.manager, self.employees[:1], 2)
+        others = create_missions(self.ceo, [self.manager], 1)
+        response = self.client.patch('/api/missions/bulk/', [
+            {'id': mine[0].id, 'description': 'Güncel', 'due_to': [self.employees[2].id]},
+            {'id': mine[1].id, 'completed': True},
+            {'id': others[0].id, 'description': 'x'},
+            {'id': 999999, 'description': 'x'},
+        ], format='json')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([r['status'] for r in response.data['results']], [200, 200, 403, 404])
+        mine[0].refresh_from_db()
+        self.assertEqual(mine[0].description, 'Güncel')
+        self.assertEqual(list(mine[0].due_to.all()), [self.employees[2]])
+        self.assertFalse(mine[0].can_view(self.employees[0]))
+        self.assertTrue(mine[0].can_view(self.employees[2]))
+        self.assertTrue(Mission.objects.get(id=mine[1].id).completed)
+
+
+class AssignmentPolicyTests(TestCase):
+    """Rol bazlı atama kontrolü tek sorguda ve istek boyunca memoize"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ceo = CustomUser.objects.create_user(username='ceo', password='x', role='CEO')
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+        cls.bob = CustomUser.objects.create_user(username='bob', password='x', role='EMPLOYEE')
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def payload(self, *users):
+        return {
+            'description': 'Görev', 'assigned_date': str(date.today()),
+            'end_date': str(date.today()), 'due_to': [u.id for u in users],
+        }
+
+    def test_role_rules(self):
+        policy = AssignmentPolicy(self.manager)
+        with self.assertNumQueries(1):
+            status_code, errors = policy.check_assignment([self.alice.id, self.ceo.id, str(self.manager.id)])
+            self.assertIsNone(policy.check_assignment([self.alice.id]))
+        self.assertEqual(status_code, 403)
+        self.assertEqual(errors['invalid_users'], ['ceo', 'manager'])
+        self.assertIsNone(AssignmentPolicy(self.ceo).check_assignment([self.manager.id]))
+        self.assertEqual(AssignmentPolicy(self.alice).check_assignment([self.manager.id])[0], 403)
+
+    def test_create_and_partial_update_use_policy(self):
+        self.client.force_authenticate(self.manager)
+        response = self.client.post('/api/missions/', self.payload(self.ceo), format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data['invalid_users'], ['ceo'])
+
+        response = self.client.post('/api/missions/', self.payload(self.alice), format='json')
+        self.assertEqual(response.status_code, 201)
+        mission_id = response.data['id']
+        response = self.client.patch(f'/api/missions/{mission_id}/', {'due_to': [self.ceo.id]}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('ceo', response.data['detail'])
+
+        response = self.client.patch(f'/api/missions/{mission_id}/', {'due_to': [self.bob.id]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([u['id'] for u in response.data['assigned_users']], [self.bob.id])
+
+    def test_only_creator_can_edit(self):
+        mission = create_missions(self.manager, [self.alice], 1)[0]
+        self.client.force_authenticate(self.alice)
+        response = self.client.patch(f'/api/missions/{mission.id}/', {'description': 'x'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get(f'/api/missions/{mission.id}/')
+        self.assertEqual((response.data['can_edit'], response.data['can_complete']), (False, True))
+
+
+class UploadSessionTests(TestCase):
+    """Parça parça, devam ettirilebilir ve checksum doğrulamalı yükleme"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media_root = media.name
+        settings_override = override_settings(
+            MEDIA_ROOT=media.name,
+            UPLOAD_SESSION_ROOT=os.path.join(media.name, 'upload_sessions'),
+            UPLOAD_CHUNK_SIZE=4,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def start(self, content, **extra):
+        response = self.client.post('/api/uploads/', {
+            'filename': '../rapor.pdf', 'size': len(content), **extra,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data
+
+    def put_chunk(self, session, index, data):
+        return self.client.put(
+            f"/api/uploads/{session['id']}/chunks/{index}/", data,
+            content_type='application/octet-stream',
+        )
+
+    def test_resumable_upload_and_attach(self):
+        content = b'0123456789'
+        session = self.start(content)
+        self.assertEqual((session['filename'], session['total_chunks']), ('rapor.pdf', 3))
+        # Sırasız parçalar; biri eksik kalınca tamamlanamaz
+        self.assertEqual(self.put_chunk(session, 2, content[8:]).status_code, 200)
+        self.assertEqual(self.put_chunk(session, 0, content[:4]).status_code, 200)
+        response = self.client.post(f"/api/uploads/{session['id']}/complete/", {
+            'checksum': hashlib.sha256(content).hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['missing_chunks'], [1])
+        # Kaldığı yerden devam
+        self.assertEqual(self.client.get(f"/api/uploads/{session['id']}/").data['missing_chunks'], [1])
+        self.assertEqual(self.put_chunk(session, 1, content[4:8]).status_code, 200)
+        response = self.client.post(f"/api/uploads/{session['id']}/complete/", {
+            'checksum': hashlib.sha256(content).hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'COMPLETE')
+
+        response = self.client.post('/api/missions/', {
+            'description': 'Ekli', 'assigned_date': str(date.today()), 'end_date': str(date.today()),
+            'due_to': [self.alice.id], 'upload_ids': [session['id']],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        attachment = MissionAttachment.objects.get(mission_id=response.data['id'])
+        self.assertEqual(attachment.name, 'rapor.pdf')
+        self.assertEqual(attachment.blob.sha256, hashlib.sha256(content).hexdigest())
+        with attachment.file.open('rb') as f:
+            self.assertEqual(f.read(), content)
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_rejects_wrong_chunk_length_and_checksum(self):
+        content = b'abcdefgh'
+        session = self.start(content)
+        self.assertEqual(self.put_chunk(session, 0, b'abc').status_code, 400)
+        self.assertEqual(self.put_chunk(session, 5, b'abcd').status_code, 400)
+        self.put_chunk(session, 0, content[:4])
+        self.put_chunk(session, 1, content[4:])
+        response = self.client.post(f"/api/uploads/{session['id']}/complete/", {
+            'checksum': hashlib.sha256(b'other').hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(f"/api/uploads/{session['id']}/").data['missing_chunks'], [0, 1])
+
+    def test_uploads_are_private_and_must_be_complete(self):
+        session = self.start(b'abcd')
+        response = self.client.post('/api/missions/', {
+            'assigned_date': str(date.today()), 'end_date': str(date.today()),
+            'upload_ids': [session['id']],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.client.force_authenticate(self.alice)
+        self.assertEqual(self.client.get(f"/api/uploads/{session['id']}/").status_code, 404)
+
+
+class AttachmentBlobTests(TestCase):
+    """İçerik adresli, tekilleştirilmiş ek dosya deposu"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+        cls.missions = create_missions(cls.manager, [cls.alice], 2)
+        MissionAttachment.objects.all().delete()
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media_root = media.name
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def attach(self, mission, content, name='rapor.pdf'):
+        return MissionAttachment.objects.create(mission=mission, file=SimpleUploadedFile(name, content))
+
+    def test_same_content_is_stored_once(self):
+        first = self.attach(self.missions[0], b'ayni icerik')
+        second = self.attach(self.missions[1], b'ayni icerik', name='kopya.pdf')
+        self.assertEqual(first.blob_id, second.blob_id)
+        self.assertEqual((first.name, second.name), ('rapor.pdf', 'kopya.pdf'))
+        blob = AttachmentBlob.objects.get()
+        self.assertEqual((blob.ref_count, blob.size), (2, len(b'ayni icerik')))
+        self.assertEqual(blob.file.name, f'blobs/{blob.sha256[:2]}/{blob.sha256[2:4]}/{blob.sha256}.pdf')
+        path = blob.file.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(AttachmentBlob.objects.get().ref_count, 1)
+        self.assertTrue(os.path.exists(path))
+        # Son referans silinince blob ve dosyası da silinir
+        with self.captureOnCommitCallbacks(execute=True):
+            self.missions[1].delete()
+        self.assertFalse(AttachmentBlob.objects.exists())
+        self.assertFalse(os.path.exists(path))
+
+    def test_dedupe_command_migrates_legacy_files(self):
+        legacy = []
+        for mission, name in ((self.missions[0], 'a.pdf'), (self.missions[1], 'b.pdf')):
+            path = os.path.join(self.media_root, 'mission_files', name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(b'eski dosya')
+            legacy.append(MissionAttachment.objects.create(mission=mission, file=f'mission_files/{name}'))
+        self.assertTrue(all(a.blob_id is None for a in legacy))
+
+        out = StringIO()
+        call_command('dedupe_attachments', '--dry-run', stdout=out)
+        self.assertIn('1 kopya', out.getvalue())
+        self.assertFalse(AttachmentBlob.objects.exists())
+
+        call_command('dedupe_attachments', stdout=StringIO())
+        blob = AttachmentBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(
+            sorted(MissionAttachment.objects.values_list('name', 'file')),
+            [('a.pdf', blob.file.name), ('b.pdf', blob.file.name)],
+        )
+        self.assertFalse(os.listdir(os.path.join(self.media_root, 'mission_files')))
+
+
+@override_settings(PROFILE_PHOTO_ASYNC=False)
+class ProfilePhotoVariantTests(TestCase):
+    """Profil fotoğrafının küçük varyantları yüklemeden sonra üretilir"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, size, name='foto.png'):
+        buffer = BytesIO()
+        Image.new('RGBA', size, (200, 30, 30, 255)).save(buffer, format='PNG')
+        photo = SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch('/api/user/profile/', {'profile_photo': photo}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        # Yanıt varyantlar üretilmeden döner; orijinale düşer
+        self.assertEqual(response.data['profile_photo_thumb'], response.data['profile_photo'])
+        self.user.refresh_from_db()
+        return self.user.photo_variants
+
+    def test_variants_are_generated_and_replaced(self):
+        variants = self.upload((800, 600))
+        self.assertEqual(set(variants), {'thumb', 'medium'})
+        storage = CustomUser._meta.get_field('profile_photo').storage
+        for variant, expected in (('thumb', (64, 48)), ('medium', (256, 192))):
+            with storage.open(variants[variant]) as f:
+                self.assertEqual(Image.open(f).size, expected)
+
+        data = self.client.get('/api/user/profile/').data
+        self.assertTrue(data['profile_photo_thumb'].endswith(variants['thumb']))
+        self.assertTrue(data['profile_photo_medium'].endswith(variants['medium']))
+
+        # Yeni fotoğraf eski varyantları siler
+        new_variants = self.upload((100, 100), name='yeni.png')
+        self.assertNotEqual(new_variants, variants)
+        self.assertFalse(any(storage.exists(name) for name in variants.values()))
+        self.assertTrue(all(storage.exists(name) for name in new_variants.values()))
+
+    def test_variants_survive_with_cached_jwt_user(self):
+        # force_authenticate değil: request.user CachedJWTAuthentication cache'inden gelir
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        buffer = BytesIO()
+        Image.new('RGB', (400, 300), (30, 200, 30)).save(buffer, format='PNG')
+        photo = SimpleUploadedFile('foto.png', buffer.getvalue(), content_type='image/png')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch('/api/user/profile/', {'profile_photo': photo}, format='multipart')
+            # Varyantlar üretilmeden önceki istek kullanıcıyı boş varyantlarla cache'ler
+            self.client.get('/api/user/profile/')
+        self.user.refresh_from_db()
+        variants = self.user.photo_variants
+        self.assertEqual(set(variants), {'thumb', 'medium'})
+
+        # Arka plandaki update() cache'teki kullanıcıyı da geçersiz kılar
+        data = self.client.get('/api/user/profile/').data
+        self.assertTrue(data['profile_photo_thumb'].endswith(variants['thumb']))
+
+        # Fotoğrafsız PATCH eski kopyayı geri yazıp varyantları silmemeli
+        response = self.client.patch('/api/user/profile/', {'first_name': 'Alice'}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'Alice')
+        self.assertEqual(self.user.photo_variants, variants)
+        storage = CustomUser._meta.get_field('profile_photo').storage
+        self.assertTrue(all(storage.exists(name) for name in variants.values()))
+
+    def test_stale_job_is_discarded(self):
+        self.upload((300, 300))
+        photo = self.user.profile_photo.name
+        CustomUser.objects.filter(pk=self.user.pk).update(profile_photo='profile_photos/baska.png')
+        self.assertIsNone(generate_variants(self.user.pk, photo))
+
+
+class AttachmentDownloadTests(TestCase):
+    """İzin kontrollü, Range ve koşullu istek destekli ek dosya indirme"""
+    content = b'0123456789abcdef'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+        cls.bob = CustomUser.objects.create_user(username='bob', password='x', role='EMPLOYEE')
+        cls.mission = create_missions(cls.manager, [cls.alice], 1)[0]
+        MissionAttachment.objects.all().delete()
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media_root = media.name
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.attachment = MissionAttachment.objects.create(
+            mission=self.mission, file=SimpleUploadedFile('rapor.pdf', self.content)
+        )
+        self.url = f'/api/attachments/{self.attachment.id}/download/'
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def test_visibility_and_full_download(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_ACCEPT='application/pdf')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['ETag'], f'"{hashlib.sha256(self.content).hexdigest()}"')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('rapor.pdf', response['Content-Disposition'])
+
+        mission = self.client.get(f'/api/missions/{self.mission.id}/').data
+        self.assertTrue(mission['attachments'][0]['download_url'].endswith(self.url))
+
+        self.client.force_authenticate(self.bob)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+        self.assertEqual(response['Content-Range'], f'bytes 2-5/{len(self.content)}')
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-3')
+        self.assertEqual(b''.join(response.streaming_content), b'def')
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.content)}')
+
+        # Dosya değiştiyse (If-Range eşleşmez) tam dosya
+        response = self.client.get(self.url, HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE='"eski"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+
+    def test_conditional_and_proxy_handoff(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with override_settings(ATTACHMENT_SENDFILE_BACKEND='nginx'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(
+            response['X-Accel-Redirect'], f'/protected-media/{self.attachment.file.name}'
+        )
+
+
+    def test_proxy_handoff_with_non_ascii_name(self):
+        # Blob deposundan önceki ekler mission_files/ altında özgün adıyla durur
+        name = 'mission_files/görev_ş.pdf'
+        os.makedirs(os.path.join(self.media_root, 'mission_files'))
+        with open(os.path.join(self.media_root, name), 'wb') as f:
+            f.write(self.content)
+        legacy = MissionAttachment.objects.bulk_create([MissionAttachment(mission=self.mission, file=name)])[0]
+        url = f'/api/attachments/{legacy.id}/download/'
+
+        with override_settings(ATTACHMENT_SENDFILE_BACKEND='nginx'):
+            response = self.client.get(url)
+        self.assertEqual(
+            response['X-Accel-Redirect'], '/protected-media/mission_files/g%C3%B6rev_%C5%9F.pdf'
+        )
+        self.assertTrue(response['X-Accel-Redirect'].isascii())
+
+        # X-Sendfile URI çözmez: ASCII olmayan yol Django üzerinden gönderilir
+        with override_settings(ATTACHMENT_SENDFILE_BACKEND='sendfile'):
+            response = self.client.get(url)
+        self.assertNotIn('X-Sendfile', response)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        with override_settings(ATTACHMENT_SENDFILE_BACKEND='sendfile'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Sendfile'], self.attachment.file.path)
+
+
+class NotificationDispatchTests(TestCase):
+    """Termin hatırlatmaları ve gecikme uyarıları (locmem e-posta backend'i)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(
+            username='alice', password='x', email='alice@example.com',
+            notification_email='alice@bildirim.com',
+        )
+        cls.bob = CustomUser.objects.create_user(
+            username='bob', password='x', email='bob@example.com', task_reminders=False,
+        )
+        cls.carol = CustomUser.objects.create_user(
+            username='carol', password='x', email='carol@example.com', email_notifications=False,
+        )
+        today = date.today()
+        # create_missions termini başlangıçtan 7 gün sonraya koyar
+        cls.overdue = create_missions(cls.manager, [cls.alice, cls.bob, cls.carol], 2, today - timedelta(days=8))
+        cls.due_today = create_missions(cls.manager, [cls.alice, cls.bob], 1, today - timedelta(days=7))
+        create_missions(cls.manager, [cls.alice, cls.bob], 1, today)
+        done = create_missions(cls.manager, [cls.alice], 1, today - timedelta(days=8))
+        Mission.objects.filter(pk=done[0].pk).update(completed=True)
+
+    def test_groups_per_recipient_and_is_idempotent(self):
+        result = dispatch_notifications()
+        self.assertEqual(result, {'emails': 2, 'missions': 5, 'skipped': 0})
+        by_address = {message.to[0]: message for message in mail.outbox}
+        self.assertEqual(set(by_address), {'alice@bildirim.com', 'bob@example.com'})
+        alice_body = by_address['alice@bildirim.com'].body
+        self.assertIn('Termini geçen görevler', alice_body)
+        self.assertIn('Termini yaklaşan görevler', alice_body)
+        self.assertNotIn('Termini yaklaşan', by_address['bob@example.com'].body)
+
+        self.assertEqual(dispatch_notifications()['emails'], 0)
+        self.assertEqual(len(mail.outbox), 2)
+
+        # Termin değişince aynı görev için yeniden bildirim gider
+        Mission.objects.filter(pk=self.overdue[0].pk).update(end_date=date.today() - timedelta(days=2))
+        self.assertEqual(dispatch_notifications(), {'emails': 2, 'missions': 2, 'skipped': 0})
+        self.assertEqual(NotificationLog.objects.filter(mission=self.overdue[0]).count(), 4)
+
+    def test_batches_reuse_one_connection(self):
+        users = CustomUser.objects.bulk_create([
+            CustomUser(username=f'employee{i}', email=f'employee{i}@example.com') for i in range(5)
+        ])
+        missions = create_missions(self.manager, users, 1, date.today() - timedelta(days=7))
+        NotificationLog.objects.bulk_create([
+            NotificationLog(user=user, mission=mission, kind=NotificationLog.REMINDER, end_date=mission.end_date)
+            for user in (self.alice, self.bob)
+            for mission in self.due_today + missions
+        ] + [
+            NotificationLog(user=user, mission=mission, kind=NotificationLog.OVERDUE, end_date=mission.end_date)
+            for user in (self.alice, self.bob)
+            for mission in self.overdue
+        ])
+        backend = locmem.EmailBackend
+        send = backend.send_messages
+        batches = []
+
+        def send_messages(connection, messages):
+            # Liste parti gönderildikten sonra boşaltılır; boyut o an kaydedilir
+            batches.append((connection, len(messages)))
+            return send(connection, messages)
+
+        # 1 okuma + 3 parti (2+2+1) için birer toplu kayıt
+        with self.assertNumQueries(4), \
+                mock.patch.object(backend, 'open', autospec=True, side_effect=backend.open) as opened, \
+                mock.patch.object(backend, 'send_messages', autospec=True, side_effect=send_messages):
+            result = dispatch_notifications(batch_size=2)
+        self.assertEqual(result['emails'], 5)
+        # Üç parti de tek kez açılan aynı bağlantıdan gider
+        self.assertEqual(opened.call_count, 1)
+        connection = opened.call_args.args[0]
+        self.assertEqual(batches, [(connection, 2), (connection, 2), (connection, 1)])
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), [f'employee{i}@example.com' for i in range(5)])
+
+
+class MissionEventStreamTests(TestCase):
+    """Sinyallerden beslenen canlı görev akışı (SSE)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+        cls.bob = CustomUser.objects.create_user(username='bob', password='x', role='EMPLOYEE')
+        cls.mission = create_missions(cls.manager, [cls.alice], 1)[0]
+
+    def subscribe(self, broker, user, **kwargs):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        subscription = broker.subscribe(user.id, loop=loop, **kwargs)
+        self.addCleanup(broker.unsubscribe, subscription)
+        return subscription
+
+    def drain(self, subscription):
+        async def collect():
+            received = []
+            while (event := await subscription.get(0.01)) is not None:
+                received.append((event['type'], event['data']))
+            return received
+        return subscription.loop.run_until_complete(collect())
+
+    def test_signals_publish_to_audience(self):
+        broker = events.get_broker()
+        alice, bob, manager = (self.subscribe(broker, user) for user in (self.alice, self.bob, self.manager))
+
+        mission = Mission.objects.get(pk=self.mission.pk)
+        mission.completed = True
+        with self.captureOnCommitCallbacks(execute=True):
+            mission.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            mission.due_to.set([self.bob])
+
+        completed = self.drain(manager)[0]
+        self.assertEqual(completed[0], events.COMPLETED)
+        self.assertEqual(completed[1]['due_to'], [self.alice.id])
+        self.assertTrue(completed[1]['completed'])
+        self.assertEqual(
+            self.drain(alice),
+            [completed, (events.DELETED, {'id': mission.id})],
+        )
+        self.assertEqual([(kind, data['due_to']) for kind, data in self.drain(bob)], [(events.UPDATED, [self.bob.id])])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            mission.delete()
+        self.assertEqual(self.drain(bob), [(events.DELETED, {'id': self.mission.pk})])
+
+    def test_no_queries_without_listeners(self):
+        mission = Mission.objects.get(pk=self.mission.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            mission.save()
+        self.assertEqual(len(callbacks), 1)  # sadece sürüm yenileme
+
+    def test_last_event_id_replay_and_resync(self):
+        broker = events.InProcessBroker(buffer_size=2)
+        first, second, third = (
+            broker.publish({'type': events.UPDATED, 'data': {'id': i}}, [self.alice.id]) for i in range(3)
+        )
+        resumed = self.subscribe(broker, self.alice, last_event_id=second['id'])
+        self.assertEqual(self.drain(resumed), [(events.UPDATED, {'id': 2})])
+        # İlk olay tampondan düştü: istemci listeyi yeniden çekmeli
+        stale = self.subscribe(broker, self.alice, last_event_id=first['id'] - 1)
+        self.assertEqual(self.drain(stale), [(events.RESYNC, {})])
+
+    def test_requires_asgi(self):
+        self.client.force_login(self.alice)
+        self.assertEqual(self.client.get('/api/missions/events/').status_code, 501)
+
+    async def test_stream_over_asgi(self):
+        response = await self.async_client.get('/api/missions/events/?token=bozuk')
+        self.assertEqual(response.status_code, 401)
+
+        token = str(AccessToken.for_user(self.alice))
+        response = await self.async_client.get(f'/api/missions/events/?token={token}')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b'retry: 5000\n\n')
+        event = events.get_broker().publish({'type': events.UPDATED, 'data': {'id': 7}}, [self.alice.id])
+        frame = await asyncio.wait_for(anext(chunks), 1)
+        self.assertEqual(frame, f'id: {event["id"]}\nevent: mission.updated\ndata: {{"id": 7}}\n\n'.encode())
+        await chunks.aclose()
+
+
+@override_settings(MISSION_SYNC_OVERLAP_SECONDS=0)
+class MissionDeltaSyncTests(TestCase):
+    """?updated_since= ile sadece değişen görevler ve tombstone'lar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+        cls.bob = CustomUser.objects.create_user(username='bob', password='x', role='EMPLOYEE')
+        cls.missions = create_missions(cls.manager, [cls.alice], 4)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def sync(self, token, **params):
+        return self.client.get('/api/missions/', {'updated_since': token, **params})
+
+    def test_change_log_holds_big_mission_ids(self):
+        # Mission.id BigAutoField; 2^31 üstü id'ler günlükte taşmamalı
+        big_id = 2**40
+        MissionChange.objects.create(user=self.alice, mission_id=big_id)
+        self.assertEqual(MissionChange.objects.get(mission_id=big_id).mission_id, big_id)
+        self.assertEqual(MissionChange._meta.get_field('mission_id').get_internal_type(), 'PositiveBigIntegerField')
+
+    def test_returns_changes_and_tombstones(self):
+        response = self.client.get('/api/missions/')
+        self.assertEqual(len(response.data), 4)
+        token = response['X-Sync-Token']
+
+        edited, unassigned, deleted, untouched = (Mission.objects.get(pk=m.pk) for m in self.missions)
+        edited.description = 'Güncellendi'
+        edited.save()
+        unassigned.due_to.remove(self.alice)
+        deleted.delete()
+        new = Mission.objects.create(
+            description='Yeni', assigned_date=date.today(), end_date=date.today(), created_by=self.manager
+        )
+        new.due_to.set([self.alice])
+        # Başkasının görevi değişikliklerde görünmez
+        other = Mission.objects.create(
+            description='Başka', assigned_date=date.today(), end_date=date.today(), created_by=self.manager
+        )
+        other.due_to.set([self.bob])
+
+        response = self.sync(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(m['id'] for m in response.data['results']), [edited.id, new.id])
+        self.assertEqual(response.data['deleted'], sorted([unassigned.id, self.missions[2].id]))
+        by_id = {m['id']: m for m in response.data['results']}
+        self.assertEqual(by_id[edited.id]['description'], 'Güncellendi')
+
+        # Yeni token ile değişiklik yoksa boş
+        response = self.sync(response.data['sync_token'])
+        self.assertEqual((response.data['results'], response.data['deleted']), ([], []))
+
+    def test_filters_turn_non_matching_changes_into_tombstones(self):
+        token = self.client.get('/api/missions/')['X-Sync-Token']
+        mission = Mission.objects.get(pk=self.missions[0].pk)
+        mission.completed = True
+        mission.save()
+        response = self.sync(token, completed='false')
+        self.assertEqual((response.data['results'], response.data['deleted']), ([], [mission.id]))
+        response = self.sync(token, completed='true')
+        self.assertEqual([m['id'] for m in response.data['results']], [mission.id])
+
+    def test_token_validation(self):
+        self.assertEqual(self.sync('dün').status_code, 400)
+        old = (timezone.now() - timedelta(days=31)).isoformat()
+        self.assertEqual(self.sync(old).status_code, 410)
+        recent = (timezone.now() - timedelta(minutes=1)).isoformat()
+        self.assertEqual(len(self.sync(recent).data['results']), 4)
+
+
+class ToggleCompleteTests(TestCase):
+    """toggle_complete tek koşullu UPDATE ile çalışır ve completed_at tutar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+        cls.bob = CustomUser.objects.create_user(username='bob', password='x', role='EMPLOYEE')
+        cls.mission = create_missions(cls.manager, [cls.alice], 1)[0]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+        self.url = f'/api/missions/{self.mission.id}/toggle_complete/'
+
+    def test_toggles_atomically_with_compact_response(self):
+        etag = self.client.get('/api/missions/')['ETag']
+        # UPDATE + yanıt için tek SELECT (+ sürüm yenileme için görünürlük sorgusu)
+        with self.assertNumQueries(3):
+            response = self.client.patch(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'id', 'completed', 'completed_at', 'updated_at'})
+        self.assertTrue(response.data['completed'])
+        self.assertIsNotNone(response.data['completed_at'])
+        # update() sinyal tetiklemese de önbellekler geçersiz olur
+        self.assertEqual(self.client.get('/api/missions/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        response = self.client.patch(self.url)
+        self.assertEqual((response.data['completed'], response.data['completed_at']), (False, None))
+
+    def test_permissions(self):
+        self.client.force_authenticate(self.manager)
+        self.assertEqual(self.client.patch(self.url).status_code, 403)
+        self.client.force_authenticate(self.bob)
+        self.assertEqual(self.client.patch(self.url).status_code, 404)
+        self.assertFalse(Mission.objects.get(pk=self.mission.pk).completed)
+
+    def test_save_maintains_completed_at(self):
+        mission = Mission.objects.get(pk=self.mission.pk)
+        mission.completed = True
+        mission.save(update_fields=['completed'])
+        mission.refresh_from_db()
+        self.assertIsNotNone(mission.completed_at)
+        mission.completed = False
+        mission.save()
+        mission.refresh_from_db()
+        self.assertIsNone(mission.completed_at)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """JWT ile gelen kullanıcı cache'ten çözülür; kayıtta geçersiz olur"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = CustomUser.objects.create_user(username='alice', password='eski-sifre', role='EMPLOYEE')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.alice)}')
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/user/profile/')
+        self.assertEqual(response.status_code, 200)
+        return response, [q for q in ctx.captured_queries if 'core_customuser' in q['sql']]
+
+    def test_second_request_skips_user_lookup(self):
+        self.assertEqual(len(self.user_queries()[1]), 1)
+        self.assertEqual(len(self.user_queries()[1]), 0)
+
+    def test_save_invalidates(self):
+        self.user_queries()
+        self.alice.first_name = 'Alice'
+        self.alice.save()
+        response, queries = self.user_queries()
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(response.data['first_name'], 'Alice')
+
+    def test_deactivation_rejects_token(self):
+        self.user_queries()
+        self.alice.is_active = False
+        self.alice.save()
+        self.assertEqual(self.client.get('/api/user/profile/').status_code, 401)
+
+    def test_password_change_invalidates(self):
+        self.user_queries()
+        response = self.client.post(
+            '/api/user/change-password/',
+            {'old_password': 'eski-sifre', 'new_password': 'yeni-sifre-123'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(cache.get(f'auth:user:{self.alice.pk}'))
+        # Cache'ten gelen kullanıcı yeni şifreyi görür (eski hash ile tekrar kaydedilmez)
+        self.user_queries()
+        self.alice.refresh_from_db()
+        self.assertTrue(self.alice.check_password('yeni-sifre-123'))
+
+
+class MissionSearchTests(TestCase):
+    """/api/missions/search/ tam metin indeksiyle arar, görünürlüğe uyar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+        cls.bob = CustomUser.objects.create_user(username='bob', password='x', role='EMPLOYEE')
+        cls.report, cls.meeting, cls.long_report = create_missions(cls.manager, [cls.alice], 3)
+        cls.report.description = "Aylık rapor"
+        cls.report.from_to = "Ankara - İzmir"
+        cls.report.save()
+        cls.meeting.description = "Müşteri toplantısı"
+        cls.meeting.save()
+        cls.long_report.description = "Rapor taslağı, bütçe tablosu, ekler ve sunum dosyası hazırlanacak"
+        cls.long_report.save()
+        cls.hidden = create_missions(cls.manager, [cls.bob], 1)[0]
+        cls.hidden.description = "Gizli rapor"
+        cls.hidden.save()
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def search(self, q, **params):
+        response = self.client.get('/api/missions/search/', {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [mission['id'] for mission in response.data['results']]
+
+    def test_ranked_and_visibility_filtered(self):
+        self.assertEqual(self.search('rapor'), [self.report.id, self.long_report.id])
+
+    def test_prefix_diacritics_and_from_to(self):
+        self.assertEqual(self.search('rap'), [self.report.id, self.long_report.id])
+        self.assertEqual(self.search('musteri'), [self.meeting.id])
+        self.assertEqual(self.search('izmir'), [self.report.id])
+        # Kullanıcı girdisindeki FTS operatörleri etkisiz
+        self.assertEqual(self.search('"rapor" -(*'), [self.report.id, self.long_report.id])
+
+    def test_turkish_capitals(self):
+        # 'İ'.lower() birleşik nokta üretir; terimler bölünmemeli
+        self.assertEqual(self.search('İzmir'), [self.report.id])
+        self.assertEqual(self.search('İZMİR'), [self.report.id])
+        self.assertEqual(self.search('MÜŞTERİ'), [self.meeting.id])
+        self.assertEqual(self.search('AYLIK RAPOR'), [self.report.id])
+        matches = Mission.objects.filter(search_filter('ANKARA İZMİR')).values_list('id', flat=True)
+        self.assertEqual(list(matches), [self.report.id])
+
+    def test_index_follows_save_and_delete(self):
+        self.meeting.description = "Tedarikçi görüşmesi"
+        self.meeting.save()
+        self.assertEqual(self.search('müşteri'), [])
+        self.assertEqual(self.search('tedarikçi'), [self.meeting.id])
+        self.report.delete()
+        self.assertEqual(self.search('rapor'), [self.long_report.id])
+
+    def test_paginates_without_count(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/missions/search/', {'q': 'rapor', 'page_size': 1})
+        self.assertFalse(any('COUNT(' in q['sql'] for q in ctx.captured_queries))
+        self.assertEqual([m['id'] for m in response.data['results']], [self.report.id])
+        self.assertIsNone(response.data['previous'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([m['id'] for m in response.data['results']], [self.long_report.id])
+        self.assertIsNone(response.data['next'])
+
+    def test_list_filters_apply(self):
+        self.client.patch(f'/api/missions/{self.report.id}/toggle_complete/')
+        self.assertEqual(self.search('rapor', completed='false'), [self.long_report.id])
+
+    def test_requires_query(self):
+        response = self.client.get('/api/missions/search/', {'q': '  *  '})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('q', response.data)
+
+    def test_ranked_queryset_composes_as_subquery(self):
+        # Alaka puanı alias'a bağlı değil: dilimlenmiş (sıralı) alt sorgu olarak çalışır
+        best = search_missions(Mission.objects.filter(due_to=self.alice), 'rapor')[:1]
+        self.assertEqual(list(Mission.objects.filter(id__in=best.values('id'))), [self.report])
+
+    def test_admin_matches_each_word(self):
+        model_admin = MissionAdmin(Mission, admin.site)
+
+        def admin_search(term):
+            queryset, _ = model_admin.get_search_results(None, Mission.objects.order_by('id'), term)
+            return list(queryset)
+
+        self.assertEqual(admin_search('manager toplantı'), [self.meeting])
+        self.assertEqual(admin_search('"gizli rapor" manag'), [self.hidden])
+        self.assertEqual(admin_search('alice rapor'), [])
+
+
+@override_settings(PERF_METRICS_ENABLED=True, PERF_METRICS_TOKEN='')
+class PerformanceMetricsTests(TestCase):
+    """Server-Timing başlığı ve /metrics histogramları (opt-in)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = CustomUser.objects.create_user(username='manager', password='x', role='MANAGER')
+        cls.alice = CustomUser.objects.create_user(username='alice', password='x', role='EMPLOYEE')
+        create_missions(cls.manager, [cls.alice], 3)
+
+    def setUp(self):
+        cache.clear()
+        metrics.registry.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+
+    def test_server_timing_header(self):
+        response = self.client.get('/api/missions/')
+        timing = response['Server-Timing']
+        for part in ('db;dur=', 'serialize;dur=', 'render;dur=', 'total;dur='):
+            self.assertIn(part, timing)
+        self.assertRegex(timing, r'desc="[1-9]\d* queries"')
+
+    def test_metrics_aggregated_by_url_name(self):
+        self.client.get('/api/missions/')
+        self.client.get('/api/missions/')
+        self.client.get('/api/users/organization/')
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE giga_db_queries histogram', body)
+        self.assertIn('giga_request_duration_seconds_count{view="mission-list"} 2', body)
+        self.assertIn('giga_serialize_duration_seconds_count{view="organization-chart-1"} 1', body)
+        self.assertIn('giga_response_size_bytes_bucket{view="mission-list",le="+Inf"} 2', body)
+        self.assertNotIn('view="metrics"', body)
+
+    @override_settings(PERF_METRICS_TOKEN='gizli')
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer gizli')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(PERF_QUERY_WARNING_THRESHOLD=0)
+    def test_warns_on_query_threshold(self):
+        with self.assertLogs('core.metrics', level='WARNING'):
+            self.client.get('/api/missions/')
+
+    @override_settings(PERF_METRICS_ENABLED=False)
+    def test_disabled_by_default(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/missions/'))
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+
+class BenchmarkTests(TestCase):
+    """Sentetik organizasyon üretici ve baseline karşılaştırmalı benchmark"""
+
+    def setUp(self):
+        cache.clear()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.result = generate_org(users=20, missions=30, assignees=2, attachments=2, seed=1)
+
+    def test_generates_consistent_org(self):
+        self.assertEqual(self.result, {'users': 20, 'missions': 30, 'assignments': 60, 'attachments': 60})
+        self.assertEqual(CustomUser.objects.filter(role='CEO').count(), 1)
+        self.assertEqual(CustomUser.objects.filter(role='MANAGER').count(), 2)
+        # Atananlar politikaya uygun: sadece çalışanlar
+        self.assertFalse(Mission.due_to.through.objects.exclude(customuser__role='EMPLOYEE').exists())
+        # Elle yazılan görünürlük satırları created_by/due_to'dan türetilenle aynı
+        generated = set(MissionVisibility.objects.values_list('user_id', 'mission_id', 'relation'))
+        MissionVisibility.rebuild()
+        self.assertEqual(generated, set(MissionVisibility.objects.values_list('user_id', 'mission_id', 'relation')))
+        # Ekler tek blob'u paylaşır
+        self.assertEqual(AttachmentBlob.objects.get().ref_count, 60)
+
+    def test_regenerating_requires_clear(self):
+        with self.assertRaisesMessage(CommandError, '--clear'):
+            call_command('generate_org', users=5, missions=2, stdout=StringIO())
+        call_command('generate_org', users=5, missions=2, clear=True, stdout=StringIO())
+        self.assertEqual(CustomUser.objects.filter(username__startswith='bench_').count(), 5)
+        self.assertEqual(Mission.objects.count(), 2)
+
+    def test_runs_scenarios_and_restores_data(self):
+        missions = Mission.objects.count()
+        completed = list(Mission.objects.filter(completed=True).values_list('id', flat=True))
+        results = Benchmark().run(iterations=3, warmup=1)
+        self.assertEqual(set(results), set(Benchmark.SCENARIOS))
+        for result in results.values():
+            self.assertLessEqual(result['p50'], result['p90'])
+            self.assertLessEqual(result['p90'], result['max'])
+        self.assertEqual(Mission.objects.count(), missions)
+        self.assertEqual(list(Mission.objects.filter(completed=True).values_list('id', flat=True)), completed)
+
+    def test_baseline_regression_fails(self):
+        baseline = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+        self.addCleanup(os.remove, baseline.name)
+        baseline.close()
+        call_command(
+            'benchmark', scenario=['mission-list'], iterations=2, warmup=1,
+            baseline=baseline.name, save_baseline=True, stdout=StringIO(),
+        )
+        with open(baseline.name) as f:
+            data = json.load(f)
+        self.assertEqual(data['org']['missions'], 30)
+
+        with self.assertRaisesMessage(CommandError, 'Baseline bulunamadı'):
+            call_command(
+                'benchmark', scenario=['mission-list'], iterations=1, warmup=0,
+                baseline=baseline.name + '.yok', stdout=StringIO(),
+            )
+        self.assertEqual(compare_to_baseline(data['scenarios'], data), [])
+
+        data['scenarios']['mission-list']['queries'] -= 1
+        with open(baseline.name, 'w') as f:
+            json.dump(data, f)
+        with self.assertRaisesMessage(CommandError, 'mission-list: sorgu sayısı'):
+            call_command(
+                'benchmark', scenario=['mission-list'], iterations=2, warmup=1,
+                baseline=baseline.name, stdout=StringIO(),
+            )
+
+
+class SQLiteConcurrencyTests(SimpleTestCase):
+    """Ayarlardaki SQLite pragma'ları: okuyucu açıkken yazanlar beklemeden commit eder"""
+    writers = 4
+    writes_per_thread = 20
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("SQLite profili")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'bench.sqlite3')
+
+    def connect(self, pragmas, timeout):
+        db = sqlite3.connect(self.path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        for pragma in pragmas:
+            # journal_mode dosyada kalıcıdır; kurulumda bir kez ayarlanır
+            if 'journal_mode' not in pragma:
+                db.execute(pragma)
+        return db
+
+    def committed_while_reading(self, pragmas):
+        """Uzun bir okuma transaction'ı açıkken eşzamanlı yazanların commit sayısı"""
+        setup = self.connect(pragmas, 1)
+        for pragma in pragmas:
+            setup.execute(pragma)
+        setup.execute('CREATE TABLE IF NOT EXISTS item (id INTEGER PRIMARY KEY, value TEXT)')
+        setup.close()
+
+        reader = self.connect(pragmas, 1)
+        reader.execute('BEGIN')
+        reader.execute('SELECT COUNT(*) FROM item').fetchone()
+        committed = []
+
+        def write():
+            db = self.connect(pragmas, 0.05)
+            done = 0
+            for i in range(self.writes_per_thread):
+                try:
+                    db.execute('BEGIN IMMEDIATE')
+                    db.execute('INSERT INTO item (value) VALUES (?)', (str(i),))
+                    db.execute('COMMIT')
+                    done += 1
+                except sqlite3.OperationalError:
+                    if db.in_transaction:
+                        db.execute('ROLLBACK')
+            committed.append(done)
+            db.close()
+
+        threads = [threading.Thread(target=write) for _ in range(self.writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        reader.execute('COMMIT')
+        reader.close()
+        return sum(committed)
+
+    def test_wal_profile_keeps_writers_moving(self):
+        pragmas = [
+            command.strip()
+            for command in connection.settings_dict['OPTIONS']['init_command'].split(';')
+            if command.strip() and 'busy_timeout' not in command
+        ]
+        self.assertIn('PRAGMA journal_mode=WAL', pragmas)
+        # Varsayılan rollback journal: okuyucu kilidi bırakana kadar commit yok
+        self.assertEqual(self.committed_while_reading(['PRAGMA journal_mode=DELETE']), 0)
+        os.remove(self.path)
+        self.assertEqual(self.committed_while_reading(pragmas), self.writers * self.writes_per_thread)
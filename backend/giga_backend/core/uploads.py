@@ -0,0 +1,106 @@
+import hashlib
+import os
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .blobstore import adopt_path
+from .models import MissionAttachment, UploadSession
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class MissingChunks(Exception):
+    """Tamamlama isteği geldiğinde henüz alınmamış parçalar var"""
+
+    def __init__(self, missing):
+        super().__init__(missing)
+        self.missing = missing
+
+
+def write_chunk(session, index, stream, length):
+    """
+    Parçayı istek gövdesinden bloklar halinde okuyup dosyadaki ofsetine yazar.
+    Parça belleğe tamamen alınmaz; aynı parça tekrar gönderilirse üzerine yazılır.
+    """
+    if session.status != UploadSession.PENDING:
+        raise ValidationError({"detail": "Yükleme zaten tamamlandı."})
+    if not 0 <= index < session.total_chunks:
+        raise ValidationError({"index": f"Parça numarası 0-{session.total_chunks - 1} aralığında olmalıdır."})
+    expected = session.chunk_length(index)
+    if length != expected:
+        raise ValidationError({"detail": f"Parça {expected} bayt olmalıdır (gelen: {length})."})
+
+    os.makedirs(os.path.dirname(session.path), exist_ok=True)
+    fd = os.open(session.path, os.O_WRONLY | os.O_CREAT, 0o640)
+    try:
+        offset = index * session.chunk_size
+        written = 0
+        while written < expected:
+            block = stream.read(min(READ_BLOCK_SIZE, expected - written))
+            if not block:
+                break
+            os.pwrite(fd, block, offset + written)
+            written += len(block)
+    finally:
+        os.close(fd)
+    if written != expected:
+        # Bağlantı koptu: parça alınmamış sayılır, istemci tekrar gönderir
+        raise ValidationError({"detail": "Parça eksik alındı, tekrar gönderin."})
+
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if index not in session.received_chunks:
+            session.received_chunks = sorted(session.received_chunks + [index])
+            session.save(update_fields=['received_chunks'])
+    return session
+
+
+def file_checksum(path):
+    """Dosyanın SHA-256'sını bloklar halinde okuyarak hesapla"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def complete_upload(session, checksum):
+    """Tüm parçalar geldiyse SHA-256 doğrula ve oturumu tamamla; eksik varsa MissingChunks"""
+    if session.status == UploadSession.COMPLETE:
+        return session
+    missing = session.missing_chunks()
+    if missing:
+        raise MissingChunks(missing)
+
+    checksum = (checksum or session.checksum).lower()
+    if not checksum:
+        raise ValidationError({"checksum": "SHA-256 checksum gereklidir."})
+    actual = file_checksum(session.path)
+    if actual != checksum:
+        # Bozuk veri: parçalar baştan gönderilmeli
+        session.received_chunks = []
+        session.save(update_fields=['received_chunks'])
+        raise ValidationError({"checksum": "Checksum eşleşmedi; dosyayı yeniden yükleyin."})
+
+    session.checksum = actual
+    session.status = UploadSession.COMPLETE
+    session.completed_at = timezone.now()
+    session.save(update_fields=['checksum', 'status', 'completed_at'])
+    return session
+
+
+def attach_uploads(mission, sessions):
+    """
+    Tamamlanmış yüklemeleri göreve ek dosya olarak bağla. Dosya içerik adresli
+    depoya taşınır (kopyalanmaz; içerik zaten varsa silinir). Oturumlar tüketilir.
+    """
+    attachments = []
+    for session in sessions:
+        blob = adopt_path(session.path, session.checksum, session.size, session.filename)
+        attachments.append(MissionAttachment.objects.create(
+            mission=mission, blob=blob, file=blob.file.name, name=session.filename
+        ))
+        session.delete()
+    return attachments
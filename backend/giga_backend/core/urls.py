@@ -5,6 +5,9 @@ from .views import (
     UserProfileView,
     ChangePasswordView,
     MissionViewSet, 
+    UploadSessionViewSet,
+    AttachmentDownloadView,
+    mission_event_stream,
     AssignableUsersView, 
     OrganizationChartView
 )
@@ -12,6 +15,7 @@ from .views import (
 # Router for ViewSets
 router = DefaultRouter()
 router.register(r'missions', MissionViewSet, basename='mission')
+router.register(r'uploads', UploadSessionViewSet, basename='upload')
 
 urlpatterns = [
     # User endpoints
@@ -26,6 +30,12 @@ urlpatterns = [
     path('users/organization/', OrganizationChartView.as_view(), name='organization-chart-1'),
     path('users/organization_chart/', OrganizationChartView.as_view(), name='organization-chart-2'),
     
+    # Canlı görev akışı (SSE, ASGI) - router'daki missions/<pk>/ ile çakışmasın diye önce
+    path('missions/events/', mission_event_stream, name='mission-events'),
+    
+    # Ek dosya indirme (izin kontrollü, Range destekli)
+    path('attachments/<int:pk>/download/', AttachmentDownloadView.as_view(), name='attachment-download'),
+    
     # Mission endpoints (router'dan geliyor) - BUNU EN SONA KOY
     path('', include(router.urls)),
 ]
\ No newline at end of file
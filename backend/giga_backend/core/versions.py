@@ -0,0 +1,66 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from .models import MissionVisibility
+
+# Sürüm değerleri zaman damgasıdır (ns); cache'ten düşen anahtar daha büyük
+# bir değerle yeniden oluşur, böylece eski bir ETag asla tekrar eşleşmez.
+# Süreleri sınırlıdır (VERSION_CACHE_TIMEOUT): kaçırılan bir yenileme en geç
+# bu sürede kendiliğinden düzelir.
+DIRECTORY_KEY = 'version:directory'
+
+
+def missions_key(user_id):
+    """Kullanıcının görebildiği görev kümesinin sürümü"""
+    return f'version:missions:{user_id}'
+
+
+def user_key(user_id):
+    """Tek bir kullanıcının (profil) sürümü"""
+    return f'version:user:{user_id}'
+
+
+def get_versions(keys):
+    """Anahtarların güncel sürümlerini döner (yoksa oluşturur)"""
+    found = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, settings.VERSION_CACHE_TIMEOUT)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def _bump(keys):
+    cache.set_many({key: time.time_ns() for key in keys}, settings.VERSION_CACHE_TIMEOUT)
+
+
+def bump(keys):
+    """
+    Sürümleri yenile. Transaction içindeyse commit sonrası bir kez daha
+    yenilenir; commit öncesi okunan eski veri yeni ETag ile eşleşemez.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    _bump(keys)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump(keys))
+
+
+def mission_audience(mission_ids):
+    """Görevleri görebilen kullanıcı id'leri"""
+    return set(
+        MissionVisibility.objects.filter(mission_id__in=mission_ids)
+        .values_list('user_id', flat=True)
+    )
+
+
+def bump_missions(mission_ids=(), user_ids=()):
+    """Görevleri görenlerin (ve ek kullanıcıların) görev sürümünü yenile"""
+    audience = set(user_ids)
+    if mission_ids:
+        audience |= mission_audience(mission_ids)
+    bump(missions_key(user_id) for user_id in audience)
@@ -1,12 +1,49 @@
-from rest_framework import generics, viewsets, status
+import json
+from datetime import timedelta
+from itertools import groupby
+from operator import itemgetter
+
+from asgiref.sync import sync_to_async
+from rest_framework import generics, mixins, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated, AllowAny
 from rest_framework.parsers import MultiPartParser, FormParser
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Q
-from .models import Mission
-from .serializers import CustomUserSerializer, MissionSerializer, UserRegisterSerializer
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Case, Value, When
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed, NotFound, ValidationError
+from rest_framework_simplejwt.exceptions import InvalidToken
+from . import events
+from .authentication import CachedJWTAuthentication
+from .bulk import bulk_create_missions, bulk_update_missions
+from .downloads import serve_attachment
+from .events import format_event, get_broker
+from .filters import MissionFilterBackend, parse_date_param
+from .metrics import span
+from .mixins import ConditionalGetMixin, DirectoryCacheMixin
+from .models import Mission, MissionAttachment, UploadSession
+from .pagination import MissionCursorPagination, MissionSearchPagination
+from .photos import delete_variants, schedule_variants
+from .policy import AssignmentPolicy
+from .search import search_missions
+from .serializers import (
+    CustomUserSerializer,
+    MissionSerializer,
+    UserRegisterSerializer,
+    UploadSessionSerializer,
+    UserSummarySerializer,
+    user_rows,
+)
+from .stats import mission_stats
+from .sync import SyncTokenExpired, changed_missions, make_sync_token, parse_sync_token
+from .uploads import MissingChunks, complete_upload, write_chunk
+from .versions import DIRECTORY_KEY, bump_missions, get_versions, missions_key, user_key
 
 User = get_user_model()
 
@@ -38,14 +75,31 @@ class CreateUserView(generics.CreateAPIView):
         }, status=status.HTTP_201_CREATED)
 
 
-class UserProfileView(generics.RetrieveUpdateAPIView):
+class UserProfileView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     """Kullanıcının kendi profilini görüntüleme ve güncelleme"""
     serializer_class = CustomUserSerializer
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
     
+    def get_version_keys(self):
+        return [user_key(self.request.user.id)]
+    
     def get_object(self):
-        return self.request.user
+        # request.user JWT cache'inden gelebilir; yazarken tüm alanlar geri
+        # kaydedildiği için (ör. arka planda üretilen photo_variants) güncel satır yüklenir
+        if self.request.method in SAFE_METHODS:
+            return self.request.user
+        return User.objects.get(pk=self.request.user.pk)
+    
+    def perform_update(self, serializer):
+        if 'profile_photo' not in serializer.validated_data:
+            serializer.save()
+            return
+        # Yeni fotoğraf: eski varyantları sil, yenilerini arka planda üret
+        old_variants = serializer.instance.photo_variants
+        user = serializer.save(photo_variants={})
+        transaction.on_commit(lambda: delete_variants(old_variants))
+        schedule_variants(user.id, user.profile_photo.name)
     
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
@@ -62,7 +116,8 @@ class ChangePasswordView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
-        user = request.user
+        # Cache'teki kopya değil güncel satır kaydedilir (bkz. UserProfileView.get_object)
+        user = User.objects.get(pk=request.user.pk)
         old_password = request.data.get('old_password')
         new_password = request.data.get('new_password')
         
@@ -89,58 +144,168 @@ class ChangePasswordView(generics.GenericAPIView):
 
 # ============ MISSION VIEWSET (ROLE-BASED) ============
 
-class MissionViewSet(viewsets.ModelViewSet):
+class MissionViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = MissionSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [MissionFilterBackend]
+    
+    def get_version_keys(self):
+        # Görevler iç içe kullanıcı bilgisi taşıdığı için dizin sürümü de dahil
+        return [missions_key(self.request.user.id), DIRECTORY_KEY]
     
     def get_queryset(self):
         """Kullanıcının görebildiği görevleri getir"""
         user = self.request.user
-        return Mission.objects.filter(
-            Q(created_by=user) | Q(due_to=user)
-        ).distinct()
+        # İlişkiler toplu yüklenir: sayfa boyutundan bağımsız sabit sorgu sayısı
+        # MissionVisibility üzerinden: OR-join ve DISTINCT yok
+        return Mission.objects.visible_to(user).select_related('created_by').prefetch_related('due_to', 'attachments')
+    
+    @property
+    def paginator(self):
+        """?pagination=cursor (veya ?cursor=) ile keyset sayfalamaya geç"""
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if params.get('pagination') == 'cursor' or 'cursor' in params:
+                self._paginator = MissionCursorPagination()
+                return self._paginator
+        return super().paginator
     
     def get_serializer_context(self):
         """Serializer'a request context'i gönder"""
         context = super().get_serializer_context()
         context['request'] = self.request
+        if self.request.method == 'GET':
+            params = self.request.query_params
+            context['compact'] = params.get('view') == 'compact'
+            if params.get('fields'):
+                context['fields'] = [name.strip() for name in params['fields'].split(',') if name.strip()]
         return context
     
+    def side_loaded_users(self, missions):
+        """Compact görünüm için görevlerdeki kullanıcıları id'ye göre tekilleştir"""
+        users = {}
+        for mission in missions:
+            if mission.created_by_id is not None:
+                users[mission.created_by_id] = mission.created_by
+            for assignee in mission.due_to.all():
+                users[assignee.id] = assignee
+        serializer = UserSummarySerializer(
+            users.values(), many=True, context=self.get_serializer_context()
+        )
+        return {user['id']: user for user in serializer.data}
+    
+    def list(self, request, *args, **kwargs):
+        """
+        ?view=compact ise kullanıcılar 'users' sözlüğünde bir kez döner.
+        Yanıtın X-Sync-Token başlığı sonraki ?updated_since= isteğinde kullanılır.
+        """
+        # Token sorgudan önce alınır: sorgu sırasında yapılan değişiklik kaçmaz
+        sync_token = make_sync_token()
+        if 'updated_since' in request.query_params:
+            return self.delta(request, sync_token)
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        missions = page if page is not None else list(queryset)
+        with span('serialize'):
+            data = self.get_serializer(missions, many=True).data
+        
+        compact = request.query_params.get('view') == 'compact'
+        if page is not None:
+            response = self.get_paginated_response(data)
+        elif compact:
+            response = Response({'results': data})
+        else:
+            response = Response(data)
+        if compact:
+            with span('serialize'):
+                response.data['users'] = self.side_loaded_users(missions)
+        response['X-Sync-Token'] = sync_token
+        return response
+    
+    def delta(self, request, sync_token):
+        """
+        ?updated_since=<token|ISO zaman>: sadece değişen görevler (sayfalamasız)
+        ve artık görünmeyen/silinen/filtreye uymayan görevlerin id'leri.
+        """
+        try:
+            since = parse_sync_token(request.query_params['updated_since'])
+        except ValueError:
+            raise ValidationError({"updated_since": ["Geçersiz zaman veya senkronizasyon tokenı."]})
+        try:
+            candidates, logged = changed_missions(Mission.objects.visible_to(request.user), request.user, since)
+        except SyncTokenExpired:
+            return Response(
+                {"detail": "Senkronizasyon tokenı çok eski; tam liste çekilmeli."},
+                status=status.HTTP_410_GONE
+            )
+        missions = list(self.filter_queryset(self.get_queryset().filter(pk__in=candidates.values('pk'))))
+        returned = {mission.id for mission in missions}
+        deleted = (logged | set(candidates.values_list('id', flat=True))) - returned
+        
+        data = {
+            'results': self.get_serializer(missions, many=True).data,
+            'deleted': sorted(deleted),
+            'sync_token': sync_token,
+        }
+        if request.query_params.get('view') == 'compact':
+            data['users'] = self.side_loaded_users(missions)
+        response = Response(data)
+        response['X-Sync-Token'] = sync_token
+        return response
+    
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        ?q= ile açıklama ve from_to üzerinde tam metin arama. Görünürlük ve
+        liste filtreleri geçerlidir; sonuçlar alaka sırasıyla sayfalanır.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            queryset = search_missions(queryset, request.query_params.get('q'))
+        except ValueError:
+            raise ValidationError({"q": ["Arama terimi gereklidir."]})
+        
+        paginator = MissionSearchPagination()
+        missions = paginator.paginate_queryset(queryset, request, view=self)
+        with span('serialize'):
+            data = self.get_serializer(missions, many=True).data
+        response = paginator.get_paginated_response(data)
+        if request.query_params.get('view') == 'compact':
+            response.data['users'] = self.side_loaded_users(missions)
+        return response
+    
+    def retrieve(self, request, *args, **kwargs):
+        mission = self.get_object()
+        data = self.get_serializer(mission).data
+        if request.query_params.get('view') == 'compact':
+            data['users'] = self.side_loaded_users([mission])
+        return Response(data)
+    
+    @property
+    def policy(self):
+        return AssignmentPolicy.for_request(self.request)
+    
+    def get_object(self):
+        """Aynı istek içinde görev bir kez yüklenir (update -> super().update)"""
+        if getattr(self, '_object', None) is None:
+            self._object = super().get_object()
+        return self._object
+    
+    def check_assignment(self, request):
+        """Role bazlı atama kontrolü; ihlal varsa 403 yanıtı döner"""
+        due_to_ids = request.data.getlist('due_to') if hasattr(request.data, 'getlist') else request.data.get('due_to', [])
+        problem = self.policy.check_assignment(due_to_ids)
+        if problem:
+            response_status, errors = problem
+            return Response(errors, status=response_status)
+        return None
+    
     def create(self, request, *args, **kwargs):
         """Yeni görev oluştur - Herkes oluşturabilir (role bazlı atama kısıtlaması var)"""
-        user = request.user
-        due_to_ids = request.data.getlist('due_to') if hasattr(request.data, 'getlist') else request.data.get('due_to', [])
-        
-        if due_to_ids:
-            assigned_users = User.objects.filter(id__in=due_to_ids)
-            
-            
-            if user.role == 'EMPLOYEE':
-                invalid_users = assigned_users.exclude(role='EMPLOYEE')
-                if invalid_users.exists():
-                    invalid_names = [u.username for u in invalid_users]
-                    return Response(
-                        {
-                            "detail": f"Çalışanlar sadece diğer çalışanlara görev atayabilir. Geçersiz kullanıcılar: {', '.join(invalid_names)}",
-                            "invalid_users": invalid_names
-                        },
-                        status=status.HTTP_403_FORBIDDEN
-                    )
-            
-            
-            elif user.role == 'MANAGER':
-                invalid_users = assigned_users.exclude(role='EMPLOYEE')
-                if invalid_users.exists():
-                    invalid_names = [u.username for u in invalid_users]
-                    return Response(
-                        {
-                            "detail": f"Yöneticiler sadece çalışanlara görev atayabilir. Geçersiz kullanıcılar: {', '.join(invalid_names)}",
-                            "invalid_users": invalid_names
-                        },
-                        status=status.HTTP_403_FORBIDDEN
-                    )
-            
-            
+        denied = self.check_assignment(request)
+        if denied:
+            return denied
         
         # Görev oluştur
         serializer = self.get_serializer(data=request.data)
@@ -156,126 +321,224 @@ class MissionViewSet(viewsets.ModelViewSet):
     def update(self, request, *args, **kwargs):
         """Görevi güncelle - Sadece created_by + role bazlı atama kontrolü"""
         mission = self.get_object()
-        user = request.user
         
         # Düzenleme yetkisi kontrolü
-        if not mission.can_edit(user):
+        if not self.policy.can_edit(mission):
             return Response(
                 {"detail": "Bu görevi düzenleme yetkiniz yok. Sadece oluşturduğunuz görevleri düzenleyebilirsiniz."},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Role bazlı atama kontrolü
-        due_to_ids = request.data.getlist('due_to') if hasattr(request.data, 'getlist') else request.data.get('due_to', [])
-        if due_to_ids:
-            assigned_users = User.objects.filter(id__in=due_to_ids)
-            
-            # EMPLOYEE ise sadece EMPLOYEE'lere atayabilir
-            if user.role == 'EMPLOYEE':
-                invalid_users = assigned_users.exclude(role='EMPLOYEE')
-                if invalid_users.exists():
-                    invalid_names = [u.username for u in invalid_users]
-                    return Response(
-                        {
-                            "detail": f"Çalışanlar sadece diğer çalışanlara görev atayabilir. Geçersiz kullanıcılar: {', '.join(invalid_names)}",
-                            "invalid_users": invalid_names
-                        },
-                        status=status.HTTP_403_FORBIDDEN
-                    )
-            
-            # MANAGER ise sadece EMPLOYEE'lere atayabilir
-            elif user.role == 'MANAGER':
-                invalid_users = assigned_users.exclude(role='EMPLOYEE')
-                if invalid_users.exists():
-                    invalid_names = [u.username for u in invalid_users]
-                    return Response(
-                        {
-                            "detail": f"Yöneticiler sadece çalışanlara görev atayabilir. Geçersiz kullanıcılar: {', '.join(invalid_names)}",
-                            "invalid_users": invalid_names
-                        },
-                        status=status.HTTP_403_FORBIDDEN
-                    )
+        denied = self.check_assignment(request)
+        if denied:
+            return denied
         
         return super().update(request, *args, **kwargs)
     
-    def partial_update(self, request, *args, **kwargs):
-        """Kısmi güncelleme - Sadece created_by + role bazlı atama kontrolü"""
-        mission = self.get_object()
-        user = request.user
+    @action(detail=True, methods=['patch'])
+    def toggle_complete(self, request, pk=None):
+        """
+        Görevi tamamla/tamamlanmadı olarak işaretle.
+        Tek koşullu UPDATE (sadece atanan kullanıcı); eşzamanlı istekler birbirini ezmez.
+        """
+        try:
+            mission_id = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound("Görev bulunamadı.")
         
-        if not mission.can_edit(user):
+        if not Mission.objects.toggle_completion(mission_id, request.user):
+            if not Mission.objects.visible_to(request.user).filter(pk=mission_id).exists():
+                raise NotFound("Görev bulunamadı.")
             return Response(
-                {"detail": "Bu görevi düzenleme yetkiniz yok."},
+                {"detail": "Bu görevi tamamlama yetkiniz yok. Sadece size atanan görevleri tamamlayabilirsiniz."},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Role bazlı atama kontrolü
-        due_to_ids = request.data.getlist('due_to') if hasattr(request.data, 'getlist') else request.data.get('due_to', [])
-        if due_to_ids:
-            assigned_users = User.objects.filter(id__in=due_to_ids)
-            
-            # EMPLOYEE ise sadece EMPLOYEE'lere atayabilir
-            if user.role == 'EMPLOYEE':
-                invalid_users = assigned_users.exclude(role='EMPLOYEE')
-                if invalid_users.exists():
-                    invalid_names = [u.username for u in invalid_users]
-                    return Response(
-                        {
-                            "detail": f"Çalışanlar sadece diğer çalışanlara görev atayabilir.",
-                            "invalid_users": invalid_names
-                        },
-                        status=status.HTTP_403_FORBIDDEN
-                    )
-            
-            # MANAGER ise sadece EMPLOYEE'lere atayabilir
-            elif user.role == 'MANAGER':
-                invalid_users = assigned_users.exclude(role='EMPLOYEE')
-                if invalid_users.exists():
-                    invalid_names = [u.username for u in invalid_users]
-                    return Response(
-                        {
-                            "detail": f"Yöneticiler sadece çalışanlara görev atayabilir.",
-                            "invalid_users": invalid_names
-                        },
-                        status=status.HTTP_403_FORBIDDEN
-                    )
+        # update() sinyal tetiklemez: sürümler ve canlı akış burada beslenir
+        bump_missions([mission_id])
+        events.publish_missions(events.COMPLETED, [mission_id])
+        data = Mission.objects.filter(pk=mission_id).values(
+            'id', 'completed', 'completed_at', 'updated_at'
+        ).first()
+        return Response(data)
+    
+    @action(detail=False, methods=['post', 'patch'])
+    def bulk(self, request):
+        """
+        Toplu görev oluşturma (POST) ve güncelleme (PATCH).
+        Gövde görev listesidir; öğe başına sonuç döner.
+        """
+        if request.method == 'POST':
+            results = bulk_create_missions(self.policy, request.data)
+            success = status.HTTP_201_CREATED
+        else:
+            results = bulk_update_missions(self.policy, request.data)
+            success = status.HTTP_200_OK
         
-        return super().partial_update(request, *args, **kwargs)
+        succeeded = sum(result['status'] == success for result in results)
+        if succeeded == len(results):
+            response_status = success
+        elif succeeded:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({'results': results}, status=response_status)
     
-    @action(detail=True, methods=['patch'])
-    def toggle_complete(self, request, pk=None):
-        """Görevi tamamla/tamamlanmadı olarak işaretle"""
-        mission = self.get_object()
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """Görünür görevlerin özet, kullanıcı, rol ve departman istatistikleri"""
+        # Sürümler anahtarda: görev/kullanıcı değişikliği cache'i geçersiz kılar
+        versions = get_versions(self.get_version_keys())
+        cache_key = f'mission-stats:{request.user.id}:' + ':'.join(map(str, versions))
+        data = cache.get(cache_key)
+        if data is None:
+            data = mission_stats(self.get_queryset())
+            cache.set(cache_key, data, settings.MISSION_STATS_CACHE_TIMEOUT)
+        return Response(data)
+    
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        [start, end] penceresiyle kesişen görevler, gün bazında sade yapıda.
+        ?start=YYYY-MM-DD&end=YYYY-MM-DD (liste filtreleri de uygulanır)
+        """
+        params = request.query_params
+        if 'start' not in params or 'end' not in params:
+            raise ValidationError({"detail": "start ve end parametreleri gereklidir."})
+        start = parse_date_param('start', params['start'])
+        end = parse_date_param('end', params['end'])
+        if end < start:
+            raise ValidationError({"end": "end, start'tan önce olamaz."})
+        if (end - start).days > settings.MISSION_CALENDAR_MAX_DAYS:
+            raise ValidationError({"end": f"Pencere en fazla {settings.MISSION_CALENDAR_MAX_DAYS} gün olabilir."})
         
-        if not mission.can_complete(request.user):
-            return Response(
-                {"detail": "Bu görevi tamamlama yetkiniz yok. Sadece size atanan görevleri tamamlayabilirsiniz."},
-                status=status.HTTP_403_FORBIDDEN
-            )
+        # Aralık kesişimi: assigned_date <= end AND end_date >= start
+        missions = self.filter_queryset(Mission.objects.visible_to(request.user)).filter(
+            assigned_date__lte=end, end_date__gte=start
+        ).values('id', 'description', 'assigned_date', 'end_date', 'completed')
         
-        mission.completed = not mission.completed
-        mission.save()
+        days = {}
+        by_id = {}
+        for mission in missions:
+            by_id[mission['id']] = mission
+            day = max(mission['assigned_date'], start)
+            last = min(mission['end_date'], end)
+            while day <= last:
+                days.setdefault(day.isoformat(), []).append(mission['id'])
+                day += timedelta(days=1)
         
-        serializer = self.get_serializer(mission)
-        return Response(serializer.data)
+        return Response({
+            'start': start,
+            'end': end,
+            'days': days,
+            'missions': by_id,
+        })
+
+
+# ============ CHUNKED UPLOADS ============
+
+class UploadSessionViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Parça parça, devam ettirilebilir dosya yükleme.
+    POST /uploads/ -> oturum, PUT /uploads/<id>/chunks/<n>/ -> ham parça,
+    GET /uploads/<id>/ -> eksik parçalar, POST /uploads/<id>/complete/ -> SHA-256 doğrulama
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        return UploadSession.objects.filter(user=self.request.user)
+    
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+    
+    def perform_destroy(self, instance):
+        instance.discard_file()
+        instance.delete()
+    
+    @action(detail=True, methods=['put'], url_path=r'chunks/(?P<index>\d+)')
+    def chunk(self, request, pk=None, index=None):
+        """Gövde ham parça baytlarıdır (application/octet-stream)"""
+        session = self.get_object()
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        # request.data'ya dokunulmaz: gövde parser'a girmeden diske akar
+        session = write_chunk(session, int(index), request.stream, length)
+        return Response(self.get_serializer(session).data)
+    
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        try:
+            session = complete_upload(self.get_object(), request.data.get('checksum'))
+        except MissingChunks as e:
+            return Response(
+                {"detail": "Eksik parçalar var.", "missing_chunks": e.missing},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(self.get_serializer(session).data)
+
+
+# ============ ATTACHMENT DOWNLOAD ============
+
+class AttachmentDownloadView(generics.GenericAPIView):
+    """
+    Ek dosyayı indirme. Görev görünürlüğü tek sorguda kontrol edilir;
+    Range, If-None-Match/If-Modified-Since ve If-Range desteklenir.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def perform_content_negotiation(self, request, force=False):
+        # Yanıt dosyanın kendisi; Accept başlığı 406'ya yol açmamalı
+        return super().perform_content_negotiation(request, force=True)
+    
+    def get(self, request, pk):
+        attachment = (
+            MissionAttachment.objects
+            .select_related('blob')
+            .filter(pk=pk, mission__in=Mission.objects.visible_to(request.user))
+            .first()
+        )
+        response = serve_attachment(request, attachment) if attachment else None
+        if response is None:
+            raise NotFound("Dosya bulunamadı.")
+        return response
 
 
 # ============ ASSIGNABLE USERS (ROLE-BASED FILTERING) ============
 
-class AssignableUsersView(generics.ListAPIView):
+class AssignableUsersView(ConditionalGetMixin, DirectoryCacheMixin, generics.ListAPIView):
     """Görev atanabilecek kullanıcıları listele - Role bazlı filtreleme"""
     serializer_class = CustomUserSerializer
     permission_classes = [IsAuthenticated]
     
+    def get_version_keys(self):
+        return [DIRECTORY_KEY]
+    
+    def get_scope(self):
+        """Sonuç sadece role bağlı: cache anahtarı bu kapsamdır"""
+        role = self.request.user.role
+        if role == 'CEO':
+            return 'all'
+        elif role in ['MANAGER', 'EMPLOYEE']:
+            return 'employees'
+        return None
+    
     def get_queryset(self):
-        user = self.request.user
+        scope = self.get_scope()
         
         # ✅ CEO: Herkesi görebilir
-        if user.role == 'CEO':
+        if scope == 'all':
             return User.objects.all().order_by('role', 'username')
         
         # ✅ MANAGER ve EMPLOYEE: Sadece EMPLOYEE'leri görebilir
-        elif user.role in ['MANAGER', 'EMPLOYEE']:
+        elif scope == 'employees':
             return User.objects.filter(role='EMPLOYEE').order_by('username')
         
         else:
@@ -283,30 +546,140 @@ class AssignableUsersView(generics.ListAPIView):
     
     def list(self, request, *args, **kwargs):
         """Direkt array dön - Herkes erişebilir"""
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        scope = self.get_scope()
+        if scope is None:
+            return Response([])
+        data = self.get_cached_directory(
+            f'assignable:{scope}',
+            lambda: list(self.get_serializer(self.get_queryset(), many=True).data),
+        )
+        return Response(data)
 
 
 # ============ ORGANIZATION CHART ============
 
-class OrganizationChartView(generics.ListAPIView):
+async def _iterate_in_thread(iterator):
+    """Senkron üreteci (DB sorgulu) olay döngüsünü bloklamadan parça parça tüketir"""
+    step = sync_to_async(next)
+    done = object()
+    while (chunk := await step(iterator, done)) is not done:
+        yield chunk
+
+
+class OrganizationChartView(ConditionalGetMixin, DirectoryCacheMixin, generics.ListAPIView):
     """Organizasyon yapısını getir - Herkes görebilir"""
     serializer_class = CustomUserSerializer
     permission_classes = [IsAuthenticated]
     
+    ROLES = ['CEO', 'MANAGER', 'EMPLOYEE']
+    
+    def get_version_keys(self):
+        return [DIRECTORY_KEY]
+    
     def list(self, request, *args, **kwargs):
-        users = User.objects.all().order_by('role', 'username')
-        
-        # Role'lere göre grupla
-        org_chart = {
-            'CEO': [],
-            'MANAGER': [],
-            'EMPLOYEE': []
-        }
-        
-        for user in users:
-            serializer = self.get_serializer(user)
-            org_chart[user.role].append(serializer.data)
-        
-        return Response(org_chart)
\ No newline at end of file
+        # ?stream=1: çok büyük dizinler bellekte toplanmadan parça parça yazılır
+        if request.query_params.get('stream') in ('1', 'true'):
+            chunks = self.stream_org_chart()
+            # ASGI senkron üreteci göndermeden önce tamamen belleğe okur; async iterator verilir.
+            # scope sadece ASGIRequest'te vardır (DRF isteği öznitelikleri iletir)
+            if hasattr(request, 'scope'):
+                chunks = _iterate_in_thread(chunks)
+            return StreamingHttpResponse(chunks, content_type='application/json')
+        # Şema herkes için aynı
+        return Response(self.get_cached_directory('organization', self.build_org_chart))
+    
+    def get_users(self):
+        # Bilinen roller ROLES sırasıyla, diğerleri alfabetik olarak sonda
+        position = Case(
+            *(When(role=role, then=Value(index)) for index, role in enumerate(self.ROLES)),
+            default=Value(len(self.ROLES)),
+        )
+        return User.objects.order_by(position, 'role', 'username')
+    
+    def org_chart_groups(self):
+        """
+        (rol, satırlar) çiftleri; hem normal hem akış yanıtı bunu kullanır.
+        Tek values() sorgusu; boş bilinen roller de [] olarak yer alır,
+        ROLES dışındaki roller ayrı grup olarak sona eklenir.
+        """
+        pending = list(self.ROLES)
+        for role, rows in groupby(user_rows(self.get_users(), self.request), key=itemgetter('role')):
+            while pending and pending[0] != role:
+                yield pending.pop(0), iter(())
+            if pending:
+                pending.pop(0)
+            yield role, rows
+        for role in pending:
+            yield role, iter(())
+    
+    def build_org_chart(self):
+        return {role: list(rows) for role, rows in self.org_chart_groups()}
+    
+    def stream_org_chart(self, chunk_bytes=64 * 1024):
+        """build_org_chart() ile aynı JSON'u parça parça üret"""
+        buffer = ['{']
+        size = 0
+        for index, (role, rows) in enumerate(self.org_chart_groups()):
+            buffer.append(f'{"," if index else ""}{json.dumps(role)}:[')
+            for position, row in enumerate(rows):
+                item = (',' if position else '') + json.dumps(row, cls=DjangoJSONEncoder)
+                buffer.append(item)
+                size += len(item)
+                if size >= chunk_bytes:
+                    yield ''.join(buffer)
+                    buffer, size = [], 0
+            buffer.append(']')
+        buffer.append('}')
+        yield ''.join(buffer)
+
+
+# ============ CANLI GÖREV AKIŞI (SSE) ============
+
+def _authenticate_stream(request):
+    """
+    EventSource başlık gönderemez; token ?token= ile de verilebilir.
+    Geçersizse None döner.
+    """
+    auth = CachedJWTAuthentication()
+    try:
+        raw = request.GET.get('token')
+        if raw:
+            return auth.get_user(auth.get_validated_token(raw))
+        result = auth.authenticate(request)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    return result[0] if result else None
+
+
+async def mission_event_stream(request):
+    """
+    GET /api/missions/events/ -> text/event-stream
+    Olaylar: mission.created/updated/completed/deleted ve resync.
+    Yeniden bağlanırken Last-Event-ID ile kaçırılan olaylar tekrar gönderilir.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"detail": "Canlı akış sadece ASGI sunucusunda çalışır."}, status=501)
+    user = await sync_to_async(_authenticate_stream)(request)
+    if user is None or not user.is_active:
+        return JsonResponse({"detail": "Kimlik doğrulama gerekli."}, status=401)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    last_event_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    broker = get_broker()
+    heartbeat = settings.MISSION_EVENTS_HEARTBEAT
+
+    async def stream():
+        subscription = broker.subscribe(user.id, last_event_id)
+        try:
+            yield b'retry: 5000\n\n'
+            while True:
+                event = await subscription.get(heartbeat)
+                # Boş yorum satırı bağlantıyı proxy'lerde açık tutar
+                yield b': ping\n\n' if event is None else format_event(event)
+        finally:
+            broker.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
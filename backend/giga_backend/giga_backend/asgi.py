@@ -3,6 +3,9 @@ ASGI config for giga_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+/api/missions/events/ (canlı görev akışı, SSE) sadece bu uygulama üzerinden
+çalışır, örn: uvicorn giga_backend.asgi:application
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
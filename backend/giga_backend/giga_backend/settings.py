@@ -10,9 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -54,11 +57,30 @@ INSTALLED_APPS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Parça parça yüklemeler (/api/uploads/)
+UPLOAD_SESSION_ROOT = MEDIA_ROOT / 'upload_sessions'
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024
+
+# /api/attachments/<id>/download/ dosyayı nasıl gönderir:
+# None -> Django (FileResponse/Range), 'nginx' -> X-Accel-Redirect, 'sendfile' -> X-Sendfile (Apache)
+ATTACHMENT_SENDFILE_BACKEND = os.environ.get('ATTACHMENT_SENDFILE_BACKEND') or None
+# nginx'te MEDIA_ROOT'u gösteren 'internal' location
+ATTACHMENT_ACCEL_PREFIX = '/protected-media/'
+
+# Profil fotoğrafı varyantları (en uzun kenar, piksel). Yükleme sonrası arka
+# planda üretilir; False ise istek içinde senkron üretilir (testler, tek süreç).
+PROFILE_PHOTO_VARIANTS = {'thumb': 64, 'medium': 256}
+PROFILE_PHOTO_ASYNC = True
+PROFILE_PHOTO_WORKERS = 2
+
 # ============================================================
 # MIDDLEWARE
 # ============================================================
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',      # ← CORS EN ÜSTTE!
+    # PERF_METRICS_ENABLED kapalıysa kendini devre dışı bırakır
+    'core.metrics.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -91,12 +113,100 @@ WSGI_APPLICATION = 'giga_backend.wsgi.application'
 # ============================================================
 # DATABASE
 # ============================================================
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DJANGO_DB_ENGINE=sqlite (varsayılan) | postgres
+# Bağlantılar istekler arasında yeniden kullanılır (CONN_MAX_AGE) ve
+# kullanılmadan önce sağlık kontrolünden geçer.
+DB_ENGINE = os.environ.get('DJANGO_DB_ENGINE', 'sqlite')
+DB_CONN_MAX_AGE = int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', '60'))
+
+# SQLite çok worker'lı kurulum için: WAL okuyucuların yazanları bloklamasını
+# önler; busy_timeout kilitte hemen hata yerine bekletir; synchronous=NORMAL
+# WAL'da güvenli ve commit başına fsync yapmaz; cache_size negatifse KiB.
+SQLITE_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=20000',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=134217728',
+]
+
+if DB_ENGINE == 'postgres':
+    # pip install "psycopg[binary,pool]"; DJANGO_DB_POOL=1 ile psycopg havuzu
+    # kullanılır (havuz kalıcı bağlantının yerini alır, CONN_MAX_AGE 0 olmalı).
+    DB_POOL = os.environ.get('DJANGO_DB_POOL', '0') == '1'
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DJANGO_DB_NAME', 'giga'),
+            'USER': os.environ.get('DJANGO_DB_USER', 'giga'),
+            'PASSWORD': os.environ.get('DJANGO_DB_PASSWORD', ''),
+            'HOST': os.environ.get('DJANGO_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DJANGO_DB_PORT', '5432'),
+            'CONN_MAX_AGE': 0 if DB_POOL else DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': not DB_POOL,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get('DJANGO_DB_POOL_MIN', '2')),
+                    'max_size': int(os.environ.get('DJANGO_DB_POOL_MAX', '10')),
+                    'timeout': 10,
+                },
+            } if DB_POOL else {},
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DJANGO_DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                # Yazma kilidi BEGIN'de alınır: okumadan yazmaya geçişte
+                # busy_timeout'u atlayan "database is locked" hatası olmaz
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+                'init_command': '; '.join(SQLITE_PRAGMAS),
+            },
+        }
+    }
+
+
+# ============================================================
+# CACHE
+# ============================================================
+# DJANGO_CACHE_BACKEND=locmem (varsayılan) | file
+# ETag sürümleri ve dizin cache'i burada tutulur. Birden fazla worker
+# çalışıyorsa tüm process'lerin aynı cache'i görmesi gerekir (file): locmem'de
+# bir worker'daki yazma diğerinin sürümünü yenilemez ve o worker eski veriye
+# 304 döner. Worker sayısı gunicorn'un da okuduğu WEB_CONCURRENCY'den alınır.
+CACHE_BACKEND = os.environ.get('DJANGO_CACHE_BACKEND', 'locmem')
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', '1'))
+
+if CACHE_BACKEND == 'locmem' and WEB_CONCURRENCY > 1:
+    raise ImproperlyConfigured(
+        "WEB_CONCURRENCY > 1 iken locmem cache kullanılamaz; "
+        "DJANGO_CACHE_BACKEND=file (paylaşımlı cache) ayarlayın."
+    )
+
+if CACHE_BACKEND == 'file':
+    # Cache JWT ile doğrulanan kullanıcıları (şifre hash'i dahil) tutar:
+    # herkesin yazabildiği /tmp yerine proje dizini altında durur
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', str(BASE_DIR / '.cache')),
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'giga-backend',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
     }
-}
 
 
 # ============================================================
@@ -163,6 +273,9 @@ CORS_ALLOW_HEADERS = [
     'x-requested-with',
 ]
 
+# Tarayıcıdaki istemci koşullu istek ve senkronizasyon başlıklarını okuyabilsin
+CORS_EXPOSE_HEADERS = ['ETag', 'X-Sync-Token']
+
 CSRF_TRUSTED_ORIGINS = [
     'http://localhost:5173',
     'http://127.0.0.1:5173',
@@ -175,7 +288,8 @@ CSRF_TRUSTED_ORIGINS = [
 # ============================================================
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication + kullanıcıyı cache'ten çözer (core/authentication.py)
+        'core.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -184,6 +298,68 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 100,
 }
 
+# JWT ile doğrulanan kullanıcının cache süresi (saniye). Kullanıcı kaydedilince
+# (profil, şifre, deaktivasyon) silinir; queryset.update() ile yapılan
+# değişiklikler sinyal tetiklemez, en geç bu süre sonunda yansır.
+AUTH_USER_CACHE_TIMEOUT = 300
+
+# /api/missions/stats/ sonucunun kullanıcı başına cache süresi (saniye)
+MISSION_STATS_CACHE_TIMEOUT = 60
+
+# Atanabilir kullanıcılar ve organizasyon şeması cache süresi (saniye).
+# Kullanıcı kaydedildiğinde/silindiğinde dizin sürümü değişir ve cache geçersiz olur.
+DIRECTORY_CACHE_TIMEOUT = 300
+
+# ETag/Last-Modified sürüm damgalarının cache süresi (saniye). Süresi dolan
+# damga daha büyük bir değerle yeniden oluşur (tek seferlik 200, asla eski 304).
+VERSION_CACHE_TIMEOUT = 600
+
+# /api/missions/bulk/ isteği başına en fazla görev
+MISSION_BULK_MAX_ITEMS = 500
+
+# /api/missions/calendar/ için izin verilen en geniş pencere (gün)
+MISSION_CALENDAR_MAX_DAYS = 93
+
+
+# ?updated_since= artımlı senkronizasyon. Token'ı bu süreden eski istemciler
+# 410 alır ve tam listeyi çeker; günlük prune_mission_changes ile budanır.
+MISSION_SYNC_RETENTION_DAYS = 30
+# Token anında commit edilmemiş yazmalar kaçmasın diye geriye örtüşme (saniye)
+MISSION_SYNC_OVERLAP_SECONDS = 5
+
+# /api/missions/events/ canlı akış (sadece ASGI: uvicorn giga_backend.asgi:application)
+# Varsayılan broker tek süreç içindir; çok worker'lı kurulumda paylaşımlı bir broker verin.
+MISSION_EVENTS_BROKER = 'core.events.InProcessBroker'
+MISSION_EVENTS_BUFFER_SIZE = 1000     # Last-Event-ID ile tekrar gönderilebilecek son olaylar
+MISSION_EVENTS_QUEUE_SIZE = 256       # bağlantı başına; taşarsa 'resync' gönderilir
+MISSION_EVENTS_HEARTBEAT = 15         # saniye
+
+
+# ============================================================
+# E-POSTA BİLDİRİMLERİ (python manage.py send_notifications)
+# ============================================================
+EMAIL_BACKEND = os.environ.get('DJANGO_EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.environ.get('DJANGO_DEFAULT_FROM_EMAIL', 'giga@localhost')
+# Termine kaç gün kala hatırlatma gönderilir
+NOTIFICATION_REMINDER_DAYS = 1
+# Gecikme uyarısı için geriye bakılan en fazla gün (tarama aralığını sınırlar)
+NOTIFICATION_OVERDUE_LOOKBACK_DAYS = 30
+# Tek SMTP bağlantısı üzerinden bir seferde gönderilen e-posta sayısı
+NOTIFICATION_BATCH_SIZE = 100
+
+
+# ============================================================
+# PERFORMANS ÖLÇÜMÜ
+# ============================================================
+# DJANGO_PERF_METRICS=1: Server-Timing başlığı ve /metrics (Prometheus)
+PERF_METRICS_ENABLED = os.environ.get('DJANGO_PERF_METRICS', '0') == '1'
+# Boş değilse /metrics 'Authorization: Bearer <token>' ister
+PERF_METRICS_TOKEN = os.environ.get('DJANGO_PERF_METRICS_TOKEN', '')
+# Bu sayıdan fazla SQL sorgusu atan istekler uyarı olarak loglanır (N+1)
+PERF_QUERY_WARNING_THRESHOLD = 50
+# manage.py benchmark sonuçlarının karşılaştırıldığı dosya (--save-baseline yazar)
+BENCHMARK_BASELINE = BASE_DIR / 'benchmarks' / 'baseline.json'
+
 
 # ============================================================
 # JWT SETTINGS
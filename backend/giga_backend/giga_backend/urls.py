@@ -3,6 +3,7 @@ from django.urls import path, include
 from django.conf import settings  
 from django.conf.urls.static import static  
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from core.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -14,6 +15,9 @@ urlpatterns = [
     
     # Core app endpoints
     path("api/", include("core.urls")),
+    
+    # Prometheus (DJANGO_PERF_METRICS=1 değilse 404)
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 if settings.DEBUG:
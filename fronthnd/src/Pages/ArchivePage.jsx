@@ -1,5 +1,6 @@
 import React, { useEffect, useState } from "react";
 import api from "../services/api";
+import { fetchMission, subscribeMissionEvents } from "../services/missionEvents";
 import "../styles/Archive.css";
  // make sure relative path matches
 
@@ -19,10 +20,32 @@ const Archive = () => {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
+  // Tamamlanan/geri alınan görevleri canlı yansıt
+  useEffect(() => {
+    return subscribeMissionEvents(async (type, data) => {
+      if (type === "resync") {
+        fetchArchivedMissions();
+      } else if (type === "mission.deleted" || data.completed === false) {
+        setArchivedMissions((prev) => prev.filter((m) => m.id !== data.id));
+      } else if (data.completed) {
+        try {
+          const mission = await fetchMission(data.id);
+          setArchivedMissions((prev) => [mission, ...prev.filter((m) => m.id !== mission.id)]);
+        } catch (error) {
+          console.error("Görev alınamadı:", error);
+        }
+      }
+    });
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
   const fetchArchivedMissions = async () => {
     try {
       setLoading(true);
-      const response = await api.get("/api/missions/");
+      // Tamamlanma filtresi sunucu tarafında uygulanır
+      const response = await api.get("/api/missions/", {
+        params: { completed: true },
+      });
 
       const missions = Array.isArray(response.data?.results)
         ? response.data.results
@@ -1,5 +1,6 @@
 import React, { useEffect, useState } from "react";
 import api from "../services/api";
+import { fetchMission, subscribeMissionEvents } from "../services/missionEvents";
 import "../styles/Dashboard.css";
 
 const MISSIONS_ENDPOINT = "/api/missions/";
@@ -28,6 +29,32 @@ const Dashboard = () => {
     loadDashboardData();
   }, []);
 
+  // Diğer kullanıcıların değişikliklerini canlı uygula (sayfa yenilemeden)
+  useEffect(() => {
+    const upsert = (mission) =>
+      setMissions(prev =>
+        prev.some(m => m.id === mission.id)
+          ? prev.map(m => (m.id === mission.id ? mission : m))
+          : [mission, ...prev]
+      );
+
+    return subscribeMissionEvents(async (type, data) => {
+      if (type === "resync") {
+        fetchMissions();
+      } else if (type === "mission.deleted") {
+        setMissions(prev => prev.filter(m => m.id !== data.id));
+      } else if (type === "mission.completed") {
+        setMissions(prev => prev.map(m => (m.id === data.id ? { ...m, completed: data.completed } : m)));
+      } else {
+        try {
+          upsert(await fetchMission(data.id));
+        } catch (error) {
+          console.error("❌ Görev güncellenemedi:", error);
+        }
+      }
+    });
+  }, []);
+
   const loadDashboardData = async () => {
     try {
       await fetchMissions();
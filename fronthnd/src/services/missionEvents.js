@@ -0,0 +1,35 @@
+import api from "./api";
+import { ACCESS_TOKEN } from "./constant.js";
+
+const EVENTS_ENDPOINT = "api/missions/events/";
+const EVENT_TYPES = [
+  "mission.created",
+  "mission.updated",
+  "mission.completed",
+  "mission.deleted",
+  "resync",
+];
+
+// Canlı görev akışına abone ol (SSE). EventSource başlık gönderemediği için
+// token query string ile gider. Dönen fonksiyon aboneliği kapatır.
+export const subscribeMissionEvents = (onEvent) => {
+  const token = localStorage.getItem(ACCESS_TOKEN);
+  if (!token || typeof EventSource === "undefined") return () => {};
+
+  const base = api.defaults.baseURL.replace(/\/?$/, "/");
+  const source = new EventSource(`${base}${EVENTS_ENDPOINT}?token=${encodeURIComponent(token)}`);
+
+  EVENT_TYPES.forEach((type) => {
+    source.addEventListener(type, (event) => {
+      onEvent(type, JSON.parse(event.data || "{}"));
+    });
+  });
+
+  return () => source.close();
+};
+
+// Olayı alan bileşen, görevin tam gösterimini tek istekle çeker
+export const fetchMission = async (id) => {
+  const response = await api.get(`/api/missions/${id}/`);
+  return response.data;
+};